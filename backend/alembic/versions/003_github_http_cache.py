@@ -0,0 +1,43 @@
+"""Add GitHub conditional request cache table
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "003"
+down_revision: Union[str, None] = "002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create github_http_cache table"""
+    op.create_table(
+        "github_http_cache",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("cache_key", sa.String(length=64), nullable=False),
+        sa.Column("url", sa.String(length=1000), nullable=False),
+        sa.Column("etag", sa.String(length=255), nullable=True),
+        sa.Column("last_modified", sa.String(length=64), nullable=True),
+        sa.Column("body", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_github_http_cache_cache_key"), "github_http_cache", ["cache_key"], unique=True)
+    op.create_index(op.f("ix_github_http_cache_id"), "github_http_cache", ["id"], unique=False)
+
+
+def downgrade() -> None:
+    """Drop github_http_cache table"""
+    op.drop_index(op.f("ix_github_http_cache_id"), table_name="github_http_cache")
+    op.drop_index(op.f("ix_github_http_cache_cache_key"), table_name="github_http_cache")
+    op.drop_table("github_http_cache")
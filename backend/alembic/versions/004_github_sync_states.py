@@ -0,0 +1,45 @@
+"""Add GitHub sync watermark table
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "004"
+down_revision: Union[str, None] = "003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create github_sync_states table"""
+    op.create_table(
+        "github_sync_states",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("last_event_id", sa.String(length=32), nullable=True),
+        sa.Column("last_event_at", sa.DateTime(), nullable=True),
+        sa.Column("events_synced_from", sa.Date(), nullable=True),
+        sa.Column("last_repo_sync_at", sa.DateTime(), nullable=True),
+        sa.Column("last_synced_at", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_github_sync_states_id"), "github_sync_states", ["id"], unique=False)
+    op.create_index(op.f("ix_github_sync_states_user_id"), "github_sync_states", ["user_id"], unique=True)
+
+
+def downgrade() -> None:
+    """Drop github_sync_states table"""
+    op.drop_index(op.f("ix_github_sync_states_user_id"), table_name="github_sync_states")
+    op.drop_index(op.f("ix_github_sync_states_id"), table_name="github_sync_states")
+    op.drop_table("github_sync_states")
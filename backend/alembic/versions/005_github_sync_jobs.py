@@ -0,0 +1,54 @@
+"""Add GitHub sync job table
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "005"
+down_revision: Union[str, None] = "004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create github_sync_jobs table"""
+    op.create_table(
+        "github_sync_jobs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("mode", sa.String(length=16), nullable=False),
+        sa.Column("from_date", sa.Date(), nullable=False),
+        sa.Column("to_date", sa.Date(), nullable=False),
+        sa.Column("status", sa.String(length=16), nullable=False),
+        sa.Column("cancel_requested", sa.Boolean(), nullable=False),
+        sa.Column("phase", sa.String(length=32), nullable=True),
+        sa.Column("progress", sa.JSON(), nullable=True),
+        sa.Column("repos_count", sa.Integer(), nullable=True),
+        sa.Column("stats_updated", sa.Integer(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_github_sync_jobs_id"), "github_sync_jobs", ["id"], unique=False)
+    op.create_index(op.f("ix_github_sync_jobs_status"), "github_sync_jobs", ["status"], unique=False)
+    op.create_index(op.f("ix_github_sync_jobs_user_id"), "github_sync_jobs", ["user_id"], unique=False)
+
+
+def downgrade() -> None:
+    """Drop github_sync_jobs table"""
+    op.drop_index(op.f("ix_github_sync_jobs_user_id"), table_name="github_sync_jobs")
+    op.drop_index(op.f("ix_github_sync_jobs_status"), table_name="github_sync_jobs")
+    op.drop_index(op.f("ix_github_sync_jobs_id"), table_name="github_sync_jobs")
+    op.drop_table("github_sync_jobs")
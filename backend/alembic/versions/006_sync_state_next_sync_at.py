@@ -0,0 +1,32 @@
+"""Add next_sync_at to GitHub sync states
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "006"
+down_revision: Union[str, None] = "005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add next_sync_at column for the automatic sync scheduler"""
+    op.add_column("github_sync_states", sa.Column("next_sync_at", sa.DateTime(), nullable=True))
+    op.create_index(
+        op.f("ix_github_sync_states_next_sync_at"), "github_sync_states", ["next_sync_at"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Drop next_sync_at column"""
+    op.drop_index(op.f("ix_github_sync_states_next_sync_at"), table_name="github_sync_states")
+    op.drop_column("github_sync_states", "next_sync_at")
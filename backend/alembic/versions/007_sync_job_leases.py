@@ -0,0 +1,41 @@
+"""Add lease columns to GitHub sync jobs
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "007"
+down_revision: Union[str, None] = "006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add lease / heartbeat columns used by sync workers"""
+    op.add_column("github_sync_jobs", sa.Column("lease_owner", sa.String(length=128), nullable=True))
+    op.add_column("github_sync_jobs", sa.Column("lease_expires_at", sa.DateTime(), nullable=True))
+    op.add_column("github_sync_jobs", sa.Column("heartbeat_at", sa.DateTime(), nullable=True))
+    op.add_column(
+        "github_sync_jobs",
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.create_index(
+        op.f("ix_github_sync_jobs_lease_expires_at"), "github_sync_jobs", ["lease_expires_at"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Drop lease / heartbeat columns"""
+    op.drop_index(op.f("ix_github_sync_jobs_lease_expires_at"), table_name="github_sync_jobs")
+    op.drop_column("github_sync_jobs", "attempts")
+    op.drop_column("github_sync_jobs", "heartbeat_at")
+    op.drop_column("github_sync_jobs", "lease_expires_at")
+    op.drop_column("github_sync_jobs", "lease_owner")
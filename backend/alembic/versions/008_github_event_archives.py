@@ -0,0 +1,46 @@
+"""Add GitHub raw event archive table
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "008"
+down_revision: Union[str, None] = "007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create github_event_archives table"""
+    op.create_table(
+        "github_event_archives",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("event_count", sa.Integer(), nullable=False),
+        sa.Column("events", sa.LargeBinary(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("user_id", "date", name="uq_github_event_archives_user_date"),
+    )
+    op.create_index(op.f("ix_github_event_archives_id"), "github_event_archives", ["id"], unique=False)
+    op.create_index(
+        op.f("ix_github_event_archives_user_id"), "github_event_archives", ["user_id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Drop github_event_archives table"""
+    op.drop_index(op.f("ix_github_event_archives_user_id"), table_name="github_event_archives")
+    op.drop_index(op.f("ix_github_event_archives_id"), table_name="github_event_archives")
+    op.drop_table("github_event_archives")
@@ -0,0 +1,39 @@
+"""Add unique (user_id, date) key to GitHub daily stats
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "009"
+down_revision: Union[str, None] = "008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Remove duplicate days (keeping the newest row) and add the unique key"""
+    op.execute(
+        """
+        DELETE FROM github_daily_stats
+        WHERE id NOT IN (
+            SELECT keep_id FROM (
+                SELECT MAX(id) AS keep_id FROM github_daily_stats GROUP BY user_id, date
+            ) AS latest
+        )
+        """
+    )
+    op.create_index(
+        "uq_github_daily_stats_user_date", "github_daily_stats", ["user_id", "date"], unique=True
+    )
+
+
+def downgrade() -> None:
+    """Drop the unique key"""
+    op.drop_index("uq_github_daily_stats_user_date", table_name="github_daily_stats")
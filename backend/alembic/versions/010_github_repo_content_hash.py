@@ -0,0 +1,28 @@
+"""Add content_hash to GitHub repos
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "010"
+down_revision: Union[str, None] = "009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add content_hash column used by change-detecting repo sync"""
+    op.add_column("github_repos", sa.Column("content_hash", sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    """Drop content_hash column"""
+    op.drop_column("github_repos", "content_hash")
@@ -0,0 +1,119 @@
+"""Covering (user_id, date) index and yearly partitioning for GitHub daily stats
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "011"
+down_revision: Union[str, None] = "010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLE = "github_daily_stats"
+OLD_TABLE = "github_daily_stats_unpartitioned"
+COUNTERS = ["commit_count", "pr_count", "issue_count", "star_delta"]
+COLUMNS = "id, user_id, date, commit_count, pr_count, issue_count, star_delta, created_at, updated_at"
+# 与 app/db/partitions.py 保持一致
+YEARS_AHEAD = 2
+
+
+def _create_table(partitioned: bool) -> None:
+    # 沿用原表的自增序列，迁移前后 id 连续
+    primary_key = "PRIMARY KEY (id, date)" if partitioned else "PRIMARY KEY (id)"
+    partition_clause = " PARTITION BY RANGE (date)" if partitioned else ""
+    op.execute(
+        f"""
+        CREATE TABLE {TABLE} (
+            id INTEGER NOT NULL DEFAULT nextval('{TABLE}_id_seq'),
+            user_id INTEGER NOT NULL REFERENCES users (id),
+            date DATE NOT NULL,
+            commit_count INTEGER NOT NULL,
+            pr_count INTEGER NOT NULL,
+            issue_count INTEGER NOT NULL,
+            star_delta INTEGER NOT NULL,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            updated_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            {primary_key}
+        ){partition_clause}
+        """
+    )
+    op.execute(f"ALTER SEQUENCE {TABLE}_id_seq OWNED BY {TABLE}.id")
+
+
+def _rename_current_table() -> None:
+    op.execute(f"ALTER TABLE {TABLE} RENAME TO {OLD_TABLE}")
+    op.execute(f"ALTER TABLE {OLD_TABLE} RENAME CONSTRAINT {TABLE}_pkey TO {OLD_TABLE}_pkey")
+
+
+def _copy_and_drop_old_table() -> None:
+    op.execute(f"INSERT INTO {TABLE} ({COLUMNS}) SELECT {COLUMNS} FROM {OLD_TABLE}")
+    op.execute(f"DROP TABLE {OLD_TABLE} CASCADE")
+
+
+def upgrade() -> None:
+    """
+    Replace single-column indexes with a composite (user_id, date) key that covers the
+    counter columns; on Postgres also range-partition the table by year
+    """
+    if op.get_bind().dialect.name != "postgresql":
+        # SQLite 没有 INCLUDE，(user_id, date) 唯一索引已能满足范围查询，只去掉冗余的 user_id 索引
+        op.drop_index(op.f("ix_github_daily_stats_user_id"), table_name=TABLE)
+        return
+
+    op.drop_index("uq_github_daily_stats_user_date", table_name=TABLE)
+    op.drop_index(op.f("ix_github_daily_stats_user_id"), table_name=TABLE)
+    op.drop_index(op.f("ix_github_daily_stats_date"), table_name=TABLE)
+    op.drop_index(op.f("ix_github_daily_stats_id"), table_name=TABLE)
+    _rename_current_table()
+    _create_table(partitioned=True)
+
+    this_year = date.today().year
+    start_year = this_year
+    if not op.get_context().as_sql:
+        first_day = op.get_bind().execute(sa.text(f"SELECT MIN(date) FROM {OLD_TABLE}")).scalar()
+        if first_day is not None:
+            start_year = min(first_day.year, this_year)
+    for year in range(start_year, this_year + YEARS_AHEAD + 1):
+        op.execute(
+            f"CREATE TABLE {TABLE}_y{year} PARTITION OF {TABLE} "
+            f"FOR VALUES FROM ('{year}-01-01') TO ('{year + 1}-01-01')"
+        )
+    op.execute(f"CREATE TABLE {TABLE}_default PARTITION OF {TABLE} DEFAULT")
+
+    _copy_and_drop_old_table()
+    op.create_index(op.f("ix_github_daily_stats_id"), TABLE, ["id"], unique=False)
+    op.create_index(op.f("ix_github_daily_stats_date"), TABLE, ["date"], unique=False)
+    op.create_index(
+        "uq_github_daily_stats_user_date",
+        TABLE,
+        ["user_id", "date"],
+        unique=True,
+        postgresql_include=COUNTERS,
+    )
+
+
+def downgrade() -> None:
+    """Restore the plain table with single-column indexes"""
+    if op.get_bind().dialect.name != "postgresql":
+        op.create_index(op.f("ix_github_daily_stats_user_id"), TABLE, ["user_id"], unique=False)
+        return
+
+    op.drop_index("uq_github_daily_stats_user_date", table_name=TABLE)
+    op.drop_index(op.f("ix_github_daily_stats_date"), table_name=TABLE)
+    op.drop_index(op.f("ix_github_daily_stats_id"), table_name=TABLE)
+    _rename_current_table()
+    _create_table(partitioned=False)
+    _copy_and_drop_old_table()
+    op.create_index(op.f("ix_github_daily_stats_id"), TABLE, ["id"], unique=False)
+    op.create_index(op.f("ix_github_daily_stats_date"), TABLE, ["date"], unique=False)
+    op.create_index(op.f("ix_github_daily_stats_user_id"), TABLE, ["user_id"], unique=False)
+    op.create_index("uq_github_daily_stats_user_date", TABLE, ["user_id", "date"], unique=True)
@@ -0,0 +1,31 @@
+"""Add stats_version to GitHub sync states
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "012"
+down_revision: Union[str, None] = "011"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add stats_version column used to key cached stats responses"""
+    op.add_column(
+        "github_sync_states",
+        sa.Column("stats_version", sa.Integer(), server_default="0", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Drop stats_version column"""
+    op.drop_column("github_sync_states", "stats_version")
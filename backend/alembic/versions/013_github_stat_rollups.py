@@ -0,0 +1,110 @@
+"""Add weekly/monthly/yearly GitHub stat rollups
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Sequence, Tuple, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "013"
+down_revision: Union[str, None] = "012"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COUNTERS = ["commit_count", "pr_count", "issue_count", "star_delta"]
+ROLLUP_KEYS = COUNTERS + ["active_days"]
+# 与 app/services/daily_stats.py 的 ACTIVITY_KEYS 保持一致：收到的 star 不算活跃
+ACTIVITY_INDEXES = [COUNTERS.index(key) for key in ("commit_count", "pr_count", "issue_count")]
+BATCH_ROWS = 1000
+
+
+def _period_starts(day: date) -> List[Tuple[str, date]]:
+    return [
+        ("week", day - timedelta(days=day.weekday())),
+        ("month", day.replace(day=1)),
+        ("year", date(day.year, 1, 1)),
+    ]
+
+
+def _backfill(rollups: sa.Table) -> None:
+    """Aggregate existing daily stats into rollups, one user at a time"""
+    bind = op.get_bind()
+    daily = sa.table(
+        "github_daily_stats",
+        sa.column("user_id", sa.Integer),
+        sa.column("date", sa.Date),
+        *(sa.column(key, sa.Integer) for key in COUNTERS),
+    )
+    now = datetime.utcnow()
+    user_ids = bind.execute(sa.select(daily.c.user_id).distinct()).scalars().all()
+    for user_id in user_ids:
+        totals: Dict[Tuple[str, date], List[int]] = {}
+        days = bind.execute(
+            sa.select(daily.c.date, *(daily.c[key] for key in COUNTERS)).where(
+                daily.c.user_id == user_id
+            )
+        ).all()
+        for day, *counts in days:
+            counts = [value or 0 for value in counts]
+            for key in _period_starts(day):
+                counters = totals.setdefault(key, [0] * len(ROLLUP_KEYS))
+                for index, value in enumerate(counts):
+                    counters[index] += value
+                if any(counts[index] for index in ACTIVITY_INDEXES):
+                    counters[-1] += 1
+
+        rows = [
+            {
+                "user_id": user_id,
+                "granularity": granularity,
+                "period_start": start,
+                **dict(zip(ROLLUP_KEYS, counters)),
+                "updated_at": now,
+            }
+            for (granularity, start), counters in totals.items()
+        ]
+        for offset in range(0, len(rows), BATCH_ROWS):
+            op.bulk_insert(rollups, rows[offset : offset + BATCH_ROWS])
+
+
+def upgrade() -> None:
+    """Create github_stat_rollups table and fill it from existing daily stats"""
+    rollups = op.create_table(
+        "github_stat_rollups",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("granularity", sa.String(length=8), nullable=False),
+        sa.Column("period_start", sa.Date(), nullable=False),
+        sa.Column("commit_count", sa.Integer(), nullable=False),
+        sa.Column("pr_count", sa.Integer(), nullable=False),
+        sa.Column("issue_count", sa.Integer(), nullable=False),
+        sa.Column("star_delta", sa.Integer(), nullable=False),
+        sa.Column("active_days", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_github_stat_rollups_id"), "github_stat_rollups", ["id"], unique=False)
+    op.create_index(
+        "uq_github_stat_rollups_user_period",
+        "github_stat_rollups",
+        ["user_id", "granularity", "period_start"],
+        unique=True,
+        postgresql_include=ROLLUP_KEYS,
+    )
+    if not op.get_context().as_sql:
+        _backfill(rollups)
+
+
+def downgrade() -> None:
+    """Drop github_stat_rollups table"""
+    op.drop_index("uq_github_stat_rollups_user_period", table_name="github_stat_rollups")
+    op.drop_index(op.f("ix_github_stat_rollups_id"), table_name="github_stat_rollups")
+    op.drop_table("github_stat_rollups")
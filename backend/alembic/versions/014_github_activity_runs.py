@@ -0,0 +1,86 @@
+"""Add GitHub activity runs for streak and idle-gap queries
+
+Revision ID: 014
+Revises: 013
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from datetime import datetime, timedelta
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "014"
+down_revision: Union[str, None] = "013"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 与 app/services/daily_stats.py 的 ACTIVITY_KEYS 保持一致：收到的 star 不算活跃
+ACTIVITY_COUNTERS = ["commit_count", "pr_count", "issue_count"]
+BATCH_ROWS = 1000
+
+
+def _backfill(runs_table: sa.Table) -> None:
+    """Split each user's active (commit / PR / issue) days into consecutive runs"""
+    bind = op.get_bind()
+    daily = sa.table(
+        "github_daily_stats",
+        sa.column("user_id", sa.Integer),
+        sa.column("date", sa.Date),
+        *(sa.column(key, sa.Integer) for key in ACTIVITY_COUNTERS),
+    )
+    now = datetime.utcnow()
+    user_ids = bind.execute(sa.select(daily.c.user_id).distinct()).scalars().all()
+    for user_id in user_ids:
+        days = bind.execute(
+            sa.select(daily.c.date)
+            .where(
+                daily.c.user_id == user_id,
+                sa.or_(*(daily.c[key] != 0 for key in ACTIVITY_COUNTERS)),
+            )
+            .order_by(daily.c.date)
+        ).scalars()
+        runs = []
+        for day in days:
+            if runs and day - runs[-1]["end_date"] == timedelta(days=1):
+                runs[-1]["end_date"] = day
+            else:
+                runs.append(
+                    {"user_id": user_id, "start_date": day, "end_date": day, "updated_at": now}
+                )
+        for offset in range(0, len(runs), BATCH_ROWS):
+            op.bulk_insert(runs_table, runs[offset : offset + BATCH_ROWS])
+
+
+def upgrade() -> None:
+    """Create github_activity_runs table and fill it from existing daily stats"""
+    runs_table = op.create_table(
+        "github_activity_runs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("start_date", sa.Date(), nullable=False),
+        sa.Column("end_date", sa.Date(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_github_activity_runs_id"), "github_activity_runs", ["id"], unique=False)
+    op.create_index(
+        "uq_github_activity_runs_user_start",
+        "github_activity_runs",
+        ["user_id", "start_date"],
+        unique=True,
+        postgresql_include=["end_date"],
+    )
+    if not op.get_context().as_sql:
+        _backfill(runs_table)
+
+
+def downgrade() -> None:
+    """Drop github_activity_runs table"""
+    op.drop_index("uq_github_activity_runs_user_start", table_name="github_activity_runs")
+    op.drop_index(op.f("ix_github_activity_runs_id"), table_name="github_activity_runs")
+    op.drop_table("github_activity_runs")
@@ -0,0 +1,63 @@
+"""Allow at most one active GitHub sync job per user
+
+Revision ID: 015
+Revises: 014
+Create Date: 2026-10-18 22:00:00.000000
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "015"
+down_revision: Union[str, None] = "014"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ACTIVE_WHERE = sa.text("status IN ('pending', 'running')")
+
+
+def upgrade() -> None:
+    """Cancel duplicate active jobs, then add the partial unique index on user_id"""
+    jobs = sa.table(
+        "github_sync_jobs",
+        sa.column("id", sa.Integer),
+        sa.column("user_id", sa.Integer),
+        sa.column("status", sa.String),
+        sa.column("lease_expires_at", sa.DateTime),
+        sa.column("error", sa.Text),
+        sa.column("finished_at", sa.DateTime),
+    )
+    active = jobs.c.status.in_(["pending", "running"])
+    cancelled = {
+        "status": "cancelled",
+        "lease_expires_at": None,
+        "error": "重复的同步任务，已取消",
+        "finished_at": datetime.utcnow(),
+    }
+    # 每个用户只保留一个进行中任务（优先保留执行中的、其次最新的），其余视为重复入队直接取消
+    running = sa.select(jobs.c.user_id).where(jobs.c.status == "running")
+    op.execute(
+        jobs.update()
+        .where(jobs.c.status == "pending", jobs.c.user_id.in_(running))
+        .values(**cancelled)
+    )
+    latest = sa.select(sa.func.max(jobs.c.id)).where(active).group_by(jobs.c.user_id)
+    op.execute(jobs.update().where(active, jobs.c.id.not_in(latest)).values(**cancelled))
+    op.create_index(
+        "uq_github_sync_jobs_user_active",
+        "github_sync_jobs",
+        ["user_id"],
+        unique=True,
+        postgresql_where=ACTIVE_WHERE,
+        sqlite_where=ACTIVE_WHERE,
+    )
+
+
+def downgrade() -> None:
+    """Drop the partial unique index"""
+    op.drop_index("uq_github_sync_jobs_user_active", table_name="github_sync_jobs")
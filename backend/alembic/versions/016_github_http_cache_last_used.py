@@ -0,0 +1,36 @@
+"""Key GitHub HTTP cache by user and track last use for TTL pruning
+
+Revision ID: 016
+Revises: 015
+Create Date: 2026-10-18 23:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "016"
+down_revision: Union[str, None] = "015"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Drop entries keyed by token hash and add last_used_at"""
+    # 缓存键改为按用户 ID 计算，旧条目不会再被命中，直接清空
+    op.execute(sa.text("DELETE FROM github_http_cache"))
+    with op.batch_alter_table("github_http_cache") as batch_op:
+        batch_op.add_column(sa.Column("last_used_at", sa.DateTime(), nullable=False))
+    op.create_index(
+        op.f("ix_github_http_cache_last_used_at"), "github_http_cache", ["last_used_at"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Drop last_used_at"""
+    op.drop_index(op.f("ix_github_http_cache_last_used_at"), table_name="github_http_cache")
+    with op.batch_alter_table("github_http_cache") as batch_op:
+        batch_op.drop_column("last_used_at")
@@ -6,11 +6,12 @@ from typing import Optional
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import decode_token
 from app.db.session import get_db
 from app.models import User
+from app.schemas.user import UserInDB
+from app.services.auth_cache import cache_user, get_cached_user, verify_token
 
 # HTTP Bearer 认证方案
 security = HTTPBearer(auto_error=False)
@@ -39,25 +40,26 @@ def get_token(credentials: Optional[HTTPAuthorizationCredentials] = Depends(secu
     return credentials.credentials
 
 
-def get_current_user(
+async def get_current_user(
     token: str = Depends(get_token),
-    db: Session = Depends(get_db),
-) -> User:
+    db: AsyncSession = Depends(get_db),
+) -> UserInDB:
     """
     获取当前登录的用户
-    从 JWT token 中解码用户 ID，然后从数据库查询用户信息
+    验证 JWT token 得到用户 ID，再取出用户身份信息；
+    token 验证结果和用户信息都有进程内缓存，命中时不访问数据库
 
     Args:
         token: JWT token（从 Authorization header 中获取）
-        db: 数据库会话
+        db: 数据库会话（仅在缓存未命中时使用）
 
     Returns:
-        当前用户对象
+        当前用户的身份信息
 
     Raises:
         HTTPException: 如果 token 无效或用户不存在
     """
-    user_id = decode_token(token)
+    user_id = verify_token(token)
     if user_id is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -65,19 +67,17 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    try:
-        user = db.query(User).filter(User.id == int(user_id)).first()
-    except (ValueError, TypeError):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token format",
-        )
+    user = get_cached_user(user_id)
+    if user is not None:
+        return user
 
-    if user is None:
+    db_user = await db.get(User, user_id)
+    if db_user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
         )
 
+    user = UserInDB.model_validate(db_user)
+    cache_user(user)
     return user
-
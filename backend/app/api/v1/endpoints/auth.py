@@ -7,7 +7,8 @@ from urllib.parse import urlencode
 
 import httpx
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.core.security import create_access_token
@@ -15,6 +16,8 @@ from app.db.session import get_db
 from app.models import User
 from app.schemas.auth import GithubUserInfo, LoginResponse
 from app.schemas.user import UserResponse
+from app.services.auth_cache import invalidate_user
+from app.services.github_client import get_github_client, github_headers
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -47,7 +50,7 @@ async def github_login():
 async def github_callback(
     code: str = Query(..., description="GitHub OAuth 授权码"),
     state: Optional[str] = Query(None, description="CSRF 防护状态码"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> LoginResponse:
     """
     处理 GitHub OAuth 回调
@@ -80,55 +83,47 @@ async def github_callback(
     }
 
     try:
-        async with httpx.AsyncClient() as client:
-            # 请求 access token
-            token_response = await client.post(
-                token_url,
-                data=token_params,
-                headers={"Accept": "application/json"},
-                timeout=10.0,
-            )
-            token_response.raise_for_status()
-            token_data = token_response.json()
-
-            if "error" in token_data:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail=f"GitHub OAuth 失败: {token_data.get('error_description', 'Unknown error')}",
-                )
-
-            access_token = token_data.get("access_token")
-            if not access_token:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="无法获取 GitHub access token",
-                )
-
-            # 第 2 步：使用 access token 获取用户信息
-            user_url = "https://api.github.com/user"
-            user_response = await client.get(
-                user_url,
-                headers={
-                    "Authorization": f"Bearer {access_token}",
-                    "Accept": "application/vnd.github.v3+json",
-                },
-                timeout=10.0,
+        client = get_github_client()
+        # 请求 access token
+        token_response = await client.post(
+            token_url,
+            data=token_params,
+            headers={"Accept": "application/json"},
+        )
+        token_response.raise_for_status()
+        token_data = token_response.json()
+
+        if "error" in token_data:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail=f"GitHub OAuth 失败: {token_data.get('error_description', 'Unknown error')}",
             )
-            user_response.raise_for_status()
-            github_user_data = user_response.json()
-
-            # 解析 GitHub 用户信息
-            github_user = GithubUserInfo(
-                id=github_user_data["id"],
-                login=github_user_data["login"],
-                avatar_url=github_user_data.get("avatar_url", ""),
-                name=github_user_data.get("name"),
-                bio=github_user_data.get("bio"),
-                public_repos=github_user_data.get("public_repos", 0),
-                followers=github_user_data.get("followers", 0),
-                following=github_user_data.get("following", 0),
+
+        access_token = token_data.get("access_token")
+        if not access_token:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="无法获取 GitHub access token",
             )
 
+        # 第 2 步：使用 access token 获取用户信息
+        user_url = f"{settings.GITHUB_API_BASE_URL}/user"
+        user_response = await client.get(user_url, headers=github_headers(access_token))
+        user_response.raise_for_status()
+        github_user_data = user_response.json()
+
+        # 解析 GitHub 用户信息
+        github_user = GithubUserInfo(
+            id=github_user_data["id"],
+            login=github_user_data["login"],
+            avatar_url=github_user_data.get("avatar_url", ""),
+            name=github_user_data.get("name"),
+            bio=github_user_data.get("bio"),
+            public_repos=github_user_data.get("public_repos", 0),
+            followers=github_user_data.get("followers", 0),
+            following=github_user_data.get("following", 0),
+        )
+
     except httpx.HTTPError as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -136,7 +131,7 @@ async def github_callback(
         )
 
     # 第 3 步：在数据库中创建或更新用户
-    user = db.query(User).filter(User.github_id == github_user.id).first()
+    user = await db.scalar(select(User).where(User.github_id == github_user.id))
 
     if user:
         # 更新现有用户
@@ -153,8 +148,10 @@ async def github_callback(
         )
         db.add(user)
 
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
+    # 新的 GitHub token / 头像等立即对本进程后续请求生效
+    invalidate_user(user.id)
 
     # 第 4 步：签发 JWT token
     jwt_token = create_access_token(subject=str(user.id))
@@ -3,21 +3,56 @@ GitHub 数据同步和查询端点
 实现 GitHub 数据同步和统计查询功能
 """
 from datetime import date, datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user
 from app.db.session import get_db
-from app.models import GithubDailyStat, User
-from app.schemas.github import GithubDailyStatsQueryResponse, GithubSyncResponse
-from app.services.github_sync import sync_github_data
+from app.core.config import settings
+from app.core.serialization import dumps, model_fields, rows_to_records
+from app.models import GithubActivityRun, GithubDailyStat, GithubStatRollup, GithubSyncJob
+from app.models.github_stat_rollup import ROLLUP_MONTH, ROLLUP_WEEK, ROLLUP_YEAR
+from app.models.github_sync_job import SYNC_JOB_PENDING
+from app.schemas.github import (
+    GithubDailyStatResponse,
+    GithubDailyStatsQueryResponse,
+    GithubHeatmapResponse,
+    GithubMovingAverageResponse,
+    GithubRateLimitResponse,
+    GithubStatRangeResponse,
+    GithubStatRollupQueryResponse,
+    GithubStatRollupResponse,
+    GithubStreaksResponse,
+    GithubSyncJobResponse,
+)
+from app.schemas.user import UserInDB
+from app.services.daily_stats import STAT_KEYS
+from app.services.github_client import github_request
+from app.services.github_ratelimit import rate_limit_governor
+from app.services.heatmap import HEATMAP_ENCODING_JSON, build_heatmap
+from app.services.stat_rollups import period_start
+from app.services.stats_cache import (
+    CachedResponse,
+    etag_matches,
+    get_response,
+    load_stats_version,
+    store_response,
+)
+from app.services.streaks import summarize_runs
+from app.services.sync_jobs import enqueue_sync_job, request_cancel, start_sync_job
+from app.services.timeseries import load_daily_series
 
 router = APIRouter(prefix="/github", tags=["github"])
 
 
-@router.post("/sync")
+@router.post(
+    "/sync",
+    response_model=GithubSyncJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
 async def sync_github(
     from_date: Optional[str] = Query(
         None,
@@ -34,21 +69,22 @@ async def sync_github(
         description="同步模式：standard（90 天内 GitHub events），deep（任意时间段，耗时更长）",
         regex=r"^(standard|deep)$",
     ),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-) -> GithubSyncResponse:
+    current_user: UserInDB = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> GithubSyncJobResponse:
     """
-    同步用户的 GitHub 数据
+    创建 GitHub 数据同步任务
 
-    从 GitHub API 拉取用户的仓库和活动数据，并存储到数据库。
+    同步在后台执行，接口立即返回任务信息；通过 `GET /github/sync/jobs/{job_id}`
+    查询进度和结果。同一用户已有进行中的任务时返回该任务。
 
     **认证**: 需要有效的 JWT token
 
     Returns:
-        GithubSyncResponse: 同步结果，包含仓库数和更新的统计记录数
+        GithubSyncJobResponse: 同步任务状态
 
     Raises:
-        HTTPException: 如果同步过程中出现错误
+        HTTPException: 如果日期参数不正确
     """
     try:
         # 解析日期范围
@@ -63,37 +99,171 @@ async def sync_github(
             # deep 模式默认近 365 天；standard 模式默认近 90 天
             default_days = 365 if mode == "deep" else 90
             start_date = end_date - timedelta(days=default_days)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"日期格式不正确: {str(e)}",
+        )
 
-        if start_date > end_date:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="开始日期不能晚于结束日期",
-            )
-
-        repos_count, stats_updated = await sync_github_data(
-            current_user,
-            db,
-            start_date=start_date,
-            end_date=end_date,
-            days=(end_date - start_date).days + 1,
-            mode=mode,
+    if start_date > end_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="开始日期不能晚于结束日期",
         )
 
-        date_range = f"{start_date} 至 {end_date}"
+    job = await db.run_sync(enqueue_sync_job, current_user.id, start_date, end_date, mode)
+    if job.status == SYNC_JOB_PENDING:
+        start_sync_job(job.id)
 
-        return GithubSyncResponse(
-            message="GitHub 数据同步成功",
-            repos_count=repos_count,
-            stats_updated=stats_updated,
-            date_range=date_range,
+    return job
+
+
+async def _get_user_job(db: AsyncSession, job_id: int, user: UserInDB) -> GithubSyncJob:
+    job = await db.get(GithubSyncJob, job_id)
+    if job is None or job.user_id != user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="同步任务不存在",
         )
+    return job
+
+
+@router.get("/sync/jobs/{job_id}", response_model=GithubSyncJobResponse)
+async def get_sync_job(
+    job_id: int,
+    current_user: UserInDB = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> GithubSyncJobResponse:
+    """
+    查询同步任务的状态、进度和结果
+
+    **认证**: 需要有效的 JWT token
+
+    Returns:
+        GithubSyncJobResponse: 同步任务状态
+
+    Raises:
+        HTTPException: 如果任务不存在或不属于当前用户
+    """
+    return await _get_user_job(db, job_id, current_user)
+
+
+@router.post("/sync/jobs/{job_id}/cancel", response_model=GithubSyncJobResponse)
+async def cancel_sync_job(
+    job_id: int,
+    current_user: UserInDB = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> GithubSyncJobResponse:
+    """
+    取消同步任务
 
+    未开始的任务立即取消；执行中的任务会在当前请求完成后中断。
+    已结束的任务原样返回。
+
+    **认证**: 需要有效的 JWT token
+
+    Returns:
+        GithubSyncJobResponse: 同步任务状态
+
+    Raises:
+        HTTPException: 如果任务不存在或不属于当前用户
+    """
+    job = await _get_user_job(db, job_id, current_user)
+    return await db.run_sync(request_cancel, job)
+
+
+@router.get("/rate-limit", response_model=GithubRateLimitResponse)
+async def get_rate_limit(
+    current_user: UserInDB = Depends(get_current_user),
+) -> GithubRateLimitResponse:
+    """
+    查询当前用户 GitHub token 的剩余配额
+
+    调用 GitHub `GET /rate_limit`（该接口不消耗配额）刷新本地调度器状态后返回。
+
+    **认证**: 需要有效的 JWT token
+
+    Returns:
+        GithubRateLimitResponse: 各类资源的配额上限、剩余次数和重置倒计时
+    """
+    github_token = current_user.github_access_token
+    try:
+        response = await github_request(
+            "GET", f"{settings.GITHUB_API_BASE_URL}/rate_limit", github_token
+        )
+        response.raise_for_status()
+        rate_limit_governor.load_rate_limit_payload(github_token, response.json())
     except Exception as e:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"GitHub 数据同步失败: {str(e)}",
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"GitHub 配额查询失败: {str(e)}",
+        )
+
+    return GithubRateLimitResponse(resources=rate_limit_governor.snapshot(github_token))
+
+
+def _parse_date_range(
+    from_date: Optional[str],
+    to_date: Optional[str],
+    default_days: Optional[int],
+    max_days: Optional[int] = None,
+) -> Tuple[Optional[date], date]:
+    """
+    解析查询的日期范围
+
+    Args:
+        default_days: 未提供开始日期时回溯的天数；为 None 时不限制开始日期
+        max_days: 范围最多包含的天数；为 None 时不限制
+
+    Raises:
+        HTTPException: 如果日期格式不正确、开始日期晚于结束日期或范围超过 max_days
+    """
+    try:
+        if to_date:
+            end_date = datetime.strptime(to_date, "%Y-%m-%d").date()
+        else:
+            end_date = datetime.now().date()
+
+        if from_date:
+            start_date = datetime.strptime(from_date, "%Y-%m-%d").date()
+        elif default_days is not None:
+            start_date = end_date - timedelta(days=default_days)
+        else:
+            start_date = None
+    except (ValueError, OverflowError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"日期格式不正确: {str(e)}",
         )
 
+    if start_date is not None and start_date > end_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="开始日期不能晚于结束日期",
+        )
+    if max_days is not None and (end_date - start_date).days + 1 > max_days:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"日期范围不能超过 {max_days} 天",
+        )
+    return start_date, end_date
+
+
+def _cached_json_response(cached: CachedResponse, if_none_match: Optional[str]) -> Response:
+    """返回缓存的响应体；客户端持有相同 ETag 时返回 304"""
+    headers = {
+        "ETag": cached.etag,
+        # 每次使用前向服务端确认，数据未变时只需一个 304
+        "Cache-Control": "private, no-cache",
+        "Vary": "Authorization",
+    }
+    if etag_matches(if_none_match, cached.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=cached.body, media_type="application/json", headers=headers)
+
+
+_DAILY_STAT_FIELDS = model_fields(GithubDailyStatResponse)
+
 
 @router.get("/stats/daily", response_model=GithubDailyStatsQueryResponse)
 async def get_daily_stats(
@@ -107,13 +277,15 @@ async def get_daily_stats(
         description="结束日期 (YYYY-MM-DD)，默认为今天",
         regex=r"^\d{4}-\d{2}-\d{2}$",
     ),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-) -> GithubDailyStatsQueryResponse:
+    if_none_match: Optional[str] = Header(None),
+    current_user: UserInDB = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
     """
     查询用户的每日 GitHub 统计数据
 
     返回指定时间范围内的每日 commit、PR、issue 等统计数据。
+    响应按统计数据版本缓存并带强 ETag，数据未变化时对 If-None-Match 返回 304。
 
     **认证**: 需要有效的 JWT token
 
@@ -132,45 +304,331 @@ async def get_daily_stats(
     Raises:
         HTTPException: 如果日期格式不正确
     """
-    # 解析日期参数
-    try:
-        if to_date:
-            end_date = datetime.strptime(to_date, "%Y-%m-%d").date()
-        else:
-            end_date = datetime.now().date()
+    start_date, end_date = _parse_date_range(from_date, to_date, default_days=30)
 
-        if from_date:
-            start_date = datetime.strptime(from_date, "%Y-%m-%d").date()
-        else:
-            start_date = end_date - timedelta(days=30)
+    version = await load_stats_version(db, current_user.id)
+    query = ("daily", start_date, end_date)
+    cached = get_response(current_user.id, version, query)
+    if cached is None:
+        # 只查询响应需要的列，直接编码，不逐行构造模型
+        rows = (
+            await db.execute(
+                select(*(getattr(GithubDailyStat, field) for field in _DAILY_STAT_FIELDS))
+                .where(
+                    GithubDailyStat.user_id == current_user.id,
+                    GithubDailyStat.date >= start_date,
+                    GithubDailyStat.date <= end_date,
+                )
+                .order_by(GithubDailyStat.date)
+            )
+        ).all()
+        body = dumps({"data": rows_to_records(rows, _DAILY_STAT_FIELDS), "total": len(rows)})
+        cached = store_response(current_user.id, version, query, body)
 
-    except ValueError as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"日期格式不正确: {str(e)}",
-        )
+    return _cached_json_response(cached, if_none_match)
 
-    # 验证日期范围
-    if start_date > end_date:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="开始日期不能晚于结束日期",
-        )
 
-    # 查询数据库
-    stats = (
-        db.query(GithubDailyStat)
-        .filter(
-            GithubDailyStat.user_id == current_user.id,
-            GithubDailyStat.date >= start_date,
-            GithubDailyStat.date <= end_date,
+# 各汇总粒度默认回溯的天数，None 表示全部历史
+_ROLLUP_DEFAULT_DAYS = {ROLLUP_WEEK: 7 * 52, ROLLUP_MONTH: 365, ROLLUP_YEAR: None}
+_ROLLUP_FIELDS = model_fields(GithubStatRollupResponse)
+
+
+@router.get("/stats/rollup", response_model=GithubStatRollupQueryResponse)
+async def get_stat_rollups(
+    granularity: str = Query(
+        ...,
+        description="汇总粒度：week（周一开始）/ month / year",
+        regex=r"^(week|month|year)$",
+    ),
+    from_date: Optional[str] = Query(
+        None,
+        description="开始日期 (YYYY-MM-DD)，默认周粒度为 52 周前、月粒度为一年前、年粒度为全部历史",
+        regex=r"^\d{4}-\d{2}-\d{2}$",
+    ),
+    to_date: Optional[str] = Query(
+        None,
+        description="结束日期 (YYYY-MM-DD)，默认为今天",
+        regex=r"^\d{4}-\d{2}-\d{2}$",
+    ),
+    if_none_match: Optional[str] = Header(None),
+    current_user: UserInDB = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    """
+    查询按周 / 月 / 年汇总的 GitHub 统计
+
+    汇总在同步写入每日统计时增量维护，返回与日期范围相交的各周期的合计和活跃天数。
+    与每日统计相同，响应按统计数据版本缓存并支持 ETag / 304。
+
+    **认证**: 需要有效的 JWT token
+
+    **示例**:
+    ```
+    GET /github/stats/rollup?granularity=year
+    GET /github/stats/rollup?granularity=month&from_date=2025-01-01&to_date=2025-12-31
+    ```
+
+    Returns:
+        GithubStatRollupQueryResponse: 按周期起始日期升序的汇总列表
+
+    Raises:
+        HTTPException: 如果日期格式不正确
+    """
+    start_date, end_date = _parse_date_range(
+        from_date, to_date, default_days=_ROLLUP_DEFAULT_DAYS[granularity]
+    )
+
+    version = await load_stats_version(db, current_user.id)
+    query = ("rollup", granularity, start_date, end_date)
+    cached = get_response(current_user.id, version, query)
+    if cached is None:
+        conditions = [
+            GithubStatRollup.user_id == current_user.id,
+            GithubStatRollup.granularity == granularity,
+            GithubStatRollup.period_start <= end_date,
+        ]
+        if start_date is not None:
+            conditions.append(GithubStatRollup.period_start >= period_start(start_date, granularity))
+        rows = (
+            await db.execute(
+                select(*(getattr(GithubStatRollup, field) for field in _ROLLUP_FIELDS))
+                .where(*conditions)
+                .order_by(GithubStatRollup.period_start)
+            )
+        ).all()
+        body = dumps(
+            {
+                "granularity": granularity,
+                "data": rows_to_records(rows, _ROLLUP_FIELDS),
+                "total": len(rows),
+            }
         )
-        .order_by(GithubDailyStat.date)
-        .all()
+        cached = store_response(current_user.id, version, query, body)
+
+    return _cached_json_response(cached, if_none_match)
+
+
+@router.get("/stats/heatmap", response_model=GithubHeatmapResponse)
+async def get_stats_heatmap(
+    year: Optional[int] = Query(
+        None, description="自然年，默认为截至今天的最近 365 天", ge=2008, le=9999
+    ),
+    encoding: str = Query(
+        HEATMAP_ENCODING_JSON,
+        description="json：整数数组；base64：小端 int32 数组的 Base64 字符串",
+        regex=r"^(json|base64)$",
+    ),
+    if_none_match: Optional[str] = Header(None),
+    current_user: UserInDB = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    """
+    查询日历热力图所需的一整年统计
+
+    返回连续的每一天（无活动的日期为 0），每个计数字段一个与日期对齐的数组，
+    第 i 个元素对应 start_date + i 天。与每日统计相同，响应按统计数据版本缓存并支持 ETag / 304。
+
+    **认证**: 需要有效的 JWT token
+
+    **示例**:
+    ```
+    GET /github/stats/heatmap
+    GET /github/stats/heatmap?year=2025&encoding=base64
+    ```
+
+    Returns:
+        GithubHeatmapResponse: 列式的每日统计
+    """
+    if year is not None:
+        start_date, end_date = date(year, 1, 1), date(year, 12, 31)
+    else:
+        end_date = datetime.now().date()
+        start_date = end_date - timedelta(days=364)
+
+    version = await load_stats_version(db, current_user.id)
+    query = ("heatmap", start_date, end_date, encoding)
+    cached = get_response(current_user.id, version, query)
+    if cached is None:
+        rows = (
+            await db.execute(
+                select(
+                    GithubDailyStat.date,
+                    GithubDailyStat.commit_count,
+                    GithubDailyStat.pr_count,
+                    GithubDailyStat.issue_count,
+                    GithubDailyStat.star_delta,
+                ).where(
+                    GithubDailyStat.user_id == current_user.id,
+                    GithubDailyStat.date >= start_date,
+                    GithubDailyStat.date <= end_date,
+                )
+            )
+        ).all()
+        body = dumps(build_heatmap(rows, start_date, end_date, encoding))
+        cached = store_response(current_user.id, version, query, body)
+
+    return _cached_json_response(cached, if_none_match)
+
+
+# 基于时间序列缓存的查询最多覆盖的天数（约 10 年）
+_SERIES_MAX_DAYS = 366 * 10
+
+
+@router.get("/stats/range", response_model=GithubStatRangeResponse)
+async def get_stats_range(
+    from_date: Optional[str] = Query(
+        None,
+        description="开始日期 (YYYY-MM-DD)，默认为 30 天前",
+        regex=r"^\d{4}-\d{2}-\d{2}$",
+    ),
+    to_date: Optional[str] = Query(
+        None,
+        description="结束日期 (YYYY-MM-DD)，默认为今天",
+        regex=r"^\d{4}-\d{2}-\d{2}$",
+    ),
+    window: int = Query(7, description="最佳窗口的天数", ge=1, le=366),
+    current_user: UserInDB = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> dict:
+    """
+    查询日期范围内的合计、与上一个等长区间的对比和最佳窗口
+
+    如"这个月与上个月相比"、"今年提交最多的一周"。基于进程内缓存的每日统计前缀和计算，
+    除读取统计数据版本外不查询数据库。日期范围最多 3660 天（约 10 年）。
+
+    **认证**: 需要有效的 JWT token
+
+    **示例**:
+    ```
+    GET /github/stats/range?from_date=2025-01-01&to_date=2025-12-31&window=7
+    ```
+
+    Returns:
+        GithubStatRangeResponse: 合计、上一区间合计和各计数字段的最佳窗口
+
+    Raises:
+        HTTPException: 如果日期格式不正确
+    """
+    start_date, end_date = _parse_date_range(
+        from_date, to_date, default_days=30, max_days=_SERIES_MAX_DAYS
     )
+    series = await load_daily_series(db, current_user.id)
+
+    # 上一区间落到 date.min 之前的部分没有数据，截断即可
+    previous_end_ordinal = start_date.toordinal() - 1
+    if previous_end_ordinal < date.min.toordinal():
+        previous_totals = {key: 0 for key in STAT_KEYS}
+    else:
+        previous_start_ordinal = previous_end_ordinal - (end_date - start_date).days
+        previous_totals = series.totals(
+            date.fromordinal(max(previous_start_ordinal, date.min.toordinal())),
+            date.fromordinal(previous_end_ordinal),
+        )
+    best_windows = {}
+    for key in STAT_KEYS:
+        best = series.best_window(key, window, start_date, end_date)
+        best_windows[key] = None if best is None else {"start_date": best[0], "total": best[1]}
+    return {
+        "from_date": start_date,
+        "to_date": end_date,
+        "totals": series.totals(start_date, end_date),
+        "previous_totals": previous_totals,
+        "window": window,
+        "best_windows": best_windows,
+    }
+
+
+@router.get("/stats/moving-average", response_model=GithubMovingAverageResponse)
+async def get_stats_moving_average(
+    metric: str = Query(
+        "commit_count",
+        description="计数字段",
+        regex=r"^(commit_count|pr_count|issue_count|star_delta)$",
+    ),
+    window: int = Query(7, description="滑动窗口的天数", ge=1, le=366),
+    from_date: Optional[str] = Query(
+        None,
+        description="开始日期 (YYYY-MM-DD)，默认为一年前",
+        regex=r"^\d{4}-\d{2}-\d{2}$",
+    ),
+    to_date: Optional[str] = Query(
+        None,
+        description="结束日期 (YYYY-MM-DD)，默认为今天",
+        regex=r"^\d{4}-\d{2}-\d{2}$",
+    ),
+    current_user: UserInDB = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> dict:
+    """
+    查询某个计数字段每天的尾随滑动平均
 
-    return GithubDailyStatsQueryResponse(
-        data=stats,
-        total=len(stats),
+    第 i 个值为截至 start_date + i 天（含）的 window 天平均，窗口可以延伸到开始日期之前。
+    日期范围最多 3660 天（约 10 年）。
+
+    **认证**: 需要有效的 JWT token
+
+    **示例**:
+    ```
+    GET /github/stats/moving-average?metric=commit_count&window=28
+    ```
+
+    Returns:
+        GithubMovingAverageResponse: 与日期对齐的滑动平均
+
+    Raises:
+        HTTPException: 如果日期格式不正确
+    """
+    start_date, end_date = _parse_date_range(
+        from_date, to_date, default_days=365, max_days=_SERIES_MAX_DAYS
     )
+    series = await load_daily_series(db, current_user.id)
+    values = series.moving_average(metric, window, start_date, end_date)
+    return {
+        "metric": metric,
+        "window": window,
+        "start_date": start_date,
+        "values": values.round(4).tolist(),
+    }
+
+
+@router.get("/stats/streaks", response_model=GithubStreaksResponse)
+async def get_stats_streaks(
+    min_gap_days: int = Query(7, description="列出的空闲间隔的最少天数", ge=1),
+    limit: int = Query(10, description="列出的连续活动和空闲间隔的条数上限", ge=1, le=100),
+    if_none_match: Optional[str] = Header(None),
+    current_user: UserInDB = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    """
+    查询当前和最长的连续活动、空闲间隔
+
+    一天有 commit、PR 或 issue 即算作活跃；仓库收到（或被取消）的 star 不是用户自己的活动，不计入。
+    基于同步时增量维护的连续活动区间计算，不扫描每日统计。今天尚无活动时，
+    截至昨天的连续活动仍算作当前连续。响应按统计数据版本和日期缓存并支持 ETag / 304。
+
+    **认证**: 需要有效的 JWT token
+
+    **示例**:
+    ```
+    GET /github/stats/streaks?min_gap_days=14&limit=5
+    ```
+
+    Returns:
+        GithubStreaksResponse: 连续活动与空闲间隔
+    """
+    today = datetime.now().date()
+    version = await load_stats_version(db, current_user.id)
+    query = ("streaks", today, min_gap_days, limit)
+    cached = get_response(current_user.id, version, query)
+    if cached is None:
+        runs = (
+            await db.execute(
+                select(GithubActivityRun.start_date, GithubActivityRun.end_date)
+                .where(GithubActivityRun.user_id == current_user.id)
+                .order_by(GithubActivityRun.start_date)
+            )
+        ).all()
+        body = dumps(summarize_runs(runs, today, min_gap_days, limit))
+        cached = store_response(current_user.id, version, query, body)
 
+    return _cached_json_response(cached, if_none_match)
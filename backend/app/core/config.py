@@ -17,6 +17,11 @@ class Settings(BaseSettings):
 
     # 数据库配置
     DATABASE_URL: str = "sqlite:///./devorbit.db"
+    # API 使用的异步连接池（asyncpg / aiosqlite），SQLite 使用驱动默认连接池
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 10.0  # 等待空闲连接的最长秒数，超时直接报错而不是无限排队
+    DB_POOL_RECYCLE: int = 1800  # 连接最长存活秒数，避免被数据库或中间代理静默断开
 
     # GitHub OAuth 配置
     GITHUB_CLIENT_ID: str = ""
@@ -25,10 +30,81 @@ class Settings(BaseSettings):
     GITHUB_REDIRECT_URI: str = "http://localhost:13233/auth/github/callback"
     GITHUB_API_BASE_URL: str = "https://api.github.com"
 
+    # GitHub HTTP 客户端配置（应用级共享连接池）
+    GITHUB_HTTP2: bool = True
+    GITHUB_HTTP_TIMEOUT: float = 20.0
+    GITHUB_HTTP_CONNECT_TIMEOUT: float = 5.0
+    GITHUB_HTTP_MAX_CONNECTIONS: int = 50
+    GITHUB_HTTP_MAX_KEEPALIVE: int = 20
+    GITHUB_HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    GITHUB_HTTP_CACHE_ENABLED: bool = True  # ETag / Last-Modified 条件请求缓存
+    GITHUB_HTTP_CACHE_TTL_DAYS: int = 7  # 超过该天数未使用的缓存条目由自动同步调度清理
+
+    # standard 模式下仓库列表的最短刷新间隔（分钟）
+    GITHUB_REPO_SYNC_INTERVAL_MINUTES: int = 60
+
+    # standard 同步时归档裁剪后的原始事件，供离线重新聚合
+    GITHUB_EVENT_ARCHIVE_ENABLED: bool = True
+
+    # 深度同步引擎：search（逐条搜索，默认）/ contributions（GraphQL 贡献日历）
+    # contributions 的 commit 数只统计默认分支上的提交，与 search 的口径不同；
+    # 切换后已有用户的历史数据需重新深度同步，否则新旧口径混在一起
+    GITHUB_DEEP_ENGINE: str = "search"
+
+    # 深度同步并发配置（每个阶段同时在途的请求数）
+    GITHUB_DEEP_CONTRIBUTION_CONCURRENCY: int = 4
+    GITHUB_DEEP_COMMIT_CONCURRENCY: int = 4
+    GITHUB_DEEP_PR_CONCURRENCY: int = 2
+    GITHUB_DEEP_ISSUE_CONCURRENCY: int = 2
+    GITHUB_DEEP_STAR_CONCURRENCY: int = 4
+    GITHUB_STARS_BATCH_SIZE: int = 25  # 每个 GraphQL 查询合并的仓库数
+
+    # GitHub 速率限制调度（令牌桶限速 + 主配额跟踪）
+    GITHUB_CORE_REQUESTS_PER_SECOND: float = 10.0
+    GITHUB_CORE_BURST: int = 50
+    GITHUB_SEARCH_REQUESTS_PER_MINUTE: int = 30
+    GITHUB_GRAPHQL_REQUESTS_PER_SECOND: float = 5.0
+    GITHUB_GRAPHQL_BURST: int = 20
+    GITHUB_RATE_LIMIT_MAX_WAIT: float = 120.0  # 单次等待超过该秒数直接失败
+    GITHUB_RATE_LIMIT_MAX_RETRIES: int = 3
+
+    # 同步任务配置
+    SYNC_JOB_PROGRESS_INTERVAL: float = 2.0  # 进度写库、续约和取消检查的间隔（秒）
+    # inline：API 进程内直接执行；worker：API 只入队，由 python -m app.workers.sync 领取执行
+    SYNC_EXECUTION_MODE: str = "inline"
+    SYNC_JOB_LEASE_SECONDS: int = 60  # 执行租约时长，执行方失联超过该时长后任务可被重新领取
+    SYNC_JOB_MAX_ATTEMPTS: int = 3  # 因执行方失联被重新领取的次数上限
+    SYNC_WORKER_CONCURRENCY: int = 2  # 单个 worker 进程同时执行的任务数
+    SYNC_WORKER_POLL_INTERVAL: float = 2.0  # 没有可领取任务时的轮询间隔（秒）
+
+    # 统计查询响应缓存：按 (用户, 查询参数, 统计数据版本) 缓存序列化后的响应体
+    STATS_RESPONSE_CACHE_MAX_ENTRIES: int = 2048
+    STATS_RESPONSE_CACHE_TTL_SECONDS: float = 3600.0
+    # 每用户稠密时间序列（前缀和）缓存的内存预算（字节），超出时按最近使用淘汰
+    TIMESERIES_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+
+    # 自动同步调度配置
+    AUTO_SYNC_ENABLED: bool = True
+    AUTO_SYNC_TICK_SECONDS: float = 30.0
+    AUTO_SYNC_MAX_CONCURRENCY: int = 4  # 全局同时进行的同步任务上限
+    AUTO_SYNC_JITTER: float = 0.2  # 计划时间的随机抖动比例
+    # 按最近一次活动距今的天数分档，每档对应的同步间隔（分钟）
+    AUTO_SYNC_HOT_IDLE_DAYS: int = 2
+    AUTO_SYNC_HOT_MINUTES: int = 10
+    AUTO_SYNC_WARM_IDLE_DAYS: int = 14
+    AUTO_SYNC_WARM_MINUTES: int = 60
+    AUTO_SYNC_COOL_IDLE_DAYS: int = 60
+    AUTO_SYNC_COOL_MINUTES: int = 360
+    AUTO_SYNC_DORMANT_MINUTES: int = 1440
+
     # JWT 配置
     JWT_SECRET_KEY: str = "your-secret-key-change-in-production"
     JWT_ALGORITHM: str = "HS256"
     JWT_EXPIRE_MINUTES: int = 10080  # 7 days
+    # 已验证 token 和用户身份的进程内缓存；用户信息变化时在本进程内立即失效，
+    # 其他进程最多在 TTL 后看到变化
+    AUTH_CACHE_TTL_SECONDS: float = 60.0
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
 
     # API 配置
     API_HOST: str = "0.0.0.0"
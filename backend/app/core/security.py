@@ -37,24 +37,36 @@ def create_access_token(
     return encoded_jwt
 
 
-def decode_token(token: str) -> Optional[str]:
+def decode_token_claims(token: str) -> Optional[dict]:
     """
-    解码并验证 JWT token
+    解码并验证 JWT token，返回全部声明
 
     Args:
         token: JWT token 字符串
 
     Returns:
-        token 中的 subject（用户 ID），如果验证失败返回 None
+        token 的 payload（至少包含 sub 和 exp），如果验证失败返回 None
     """
     try:
         payload = jwt.decode(
             token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM]
         )
-        subject: str = payload.get("sub")
-        if subject is None:
-            return None
-        return subject
     except (jwt.InvalidTokenError, ValidationError):
         return None
+    if payload.get("sub") is None:
+        return None
+    return payload
 
+
+def decode_token(token: str) -> Optional[str]:
+    """
+    解码并验证 JWT token
+
+    Args:
+        token: JWT token 字符串
+
+    Returns:
+        token 中的 subject（用户 ID），如果验证失败返回 None
+    """
+    payload = decode_token_claims(token)
+    return None if payload is None else payload["sub"]
@@ -0,0 +1,29 @@
+"""
+JSON 序列化
+全局默认响应类使用 orjson；统计列表直接由查询出的列元组拼成 dict 后一次性编码，
+不再逐行构造 Pydantic 模型做 from_attributes 校验。
+date / datetime 的输出格式与 Pydantic 相同（ISO 8601，无时区的 datetime 不带偏移）
+"""
+from typing import Any, Dict, Iterable, List, Sequence, Type
+
+import orjson
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+# 全局默认响应类
+DefaultResponse = ORJSONResponse
+
+
+def dumps(value: Any) -> bytes:
+    """编码为 UTF-8 JSON"""
+    return orjson.dumps(value)
+
+
+def model_fields(model: Type[BaseModel]) -> Sequence[str]:
+    """响应模型的字段名，按声明顺序，用作查询的列和输出的键"""
+    return tuple(model.model_fields)
+
+
+def rows_to_records(rows: Iterable[Sequence[Any]], fields: Sequence[str]) -> List[Dict[str, Any]]:
+    """把按 fields 顺序查询出的列元组转成 dict 列表"""
+    return [dict(zip(fields, row)) for row in rows]
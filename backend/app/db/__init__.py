@@ -1,6 +1,5 @@
 """Database module"""
 from .base import Base
-from .session import SessionLocal, engine
-
-__all__ = ["Base", "SessionLocal", "engine"]
+from .session import AsyncSessionLocal, SessionLocal, async_engine, engine
 
+__all__ = ["Base", "AsyncSessionLocal", "SessionLocal", "async_engine", "engine"]
@@ -0,0 +1,16 @@
+"""
+方言相关的 SQL 构造
+"""
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+
+def dialect_insert(db: Session):
+    """返回支持 ON CONFLICT 的 insert 构造函数（PostgreSQL / SQLite）"""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql_insert
+    if dialect == "sqlite":
+        return sqlite_insert
+    raise RuntimeError(f"unsupported database dialect for upsert: {dialect}")
@@ -0,0 +1,92 @@
+"""
+github_daily_stats 分区维护（仅 Postgres）
+
+迁移 011 把 github_daily_stats 改为按年份的范围分区表，并附带一个 DEFAULT 分区兜底。
+启动时提前建好今年及之后几年的分区，避免新数据落入 DEFAULT 分区
+（DEFAULT 分区中已有某年数据时，就无法再为该年建分区）
+"""
+import logging
+from datetime import date
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.db.session import engine
+
+logger = logging.getLogger(__name__)
+
+DAILY_STATS_TABLE = "github_daily_stats"
+# 提前创建的年份数（不含今年）
+PARTITION_YEARS_AHEAD = 2
+
+
+def daily_stats_partition_name(year: int) -> str:
+    return f"{DAILY_STATS_TABLE}_y{year}"
+
+
+def create_daily_stats_partition(conn: Connection, year: int) -> None:
+    """创建某一年的分区（已存在则跳过）"""
+    conn.execute(
+        text(
+            f"CREATE TABLE IF NOT EXISTS {daily_stats_partition_name(year)} "
+            f"PARTITION OF {DAILY_STATS_TABLE} "
+            f"FOR VALUES FROM ('{year}-01-01') TO ('{year + 1}-01-01')"
+        )
+    )
+
+
+def _existing_partitions(conn: Connection) -> Optional[set]:
+    """返回已有分区表名；表不是分区表时返回 None"""
+    partitioned = conn.execute(
+        text(
+            "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+            "WHERE c.relname = :table AND pg_table_is_visible(c.oid)"
+        ),
+        {"table": DAILY_STATS_TABLE},
+    ).first()
+    if partitioned is None:
+        return None
+    rows = conn.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits i "
+            "JOIN pg_class parent ON parent.oid = i.inhparent "
+            "JOIN pg_class child ON child.oid = i.inhrelid "
+            "WHERE parent.relname = :table AND pg_table_is_visible(parent.oid)"
+        ),
+        {"table": DAILY_STATS_TABLE},
+    )
+    return {name for (name,) in rows}
+
+
+def ensure_daily_stats_partitions(years_ahead: int = PARTITION_YEARS_AHEAD) -> List[int]:
+    """
+    确保今年及之后 years_ahead 年的分区存在
+
+    非 Postgres 或表未分区（尚未执行迁移 011）时不做任何事
+
+    Returns:
+        新建分区的年份
+    """
+    if engine.dialect.name != "postgresql":
+        return []
+
+    created: List[int] = []
+    this_year = date.today().year
+    with engine.begin() as conn:
+        existing = _existing_partitions(conn)
+        if existing is None:
+            return []
+        for year in range(this_year, this_year + years_ahead + 1):
+            if daily_stats_partition_name(year) in existing:
+                continue
+            try:
+                with conn.begin_nested():
+                    create_daily_stats_partition(conn, year)
+            except Exception:
+                logger.exception("creating %s partition for %d failed", DAILY_STATS_TABLE, year)
+                continue
+            created.append(year)
+    if created:
+        logger.info("created %s partitions for %s", DAILY_STATS_TABLE, created)
+    return created
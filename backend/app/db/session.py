@@ -1,7 +1,14 @@
 """
 数据库连接和会话管理
+
+API 请求和同步服务使用异步引擎（PostgreSQL 走 asyncpg，SQLite 走 aiosqlite），
+查询不阻塞事件循环；同步引擎保留给线程池中的调度器、离线命令和 Alembic
 """
+from typing import AsyncIterator
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
@@ -17,14 +24,46 @@ engine = create_engine(
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
-def get_db():
+def async_database_url(url: str) -> str:
+    """把 DATABASE_URL 换成对应的异步驱动"""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend == "postgresql":
+        parsed = parsed.set(drivername="postgresql+asyncpg")
+    elif backend == "sqlite":
+        parsed = parsed.set(drivername="sqlite+aiosqlite")
+    return parsed.render_as_string(hide_password=False)
+
+
+def _async_pool_options() -> dict:
+    if make_url(settings.DATABASE_URL).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": True,
+    }
+
+
+# 创建异步数据库引擎
+async_engine = create_async_engine(
+    async_database_url(settings.DATABASE_URL),
+    echo=settings.ENVIRONMENT == "development",
+    **_async_pool_options(),
+)
+
+# 创建异步会话工厂；提交后不过期属性，响应序列化时无需再次查询
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+
+async def get_db() -> AsyncIterator[AsyncSession]:
     """
-    获取数据库会话的依赖注入函数
+    获取异步数据库会话的依赖注入函数
     用于 FastAPI 的 Depends 机制
     """
-    db = SessionLocal()
-    try:
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
-
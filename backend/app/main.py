@@ -1,22 +1,49 @@
 """
 FastAPI 主应用文件
 """
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.v1.endpoints import auth, github, health
 from app.core.config import settings
+from app.core.serialization import DefaultResponse
 from app.db.base import Base
-from app.db.session import engine
+from app.db.partitions import ensure_daily_stats_partitions
+from app.db.session import async_engine, engine
+from app.services.github_client import close_github_client, init_github_client
+from app.services.sync_jobs import shutdown_sync_jobs
+from app.services.sync_scheduler import start_sync_scheduler, stop_sync_scheduler
 
 # 创建所有数据库表
 Base.metadata.create_all(bind=engine)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    应用生命周期：启动时补齐统计表分区、创建共享 GitHub 客户端并开启自动同步调度，
+    关闭时停止调度、中断后台同步任务并释放 HTTP 和数据库连接池
+    """
+    await asyncio.to_thread(ensure_daily_stats_partitions)
+    await init_github_client()
+    start_sync_scheduler()
+    yield
+    await stop_sync_scheduler()
+    await shutdown_sync_jobs()
+    await close_github_client()
+    await async_engine.dispose()
+
+
 # 创建 FastAPI 应用
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
     description="A personal developer digital resume aggregation platform",
+    lifespan=lifespan,
+    default_response_class=DefaultResponse,
 )
 
 # 配置 CORS
@@ -1,7 +1,23 @@
 """Models module - database models"""
+from .github_activity_run import GithubActivityRun
 from .github_event import GithubDailyStat
+from .github_event_archive import GithubEventArchive
+from .github_http_cache import GithubHttpCache
 from .github_repo import GithubRepo
+from .github_stat_rollup import GithubStatRollup
+from .github_sync_job import GithubSyncJob
+from .github_sync_state import GithubSyncState
 from .user import User
 
-__all__ = ["User", "GithubRepo", "GithubDailyStat"]
+__all__ = [
+    "User",
+    "GithubRepo",
+    "GithubDailyStat",
+    "GithubHttpCache",
+    "GithubSyncState",
+    "GithubSyncJob",
+    "GithubEventArchive",
+    "GithubStatRollup",
+    "GithubActivityRun",
+]
 
@@ -0,0 +1,45 @@
+"""
+GitHub 连续活动区间模型
+"""
+from datetime import datetime
+
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Index, Integer
+from sqlalchemy.orm import relationship
+
+from app.db.base import Base
+
+
+class GithubActivityRun(Base):
+    """
+    GitHub 连续活动区间 - 每段连续活跃（commit、PR、issue 任一不为 0）的日期一行，
+    由每日统计增量维护
+
+    区间两两不相邻，相邻区间之间即空闲间隔；连续天数和空闲天数都由区间端点算出
+    """
+
+    __tablename__ = "github_activity_runs"
+    __table_args__ = (
+        Index(
+            "uq_github_activity_runs_user_start",
+            "user_id",
+            "start_date",
+            unique=True,
+            postgresql_include=["end_date"],
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    start_date = Column(Date, nullable=False)
+    end_date = Column(Date, nullable=False)  # 含
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    # 关系定义
+    user = relationship("User", back_populates="activity_runs")
+
+    def __repr__(self) -> str:
+        return (
+            f"<GithubActivityRun(user_id={self.user_id}, start_date={self.start_date}, "
+            f"end_date={self.end_date})>"
+        )
@@ -3,7 +3,7 @@ GitHub 每日统计数据模型
 """
 from datetime import date, datetime
 
-from sqlalchemy import Column, Date, DateTime, ForeignKey, Integer
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Index, Integer
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
@@ -13,9 +13,21 @@ class GithubDailyStat(Base):
     """GitHub 每日统计模型 - 按日期聚合用户的 GitHub 活动"""
 
     __tablename__ = "github_daily_stats"
+    # 每个用户每天一行，也是批量 upsert 的冲突目标；
+    # Postgres 上 INCLUDE 计数列，按用户和日期范围查询只需扫描索引。
+    # Postgres 上表按年份范围分区（见迁移 011 和 app/db/partitions.py），SQLite 为普通表
+    __table_args__ = (
+        Index(
+            "uq_github_daily_stats_user_date",
+            "user_id",
+            "date",
+            unique=True,
+            postgresql_include=["commit_count", "pr_count", "issue_count", "star_delta"],
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     date = Column(Date, nullable=False, index=True)
     
     # 统计数据
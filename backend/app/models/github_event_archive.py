@@ -0,0 +1,31 @@
+"""
+GitHub 原始事件归档模型
+"""
+from datetime import datetime
+
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Integer, LargeBinary, UniqueConstraint
+from sqlalchemy.orm import relationship
+
+from app.db.base import Base
+
+
+class GithubEventArchive(Base):
+    """GitHub 事件归档 - 每个用户每天一行，保存裁剪后的原始事件（gzip 压缩的 JSON 数组）"""
+
+    __tablename__ = "github_event_archives"
+    __table_args__ = (UniqueConstraint("user_id", "date", name="uq_github_event_archives_user_date"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    date = Column(Date, nullable=False)
+    event_count = Column(Integer, nullable=False, default=0)
+    events = Column(LargeBinary, nullable=False)
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    # 关系定义
+    user = relationship("User", back_populates="event_archives")
+
+    def __repr__(self) -> str:
+        return f"<GithubEventArchive(user_id={self.user_id}, date={self.date}, events={self.event_count})>"
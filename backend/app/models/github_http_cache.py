@@ -0,0 +1,29 @@
+"""
+GitHub 条件请求缓存模型
+"""
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, String, Text
+
+from app.db.base import Base
+
+
+class GithubHttpCache(Base):
+    """GitHub GET 响应缓存 - 保存 ETag / Last-Modified 和响应体，用于 304 复用"""
+
+    __tablename__ = "github_http_cache"
+
+    id = Column(Integer, primary_key=True, index=True)
+    # sha256(方法 + URL + 参数 + Accept + 用户 ID)
+    cache_key = Column(String(64), unique=True, index=True, nullable=False)
+    url = Column(String(1000), nullable=False)
+    etag = Column(String(255), nullable=True)
+    last_modified = Column(String(64), nullable=True)
+    body = Column(Text, nullable=False)  # JSON 文本
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    # 最近一次写入或命中 304 的时间，超过 GITHUB_HTTP_CACHE_TTL_DAYS 未使用的条目被清理
+    last_used_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+
+    def __repr__(self) -> str:
+        return f"<GithubHttpCache(url={self.url}, etag={self.etag})>"
@@ -23,6 +23,7 @@ class GithubRepo(Base):
     language = Column(String(100), nullable=True)
     html_url = Column(String(500), nullable=False)
     description = Column(String(1000), nullable=True)
+    content_hash = Column(String(64), nullable=True)  # 跟踪字段的摘要，用于同步时判断是否变化
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
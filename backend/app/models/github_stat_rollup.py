@@ -0,0 +1,54 @@
+"""
+GitHub 统计汇总模型
+"""
+from datetime import datetime
+
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import relationship
+
+from app.db.base import Base
+
+# 汇总粒度；周从周一开始
+ROLLUP_WEEK = "week"
+ROLLUP_MONTH = "month"
+ROLLUP_YEAR = "year"
+ROLLUP_GRANULARITIES = (ROLLUP_WEEK, ROLLUP_MONTH, ROLLUP_YEAR)
+
+
+class GithubStatRollup(Base):
+    """GitHub 统计汇总 - 每个用户每个粒度的每个周期一行，由每日统计增量维护"""
+
+    __tablename__ = "github_stat_rollups"
+    __table_args__ = (
+        Index(
+            "uq_github_stat_rollups_user_period",
+            "user_id",
+            "granularity",
+            "period_start",
+            unique=True,
+            postgresql_include=["commit_count", "pr_count", "issue_count", "star_delta", "active_days"],
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    granularity = Column(String(8), nullable=False)
+    period_start = Column(Date, nullable=False)
+
+    # 周期内每日统计之和
+    commit_count = Column(Integer, nullable=False, default=0)
+    pr_count = Column(Integer, nullable=False, default=0)
+    issue_count = Column(Integer, nullable=False, default=0)
+    star_delta = Column(Integer, nullable=False, default=0)
+    active_days = Column(Integer, nullable=False, default=0)  # commit、PR、issue 任一不为 0 的天数
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    # 关系定义
+    user = relationship("User", back_populates="stat_rollups")
+
+    def __repr__(self) -> str:
+        return (
+            f"<GithubStatRollup(user_id={self.user_id}, granularity={self.granularity}, "
+            f"period_start={self.period_start}, commits={self.commit_count})>"
+        )
@@ -0,0 +1,78 @@
+"""
+GitHub 同步任务模型
+"""
+from datetime import datetime
+
+from sqlalchemy import (
+    JSON,
+    Boolean,
+    Column,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    text,
+)
+from sqlalchemy.orm import relationship
+
+from app.db.base import Base
+
+SYNC_JOB_PENDING = "pending"
+SYNC_JOB_RUNNING = "running"
+SYNC_JOB_SUCCEEDED = "succeeded"
+SYNC_JOB_FAILED = "failed"
+SYNC_JOB_CANCELLED = "cancelled"
+
+SYNC_JOB_ACTIVE_STATUSES = (SYNC_JOB_PENDING, SYNC_JOB_RUNNING)
+# 部分唯一索引的条件：每个用户同时至多一个进行中（待执行或执行中）的任务
+SYNC_JOB_ACTIVE_WHERE = text("status IN ('pending', 'running')")
+
+
+class GithubSyncJob(Base):
+    """GitHub 同步任务 - 后台执行的一次同步及其进度"""
+
+    __tablename__ = "github_sync_jobs"
+    __table_args__ = (
+        Index(
+            "uq_github_sync_jobs_user_active",
+            "user_id",
+            unique=True,
+            postgresql_where=SYNC_JOB_ACTIVE_WHERE,
+            sqlite_where=SYNC_JOB_ACTIVE_WHERE,
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    mode = Column(String(16), nullable=False, default="standard")
+    from_date = Column(Date, nullable=False)
+    to_date = Column(Date, nullable=False)
+
+    status = Column(String(16), nullable=False, default=SYNC_JOB_PENDING, index=True)
+    cancel_requested = Column(Boolean, nullable=False, default=False)
+    phase = Column(String(32), nullable=True)
+    progress = Column(JSON, nullable=True)  # 阶段内分片进度和计数
+
+    # 执行租约：执行方定期续约，过期后可被其他 worker 重新领取
+    lease_owner = Column(String(128), nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True, index=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+
+    repos_count = Column(Integer, nullable=True)
+    stats_updated = Column(Integer, nullable=True)
+    error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    # 关系定义
+    user = relationship("User", back_populates="sync_jobs")
+
+    def __repr__(self) -> str:
+        return f"<GithubSyncJob(id={self.id}, user_id={self.user_id}, status={self.status})>"
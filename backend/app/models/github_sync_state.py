@@ -0,0 +1,41 @@
+"""
+GitHub 同步状态模型
+"""
+from datetime import datetime
+
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Integer, String
+from sqlalchemy.orm import relationship
+
+from app.db.base import Base
+
+
+class GithubSyncState(Base):
+    """GitHub 同步水位线 - 每个用户一行，记录增量同步的进度"""
+
+    __tablename__ = "github_sync_states"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), unique=True, nullable=False, index=True)
+
+    # 事件水位线：已入库的最新事件 ID 及其时间
+    last_event_id = Column(String(32), nullable=True)
+    last_event_at = Column(DateTime, nullable=True)
+    # 事件数据已完整覆盖的最早日期（从该日期到 last_event_at 之间无缺口）
+    events_synced_from = Column(Date, nullable=True)
+
+    # 统计数据版本：每次同步实际写入每日统计时加一，用于查询响应缓存和 ETag
+    stats_version = Column(Integer, default=0, server_default="0", nullable=False)
+
+    last_repo_sync_at = Column(DateTime, nullable=True)
+    last_synced_at = Column(DateTime, nullable=True)
+    # 自动同步调度：下一次计划同步的时间
+    next_sync_at = Column(DateTime, nullable=True, index=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    # 关系定义
+    user = relationship("User", back_populates="sync_state")
+
+    def __repr__(self) -> str:
+        return f"<GithubSyncState(user_id={self.user_id}, last_event_id={self.last_event_id})>"
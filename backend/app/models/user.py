@@ -25,6 +25,19 @@ class User(Base):
     # 关系定义
     repos = relationship("GithubRepo", back_populates="user", cascade="all, delete-orphan")
     daily_stats = relationship("GithubDailyStat", back_populates="user", cascade="all, delete-orphan")
+    stat_rollups = relationship(
+        "GithubStatRollup", back_populates="user", cascade="all, delete-orphan"
+    )
+    activity_runs = relationship(
+        "GithubActivityRun", back_populates="user", cascade="all, delete-orphan"
+    )
+    event_archives = relationship(
+        "GithubEventArchive", back_populates="user", cascade="all, delete-orphan"
+    )
+    sync_jobs = relationship("GithubSyncJob", back_populates="user", cascade="all, delete-orphan")
+    sync_state = relationship(
+        "GithubSyncState", back_populates="user", uselist=False, cascade="all, delete-orphan"
+    )
 
     def __repr__(self) -> str:
         return f"<User(id={self.id}, github_login={self.github_login})>"
@@ -1,6 +1,19 @@
 """Schemas module - Pydantic models for request/response validation"""
 from .auth import LoginResponse, Token
-from .github import GithubDailyStatResponse, GithubDailyStatsQueryResponse, GithubRepoResponse, GithubSyncResponse
+from .github import (
+    GithubDailyStatResponse,
+    GithubDailyStatsQueryResponse,
+    GithubHeatmapResponse,
+    GithubMovingAverageResponse,
+    GithubRateLimitResponse,
+    GithubRepoResponse,
+    GithubStatRangeResponse,
+    GithubStatRollupQueryResponse,
+    GithubStatRollupResponse,
+    GithubStreaksResponse,
+    GithubSyncJobResponse,
+    GithubSyncResponse,
+)
 from .user import UserCreate, UserResponse
 
 __all__ = [
@@ -11,6 +24,14 @@ __all__ = [
     "GithubRepoResponse",
     "GithubDailyStatResponse",
     "GithubDailyStatsQueryResponse",
+    "GithubStatRollupResponse",
+    "GithubStatRollupQueryResponse",
+    "GithubHeatmapResponse",
+    "GithubStatRangeResponse",
+    "GithubMovingAverageResponse",
+    "GithubStreaksResponse",
     "GithubSyncResponse",
+    "GithubSyncJobResponse",
+    "GithubRateLimitResponse",
 ]
 
@@ -2,7 +2,7 @@
 GitHub 相关的 Pydantic schemas
 """
 from datetime import date, datetime
-from typing import List, Optional
+from typing import Dict, List, Optional, Union
 
 from pydantic import BaseModel
 
@@ -62,9 +62,133 @@ class GithubSyncResponse(BaseModel):
     date_range: Optional[str] = None
 
 
+class GithubSyncJobResponse(BaseModel):
+    """GitHub 同步任务状态"""
+
+    id: int
+    status: str  # pending / running / succeeded / failed / cancelled
+    mode: str
+    from_date: date
+    to_date: date
+    phase: Optional[str] = None
+    progress: Optional[dict] = None
+    cancel_requested: bool = False
+    repos_count: Optional[int] = None
+    stats_updated: Optional[int] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
 class GithubDailyStatsQueryResponse(BaseModel):
     """每日统计查询响应"""
 
     data: List[GithubDailyStatResponse]
     total: int
 
+
+class GithubStatRollupResponse(BaseModel):
+    """周 / 月 / 年汇总中的一个周期"""
+
+    period_start: date
+    commit_count: int = 0
+    pr_count: int = 0
+    issue_count: int = 0
+    star_delta: int = 0
+    active_days: int = 0  # commit、PR、issue 任一不为 0 的天数
+
+    class Config:
+        from_attributes = True
+
+
+class GithubStatRollupQueryResponse(BaseModel):
+    """汇总统计查询响应"""
+
+    granularity: str  # week / month / year
+    data: List[GithubStatRollupResponse]
+    total: int
+
+
+class GithubHeatmapResponse(BaseModel):
+    """
+    热力图的列式统计
+
+    从 start_date 起连续 days 天（无活动的日期为 0），每个计数字段一列，第 i 个元素对应 start_date + i 天。
+    encoding 为 base64 时每列是小端 int32 数组的 Base64 字符串
+    """
+
+    start_date: date
+    days: int
+    encoding: str  # json / base64
+    commit_count: Union[List[int], str]
+    pr_count: Union[List[int], str]
+    issue_count: Union[List[int], str]
+    star_delta: Union[List[int], str]
+
+
+class GithubBestWindow(BaseModel):
+    """合计最大的连续窗口"""
+
+    start_date: date
+    total: int
+
+
+class GithubStatRangeResponse(BaseModel):
+    """日期范围内的合计、与紧邻的上一个等长区间的对比，以及各计数字段的最佳窗口"""
+
+    from_date: date
+    to_date: date
+    totals: Dict[str, int]
+    previous_totals: Dict[str, int]
+    window: int
+    best_windows: Dict[str, Optional[GithubBestWindow]]  # 范围不足 window 天时为 null
+
+
+class GithubMovingAverageResponse(BaseModel):
+    """每天的尾随滑动平均，第 i 个值对应 start_date + i 天"""
+
+    metric: str
+    window: int
+    start_date: date
+    values: List[float]
+
+
+class GithubActivityPeriod(BaseModel):
+    """一段连续活动或空闲的日期（首尾都含）"""
+
+    start_date: date
+    end_date: date
+    days: int
+
+
+class GithubStreaksResponse(BaseModel):
+    """连续活动与空闲间隔"""
+
+    active_days: int
+    first_active_date: Optional[date] = None
+    last_active_date: Optional[date] = None
+    current_streak: Optional[GithubActivityPeriod] = None  # 今天或昨天仍有活动时
+    longest_streak: Optional[GithubActivityPeriod] = None
+    current_gap: Optional[GithubActivityPeriod] = None  # 最后一次活动的次日到今天
+    longest_gap: Optional[GithubActivityPeriod] = None
+    streaks: List[GithubActivityPeriod]  # 最长的若干段连续活动
+    gaps: List[GithubActivityPeriod]  # 不短于 min_gap_days 的最长若干段空闲
+
+
+class GithubRateLimitResource(BaseModel):
+    """单类 GitHub 配额的剩余情况"""
+
+    limit: Optional[int] = None
+    remaining: Optional[int] = None
+    reset_in_seconds: Optional[int] = None
+    blocked_for_seconds: int = 0
+
+
+class GithubRateLimitResponse(BaseModel):
+    """GitHub 配额查询响应，按资源（core / search / graphql ...）分组"""
+
+    resources: Dict[str, GithubRateLimitResource]
@@ -0,0 +1,59 @@
+"""
+认证缓存
+已验证的 JWT 缓存到其过期时间（且不超过 AUTH_CACHE_TTL_SECONDS），用户身份字段按用户 ID 缓存，
+常规的已认证请求在进入处理函数之前不需要验证签名，也不访问数据库。
+用户记录变化（如 OAuth 回调更新 token）时调用 invalidate_user
+"""
+import time
+from typing import Optional
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.security import decode_token_claims
+from app.schemas.user import UserInDB
+
+# token -> 用户 ID
+_token_cache: TTLCache[str, int] = TTLCache(
+    settings.AUTH_CACHE_MAX_ENTRIES, settings.AUTH_CACHE_TTL_SECONDS
+)
+# 用户 ID -> 身份字段
+_user_cache: TTLCache[int, UserInDB] = TTLCache(
+    settings.AUTH_CACHE_MAX_ENTRIES, settings.AUTH_CACHE_TTL_SECONDS
+)
+
+
+def verify_token(token: str) -> Optional[int]:
+    """
+    验证 JWT 并返回用户 ID，验证结果缓存到 token 过期为止
+
+    Returns:
+        用户 ID；token 无效、过期或 subject 不是整数时返回 None
+    """
+    user_id = _token_cache.get(token)
+    if user_id is not None:
+        return user_id
+
+    payload = decode_token_claims(token)
+    if payload is None:
+        return None
+    try:
+        user_id = int(payload["sub"])
+    except (ValueError, TypeError):
+        return None
+    expires_at = payload.get("exp")
+    if isinstance(expires_at, (int, float)):
+        _token_cache.set(token, user_id, ttl=expires_at - time.time())
+    return user_id
+
+
+def get_cached_user(user_id: int) -> Optional[UserInDB]:
+    return _user_cache.get(user_id)
+
+
+def cache_user(user: UserInDB) -> None:
+    _user_cache.set(user.id, user)
+
+
+def invalidate_user(user_id: int) -> None:
+    """用户记录变化后丢弃其缓存的身份字段"""
+    _user_cache.pop(user_id)
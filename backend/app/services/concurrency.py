@@ -0,0 +1,104 @@
+"""
+有界并发调度
+用信号量限制同时在途的协程数，供深度同步的各阶段和分片并发执行
+"""
+import asyncio
+from typing import AsyncIterator, Awaitable, Callable, Iterable, List, Optional, TypeVar
+
+from app.services.sync_progress import current_progress
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class BoundedScheduler:
+    """
+    有界异步调度器，同一实例内最多 limit 个协程同时运行
+
+    指定 label 时，map 的每个分片会作为该阶段的进度上报给当前同步任务
+    """
+
+    def __init__(self, limit: int, label: Optional[str] = None):
+        self.limit = max(1, limit)
+        self.label = label
+        self._semaphore = asyncio.Semaphore(self.limit)
+
+    async def run(self, coro: Awaitable[R]) -> R:
+        """在并发上限内执行单个协程"""
+        async with self._semaphore:
+            return await coro
+
+    def add_chunks(self, count: int) -> None:
+        """预告将要执行的分片数，供进度上报（map 会自动调用）"""
+        progress = current_progress()
+        if progress is not None and self.label and count:
+            progress.add_chunks(self.label, count)
+
+    async def run_chunk(self, coro: Awaitable[R]) -> R:
+        """在并发上限内执行单个分片，完成后上报进度"""
+        result = await self.run(coro)
+        progress = current_progress()
+        if progress is not None and self.label:
+            progress.chunk_done(self.label)
+        return result
+
+    async def map(self, func: Callable[[T], Awaitable[R]], items: Iterable[T]) -> List[R]:
+        """
+        并发地对每个元素执行 func，结果顺序与输入顺序一致
+
+        任一任务失败时取消其余任务并抛出该异常
+        """
+        items = list(items)
+        self.add_chunks(len(items))
+        tasks = [asyncio.ensure_future(self.run_chunk(func(item))) for item in items]
+        if not tasks:
+            return []
+        try:
+            return list(await asyncio.gather(*tasks))
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+
+async def gather_all(*coros: Awaitable) -> List:
+    """并发执行多个协程（如深度同步的各阶段），失败时取消其余协程"""
+    tasks = [asyncio.ensure_future(coro) for coro in coros]
+    try:
+        return list(await asyncio.gather(*tasks))
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+async def stream_pages(
+    produce: Callable[[Callable[[T], Awaitable[None]]], Awaitable[None]], maxsize: int
+) -> AsyncIterator[T]:
+    """
+    把并发拉取的结果转成按完成顺序产出的异步生成器
+
+    produce(emit) 在后台运行，每拉取到一页就 await emit(page)；
+    队列最多缓存 maxsize 页，消费跟不上时生产方阻塞，内存占用保持有界。
+    生产方的异常在消费完已产出的页后抛出；消费方提前退出时取消生产方
+    """
+    queue: "asyncio.Queue[T]" = asyncio.Queue(max(1, maxsize))
+    producer = asyncio.ensure_future(produce(queue.put))
+    getter: Optional[asyncio.Future] = None
+    try:
+        while not (producer.done() and queue.empty()):
+            getter = asyncio.ensure_future(queue.get())
+            await asyncio.wait({getter, producer}, return_when=asyncio.FIRST_COMPLETED)
+            if not getter.done():
+                getter.cancel()
+                await asyncio.gather(getter, return_exceptions=True)
+            if not getter.cancelled():
+                yield getter.result()
+        await producer
+    finally:
+        for task in (getter, producer):
+            if task is not None and not task.done():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
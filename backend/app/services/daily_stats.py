@@ -0,0 +1,187 @@
+"""
+每日统计累加器
+各数据源逐页拉取时直接累加到按日期的紧凑计数器中，
+原始事件 / 时间戳用完即弃，同步的内存占用只与涉及的天数有关。
+
+时间戳按批用 NumPy 分桶：ISO 字符串截取日期部分整体转为 datetime64[D]，
+再以 bincount 计数，结果与逐条 datetime.fromisoformat(...).date() 完全一致
+（日期取时间戳自身时区下的日期，与逐条解析相同）
+"""
+from collections import Counter
+from datetime import date
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# 每日统计的计数字段，顺序即计数器数组的下标
+STAT_KEYS = ("commit_count", "pr_count", "issue_count", "star_delta")
+_KEY_INDEX = {key: index for index, key in enumerate(STAT_KEYS)}
+# 判断一天是否"活跃"的计数字段；star_delta 是他人对用户仓库的 star，不算用户自己的活动
+ACTIVITY_KEYS = ("commit_count", "pr_count", "issue_count")
+_ACTIVITY_INDEXES = tuple(_KEY_INDEX[key] for key in ACTIVITY_KEYS)
+
+# 少于该数量的批次逐条计数，避免构造 NumPy 数组的固定开销
+VECTORIZE_MIN_BATCH = 2048
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def is_active_day(counts: Sequence[int]) -> bool:
+    """按 STAT_KEYS 顺序的一天计数是否算作活跃：commit、PR、issue 任一不为 0"""
+    return any(counts[index] for index in _ACTIVITY_INDEXES)
+
+
+def _count_days_scalar(
+    timestamps: Sequence[str], weights: Optional[Sequence[int]]
+) -> Dict[date, int]:
+    counts: Dict[str, int] = Counter()
+    if weights is None:
+        for timestamp in timestamps:
+            counts[timestamp[:10]] += 1
+    else:
+        for timestamp, weight in zip(timestamps, weights):
+            counts[timestamp[:10]] += weight
+    return {date.fromisoformat(day): count for day, count in counts.items()}
+
+
+def count_days(
+    timestamps: Sequence[str], weights: Optional[Sequence[int]] = None
+) -> Dict[date, int]:
+    """
+    按日期统计一批 ISO 8601 时间戳
+
+    Args:
+        timestamps: ISO 时间字符串，如 2024-01-01T12:00:00Z / 2024-01-01T20:00:00+08:00
+        weights: 每个时间戳的计数（默认各计 1）；权重为 0 的日期也会出现在结果中
+
+    Returns:
+        {日期: 计数}
+    """
+    if len(timestamps) < VECTORIZE_MIN_BATCH:
+        return _count_days_scalar(timestamps, weights)
+
+    days = _days_since_epoch(timestamps)
+    first_day = int(days.min())
+    offsets = days - first_day
+    occurrences = np.bincount(offsets)
+    present = np.flatnonzero(occurrences)
+    if weights is None:
+        totals = occurrences[present]
+    else:
+        totals = np.bincount(offsets, weights=np.asarray(weights, dtype=np.float64))[present]
+        totals = np.rint(totals).astype(np.int64)
+    return {
+        date.fromordinal(_EPOCH_ORDINAL + first_day + int(offset)): int(total)
+        for offset, total in zip(present, totals)
+    }
+
+
+def _days_since_epoch(timestamps: Sequence[str]) -> "np.ndarray":
+    # S10 截取 YYYY-MM-DD 部分，整体解析为自 1970-01-01 起的天数
+    return np.array(timestamps, dtype="S10").astype("datetime64[D]").astype(np.int64)
+
+
+def count_days_by_key(
+    timestamps: Sequence[str], key_indexes: Sequence[int], amounts: Sequence[int]
+) -> Dict[date, List[int]]:
+    """
+    按日期和计数字段统计一批时间戳（每个时间戳至多计入一个字段）
+
+    Args:
+        timestamps: ISO 时间字符串
+        key_indexes: 每个时间戳计入的字段在 STAT_KEYS 中的下标，-1 表示只记录日期不计数
+        amounts: 每个时间戳的计数
+
+    Returns:
+        {日期: 按 STAT_KEYS 顺序的计数列表}
+    """
+    width = len(STAT_KEYS)
+    if len(timestamps) < VECTORIZE_MIN_BATCH:
+        result: Dict[date, List[int]] = {}
+        day_cache: Dict[str, date] = {}
+        for timestamp, key_index, amount in zip(timestamps, key_indexes, amounts):
+            prefix = timestamp[:10]
+            day = day_cache.get(prefix)
+            if day is None:
+                day = day_cache[prefix] = date.fromisoformat(prefix)
+            counters = result.get(day)
+            if counters is None:
+                counters = result[day] = [0] * width
+            if key_index >= 0:
+                counters[key_index] += amount
+        return result
+
+    days = _days_since_epoch(timestamps)
+    first_day = int(days.min())
+    offsets = days - first_day
+    present = np.flatnonzero(np.bincount(offsets))
+    keys = np.asarray(key_indexes, dtype=np.int64)
+    counted = keys >= 0
+    # (天, 字段) 展平为一维下标，一次 bincount 得到所有字段的计数
+    cells = np.bincount(
+        offsets[counted] * width + keys[counted],
+        weights=np.asarray(amounts, dtype=np.float64)[counted],
+        minlength=(int(offsets.max()) + 1) * width,
+    )
+    table = np.rint(cells).astype(np.int64).reshape(-1, width)[present]
+    return {
+        date.fromordinal(_EPOCH_ORDINAL + first_day + int(offset)): row.tolist()
+        for offset, row in zip(present, table)
+    }
+
+
+class DailyStatsAccumulator:
+    """按日期累加的计数器，每天只占一个定长整数列表"""
+
+    __slots__ = ("_days",)
+
+    def __init__(self) -> None:
+        self._days: Dict[date, List[int]] = {}
+
+    def add(self, day: date, key: str, amount: int = 1) -> None:
+        counters = self._days.get(day)
+        if counters is None:
+            counters = self._days[day] = [0] * len(STAT_KEYS)
+        counters[_KEY_INDEX[key]] += amount
+
+    def add_timestamps(
+        self, key: str, timestamps: Sequence[str], weights: Optional[Sequence[int]] = None
+    ) -> None:
+        """按日期把一批 ISO 时间戳累加到 key 计数上"""
+        for day, count in count_days(timestamps, weights).items():
+            self.add(day, key, count)
+
+    def add_keyed_timestamps(
+        self, timestamps: Sequence[str], key_indexes: Sequence[int], amounts: Sequence[int]
+    ) -> None:
+        """按日期累加一批时间戳，每个时间戳计入各自的字段（参见 count_days_by_key）"""
+        for day, row in count_days_by_key(timestamps, key_indexes, amounts).items():
+            counters = self._days.get(day)
+            if counters is None:
+                self._days[day] = row
+            else:
+                for index, value in enumerate(row):
+                    counters[index] += value
+
+    def merge(self, other: "DailyStatsAccumulator") -> None:
+        """把另一个累加器的计数加到当前累加器"""
+        for day, other_counters in other._days.items():
+            counters = self._days.get(day)
+            if counters is None:
+                self._days[day] = list(other_counters)
+            else:
+                for index, value in enumerate(other_counters):
+                    counters[index] += value
+
+    def __len__(self) -> int:
+        return len(self._days)
+
+    def __contains__(self, day: date) -> bool:
+        return day in self._days
+
+    def items(self) -> Iterator[Tuple[date, Dict[str, int]]]:
+        """逐日产出 (日期, {计数字段: 值})"""
+        for day, counters in self._days.items():
+            yield day, dict(zip(STAT_KEYS, counters))
+
+    def to_dict(self) -> Dict[date, Dict[str, int]]:
+        return dict(self.items())
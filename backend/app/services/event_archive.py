@@ -0,0 +1,133 @@
+"""
+GitHub 原始事件归档
+standard 同步拉取到的事件裁剪后按“用户-日期”以 gzip 压缩的 JSON 数组存档；
+计数规则变化或需要新指标时，可从归档离线重建每日统计，无需再调用 GitHub API
+"""
+import gzip
+import json
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models import GithubEventArchive
+
+# 保留的 payload 标量字段，其余（commit message、diff 链接、完整的 PR / issue 对象等）丢弃
+_PAYLOAD_FIELDS = ("action", "size", "distinct_size", "ref", "ref_type", "head", "before")
+
+
+def trim_event(event: dict) -> dict:
+    """裁剪事件：保留类型、时间、仓库和计数可能用到的 payload 字段"""
+    payload = event.get("payload") or {}
+    trimmed_payload = {key: payload[key] for key in _PAYLOAD_FIELDS if key in payload}
+    commits = payload.get("commits")
+    if commits:
+        trimmed_payload["commits"] = [
+            {"sha": commit.get("sha"), "distinct": commit.get("distinct")} for commit in commits
+        ]
+    pull_request = payload.get("pull_request")
+    if isinstance(pull_request, dict):
+        trimmed_payload["pull_request"] = {
+            "number": pull_request.get("number"),
+            "merged": pull_request.get("merged"),
+        }
+    issue = payload.get("issue")
+    if isinstance(issue, dict):
+        trimmed_payload["issue"] = {"number": issue.get("number")}
+
+    return {
+        "id": str(event["id"]),
+        "type": event.get("type", ""),
+        "created_at": event["created_at"],
+        "repo": (event.get("repo") or {}).get("name"),
+        "payload": trimmed_payload,
+    }
+
+
+def encode_events(events: List[dict]) -> bytes:
+    return gzip.compress(json.dumps(events, separators=(",", ":")).encode("utf-8"), compresslevel=6)
+
+
+def decode_events(blob: bytes) -> List[dict]:
+    return json.loads(gzip.decompress(blob).decode("utf-8"))
+
+
+class EventArchiveWriter:
+    """
+    按日期缓冲事件并写入归档
+
+    事件按时间倒序逐页到达，日期变化时把前一天的事件与已有归档按事件 ID 合并后写回，
+    缓冲区只保留一天的事件。写入只加入会话，由调用方提交；
+    会话按调用传入，异步同步中可通过 AsyncSession.run_sync 调用。
+    本次写过的归档行按日期保留，同一天再次出现（事件页并非严格有序）时合并到同一行，
+    不依赖会话 autoflush 查到尚未写库的新行
+    """
+
+    def __init__(self, user_id: int) -> None:
+        self.user_id = user_id
+        self.days_written = 0
+        self._day: Optional[date] = None
+        self._buffer: Dict[str, dict] = {}
+        self._rows: Dict[date, GithubEventArchive] = {}
+
+    def add(self, db: Session, events: Iterable[dict]) -> None:
+        for event in events:
+            # 与每日统计一致，按时间戳自身的日期归档
+            day = date.fromisoformat(event["created_at"][:10])
+            if day != self._day:
+                self._flush(db)
+                self._day = day
+            trimmed = trim_event(event)
+            self._buffer[trimmed["id"]] = trimmed
+
+    def close(self, db: Session) -> int:
+        """写入最后一天的缓冲，返回写入的天数"""
+        self._flush(db)
+        self._rows = {}
+        return self.days_written
+
+    def _flush(self, db: Session) -> None:
+        if self._day is None or not self._buffer:
+            return
+        row = self._rows.get(self._day)
+        if row is None:
+            row = (
+                db.query(GithubEventArchive)
+                .filter(
+                    GithubEventArchive.user_id == self.user_id, GithubEventArchive.date == self._day
+                )
+                .first()
+            )
+        merged: Dict[str, dict] = {}
+        if row is not None:
+            merged.update((event["id"], event) for event in decode_events(row.events))
+        merged.update(self._buffer)
+        events = sorted(merged.values(), key=lambda event: int(event["id"]))
+
+        if row is None:
+            row = GithubEventArchive(user_id=self.user_id, date=self._day)
+            db.add(row)
+        row.events = encode_events(events)
+        row.event_count = len(events)
+        if self._day not in self._rows:
+            self.days_written += 1
+        self._rows[self._day] = row
+        self._buffer = {}
+
+
+def iter_archived_events(
+    db: Session,
+    user_id: int,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+) -> Iterator[Tuple[date, List[dict]]]:
+    """按日期升序逐日读取归档事件"""
+    query = db.query(GithubEventArchive.date, GithubEventArchive.events).filter(
+        GithubEventArchive.user_id == user_id
+    )
+    if start_date is not None:
+        query = query.filter(GithubEventArchive.date >= start_date)
+    if end_date is not None:
+        query = query.filter(GithubEventArchive.date <= end_date)
+    for day, blob in query.order_by(GithubEventArchive.date).yield_per(200):
+        yield day, decode_events(blob)
@@ -0,0 +1,145 @@
+"""
+GitHub 条件请求缓存
+对 GET 请求持久化保存 ETag / Last-Modified 和响应体，
+后续请求携带 If-None-Match / If-Modified-Since，收到 304 时直接复用缓存
+（GitHub 不对 304 响应计入配额）。
+缓存按用户区分，超过 GITHUB_HTTP_CACHE_TTL_DAYS 未使用的条目由自动同步调度清理
+"""
+import hashlib
+import json
+from datetime import datetime, timedelta
+from typing import Any, Optional
+from urllib.parse import urlencode
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models import GithubHttpCache
+from app.services.github_client import github_request
+from app.services.github_ratelimit import RESOURCE_CORE
+
+# 命中 304 时最多每隔这么久刷新一次 last_used_at，避免每次命中都写库
+_TOUCH_INTERVAL = timedelta(hours=1)
+
+
+def _cache_key(url: str, params: Optional[dict], accept: Optional[str], user_id: int) -> str:
+    query = urlencode(sorted((params or {}).items()))
+    raw = "\n".join(["GET", url, query, accept or "", str(user_id)])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+async def github_get_json(
+    url: str,
+    github_token: str,
+    *,
+    user_id: Optional[int] = None,
+    params: Optional[dict] = None,
+    accept: Optional[str] = None,
+    resource: str = RESOURCE_CORE,
+) -> Any:
+    """
+    带条件请求缓存的 GitHub GET，返回解析后的 JSON
+
+    缓存键由 URL、参数、Accept 和用户 ID 组成，不同用户之间互不共享，
+    用户重新登录换了 token 也沿用同一份缓存；不传 user_id 时不使用缓存。
+    一次调用只打开一个数据库会话
+
+    Raises:
+        httpx.HTTPError: 如果 API 请求失败
+    """
+    if user_id is None or not settings.GITHUB_HTTP_CACHE_ENABLED:
+        response = await github_request(
+            "GET", url, github_token, resource=resource, accept=accept, params=params
+        )
+        response.raise_for_status()
+        return response.json()
+
+    cache_key = _cache_key(url, params, accept, user_id)
+    async with AsyncSessionLocal() as db:
+        entry = (
+            await db.execute(
+                select(
+                    GithubHttpCache.etag,
+                    GithubHttpCache.last_modified,
+                    GithubHttpCache.body,
+                    GithubHttpCache.last_used_at,
+                ).where(GithubHttpCache.cache_key == cache_key)
+            )
+        ).first()
+        # 结束读事务，等待 GitHub 响应期间不占用连接
+        await db.commit()
+
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+
+        response = await github_request(
+            "GET",
+            url,
+            github_token,
+            resource=resource,
+            accept=accept,
+            params=params,
+            headers=headers,
+        )
+        now = datetime.utcnow()
+        if response.status_code == 304 and entry is not None:
+            if now - entry.last_used_at >= _TOUCH_INTERVAL:
+                await db.execute(
+                    update(GithubHttpCache)
+                    .where(GithubHttpCache.cache_key == cache_key)
+                    .values(last_used_at=now)
+                )
+                await db.commit()
+            return json.loads(entry.body)
+
+        response.raise_for_status()
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag or last_modified:
+            values = {
+                "etag": etag,
+                "last_modified": last_modified,
+                "body": response.text,
+                "updated_at": now,
+                "last_used_at": now,
+            }
+            if entry is None:
+                statement = insert(GithubHttpCache).values(
+                    cache_key=cache_key, url=url[:1000], created_at=now, **values
+                )
+            else:
+                statement = (
+                    update(GithubHttpCache)
+                    .where(GithubHttpCache.cache_key == cache_key)
+                    .values(**values)
+                )
+            try:
+                await db.execute(statement)
+                await db.commit()
+            except IntegrityError:
+                # 并发写入同一个键时保留先写入的一份即可
+                await db.rollback()
+        return response.json()
+
+
+def prune_http_cache(db: Session, now: Optional[datetime] = None) -> int:
+    """
+    删除超过 GITHUB_HTTP_CACHE_TTL_DAYS 天未使用的缓存条目，由调用方提交
+
+    Returns:
+        删除的条目数
+    """
+    cutoff = (now or datetime.utcnow()) - timedelta(days=settings.GITHUB_HTTP_CACHE_TTL_DAYS)
+    result = db.execute(
+        delete(GithubHttpCache)
+        .where(GithubHttpCache.last_used_at < cutoff)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
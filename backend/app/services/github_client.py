@@ -0,0 +1,99 @@
+"""
+GitHub HTTP 客户端
+应用级共享的 httpx.AsyncClient（HTTP/2 + keep-alive 连接池），
+由 FastAPI 启动时创建、关闭时释放，供同步服务和 OAuth 回调复用
+"""
+from typing import Dict, Optional
+
+import httpx
+
+from app.core.config import settings
+from app.services.github_ratelimit import RESOURCE_CORE, rate_limit_governor
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _build_client() -> httpx.AsyncClient:
+    """按配置创建共享客户端：默认请求头、超时和连接池上限"""
+    return httpx.AsyncClient(
+        http2=settings.GITHUB_HTTP2,
+        limits=httpx.Limits(
+            max_connections=settings.GITHUB_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.GITHUB_HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=settings.GITHUB_HTTP_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(
+            settings.GITHUB_HTTP_TIMEOUT,
+            connect=settings.GITHUB_HTTP_CONNECT_TIMEOUT,
+        ),
+        headers={
+            "Accept": "application/vnd.github.v3+json",
+            "User-Agent": f"{settings.APP_NAME}/{settings.APP_VERSION}",
+        },
+    )
+
+
+async def init_github_client() -> httpx.AsyncClient:
+    """创建共享客户端（FastAPI startup 时调用）"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _build_client()
+    return _client
+
+
+async def close_github_client() -> None:
+    """关闭共享客户端并释放连接池（FastAPI shutdown 时调用）"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def get_github_client() -> httpx.AsyncClient:
+    """
+    获取共享客户端
+
+    在应用生命周期之外（脚本、命令行）调用时按需创建
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _build_client()
+    return _client
+
+
+def github_headers(github_token: str, accept: Optional[str] = None) -> Dict[str, str]:
+    """构造单次请求的认证头，Accept 不传时沿用客户端默认值"""
+    headers = {"Authorization": f"Bearer {github_token}"}
+    if accept:
+        headers["Accept"] = accept
+    return headers
+
+
+async def github_request(
+    method: str,
+    url: str,
+    github_token: str,
+    *,
+    resource: str = RESOURCE_CORE,
+    accept: Optional[str] = None,
+    **kwargs,
+) -> httpx.Response:
+    """
+    经过配额调度发送 GitHub API 请求
+
+    请求前向 rate_limit_governor 申请配额，响应后回写 X-RateLimit-* 头；
+    遇到限流响应（Retry-After / 次级限制 / 配额用尽）时等待后重试
+
+    Raises:
+        RateLimitExceeded: 需要等待的时间超过 GITHUB_RATE_LIMIT_MAX_WAIT
+    """
+    client = get_github_client()
+    headers = {**github_headers(github_token, accept), **kwargs.pop("headers", {})}
+    attempt = 0
+    while True:
+        await rate_limit_governor.acquire(github_token, resource)
+        response = await client.request(method, url, headers=headers, **kwargs)
+        limited = rate_limit_governor.observe(github_token, resource, response)
+        if not limited or attempt >= settings.GITHUB_RATE_LIMIT_MAX_RETRIES:
+            return response
+        attempt += 1
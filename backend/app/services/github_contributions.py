@@ -0,0 +1,183 @@
+"""
+基于 GraphQL contributionsCollection 的深度同步引擎
+按时间窗口一次性拉取每日 commit 数、PR 和 issue 贡献，
+替代逐条枚举搜索结果的方式；日历无法覆盖的部分交由搜索路径兜底。
+每页响应直接累加到每日计数器，不保留原始贡献节点
+"""
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.services.concurrency import BoundedScheduler
+from app.services.daily_stats import DailyStatsAccumulator
+from app.services.github_client import github_request
+from app.services.github_ratelimit import RESOURCE_GRAPHQL
+
+# 每个窗口不超过 100 天：单仓库每天最多一个 commit 贡献节点，
+# 因此 contributions(first: 100) 一次即可取全，无需逐仓库分页
+WINDOW_DAYS = 100
+# commitContributionsByRepository 最多返回的仓库数
+MAX_COMMIT_REPOSITORIES = 100
+
+CONTRIBUTIONS_QUERY = """
+query (
+  $login: String!, $from: DateTime!, $to: DateTime!,
+  $prAfter: String, $issueAfter: String,
+  $withCommits: Boolean!, $withPrs: Boolean!, $withIssues: Boolean!
+) {
+  user(login: $login) {
+    contributionsCollection(from: $from, to: $to) {
+      totalRepositoriesWithContributedCommits @include(if: $withCommits)
+      commitContributionsByRepository(maxRepositories: 100) @include(if: $withCommits) {
+        contributions(first: 100) {
+          nodes { occurredAt commitCount }
+        }
+      }
+      pullRequestContributions(first: 100, after: $prAfter) @include(if: $withPrs) {
+        pageInfo { hasNextPage endCursor }
+        nodes { occurredAt }
+      }
+      issueContributions(first: 100, after: $issueAfter) @include(if: $withIssues) {
+        pageInfo { hasNextPage endCursor }
+        nodes { occurredAt }
+      }
+    }
+  }
+}
+"""
+
+
+@dataclass
+class ContributionResult:
+    """贡献日历的聚合结果"""
+
+    # 按日期聚合的 commit / PR / issue 计数（star 由 stargazer 拉取补充）
+    stats: DailyStatsAccumulator = field(default_factory=DailyStatsAccumulator)
+    # commit 仓库数超过上限、需要走搜索路径兜底的时间窗口
+    commit_fallback_windows: List[Tuple[date, date]] = field(default_factory=list)
+
+    def add(self, day: date, key: str, amount: int = 1) -> None:
+        self.stats.add(day, key, amount)
+
+
+def _windows(start_date: date, end_date: date) -> List[Tuple[date, date]]:
+    windows: List[Tuple[date, date]] = []
+    cursor = start_date
+    while cursor <= end_date:
+        window_end = min(cursor + timedelta(days=WINDOW_DAYS - 1), end_date)
+        windows.append((cursor, window_end))
+        cursor = window_end + timedelta(days=1)
+    return windows
+
+
+def _occurred_date(value: str) -> date:
+    # 与搜索、事件路径一致，取时间戳自身时区下的日期，不换算到 UTC
+    return date.fromisoformat(value[:10])
+
+
+async def _fetch_window(
+    github_token: str,
+    username: str,
+    window: Tuple[date, date],
+    bounds: Tuple[date, date],
+    result: ContributionResult,
+) -> bool:
+    """
+    拉取单个窗口内的全部贡献，落在 bounds 内的计数直接累加到 result
+
+    Returns:
+        commit 是否需要兜底
+    """
+    window_start, window_end = window
+    lower, upper = bounds
+
+    def _add(occurred_at: str, key: str, amount: int) -> None:
+        day = _occurred_date(occurred_at)
+        if lower <= day <= upper:
+            result.add(day, key, amount)
+
+    needs_commit_fallback = False
+    variables: Dict[str, Optional[object]] = {
+        "login": username,
+        "from": f"{window_start.isoformat()}T00:00:00Z",
+        "to": f"{window_end.isoformat()}T23:59:59Z",
+        "prAfter": None,
+        "issueAfter": None,
+        "withCommits": True,
+        "withPrs": True,
+        "withIssues": True,
+    }
+
+    while variables["withCommits"] or variables["withPrs"] or variables["withIssues"]:
+        resp = await github_request(
+            "POST",
+            f"{settings.GITHUB_API_BASE_URL}/graphql",
+            github_token,
+            resource=RESOURCE_GRAPHQL,
+            accept="application/vnd.github+json",
+            json={"query": CONTRIBUTIONS_QUERY, "variables": variables},
+        )
+        resp.raise_for_status()
+        collection = (
+            ((resp.json().get("data") or {}).get("user") or {}).get("contributionsCollection") or {}
+        )
+
+        if variables["withCommits"]:
+            total_repos = collection.get("totalRepositoriesWithContributedCommits") or 0
+            if total_repos > MAX_COMMIT_REPOSITORIES:
+                needs_commit_fallback = True
+            else:
+                for repo in collection.get("commitContributionsByRepository") or []:
+                    for node in (repo.get("contributions") or {}).get("nodes") or []:
+                        _add(node["occurredAt"], "commit_count", node["commitCount"])
+            variables["withCommits"] = False
+
+        for key, field_name, flag, cursor in (
+            ("pr_count", "pullRequestContributions", "withPrs", "prAfter"),
+            ("issue_count", "issueContributions", "withIssues", "issueAfter"),
+        ):
+            if not variables[flag]:
+                continue
+            connection = collection.get(field_name) or {}
+            for node in connection.get("nodes") or []:
+                _add(node["occurredAt"], key, 1)
+            page_info = connection.get("pageInfo") or {}
+            variables[flag] = bool(page_info.get("hasNextPage"))
+            variables[cursor] = page_info.get("endCursor")
+
+    return needs_commit_fallback
+
+
+async def fetch_contribution_stats(
+    github_token: str,
+    username: str,
+    start_date: date,
+    end_date: date,
+    concurrency: Optional[int] = None,
+    stats: Optional[DailyStatsAccumulator] = None,
+) -> ContributionResult:
+    """
+    通过 contributionsCollection 拉取时间范围内的每日 commit / PR / issue 计数
+
+    范围按不超过 100 天的窗口切分并发拉取。某个窗口内提交过 commit 的仓库超过
+    100 个时，该窗口的 commit 计数记入 commit_fallback_windows，由调用方走搜索路径。
+    传入 stats 时计数直接累加到该累加器
+
+    Raises:
+        httpx.HTTPError: 如果 API 请求失败
+    """
+    scheduler = BoundedScheduler(
+        concurrency or settings.GITHUB_DEEP_CONTRIBUTION_CONCURRENCY, label="contributions"
+    )
+    windows = _windows(start_date, end_date)
+
+    result = ContributionResult(stats=stats if stats is not None else DailyStatsAccumulator())
+
+    async def _run(window: Tuple[date, date]) -> bool:
+        return await _fetch_window(github_token, username, window, (start_date, end_date), result)
+
+    for window, needs_commit_fallback in zip(windows, await scheduler.map(_run, windows)):
+        if needs_commit_fallback:
+            result.commit_fallback_windows.append(window)
+    return result
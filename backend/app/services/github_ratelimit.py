@@ -0,0 +1,228 @@
+"""
+GitHub 速率限制调度
+按 token 分别跟踪 core / search / graphql 三类配额：
+- 令牌桶提前限速，避免触发每分钟的次级限制（secondary rate limit）
+- 根据 X-RateLimit-* 响应头维护主配额，用尽时等待到重置时间
+- 处理 Retry-After 和次级限制响应，供请求封装重试
+"""
+import asyncio
+import hashlib
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+from app.core.config import settings
+
+RESOURCE_CORE = "core"
+RESOURCE_SEARCH = "search"
+RESOURCE_GRAPHQL = "graphql"
+
+# 次级限制的默认等待时间（GitHub 文档建议至少等待 1 分钟）
+SECONDARY_LIMIT_WAIT_SECONDS = 60.0
+# 清理空闲配额状态的最短间隔（秒）
+PRUNE_INTERVAL_SECONDS = 60.0
+
+
+class RateLimitExceeded(Exception):
+    """配额用尽且需要等待的时间超过上限"""
+
+    def __init__(self, resource: str, retry_after: float):
+        self.resource = resource
+        self.retry_after = retry_after
+        super().__init__(f"GitHub {resource} 配额已用尽，约 {int(retry_after)} 秒后重置")
+
+
+def token_identity(github_token: str) -> str:
+    """token 的不可逆标识，避免在内存结构和缓存键中保存明文 token"""
+    return hashlib.sha256(github_token.encode("utf-8")).hexdigest()[:32]
+
+
+def _bucket_params(resource: str) -> Tuple[float, float]:
+    """各资源令牌桶的 (每秒速率, 容量)"""
+    if resource == RESOURCE_SEARCH:
+        per_second = settings.GITHUB_SEARCH_REQUESTS_PER_MINUTE / 60.0
+        return per_second, float(settings.GITHUB_SEARCH_REQUESTS_PER_MINUTE)
+    if resource == RESOURCE_GRAPHQL:
+        return settings.GITHUB_GRAPHQL_REQUESTS_PER_SECOND, float(settings.GITHUB_GRAPHQL_BURST)
+    return settings.GITHUB_CORE_REQUESTS_PER_SECOND, float(settings.GITHUB_CORE_BURST)
+
+
+@dataclass
+class RateBudget:
+    """单个 token 在单类资源上的配额状态"""
+
+    rate: float
+    capacity: float
+    tokens: float
+    updated_at: float
+    limit: Optional[int] = None
+    remaining: Optional[int] = None
+    reset_at: Optional[float] = None
+    blocked_until: float = 0.0
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False)
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self.updated_at)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated_at = now
+
+    def wait_time(self, now: float) -> float:
+        """距离下一个请求可以发出还需等待的秒数"""
+        if self.blocked_until > now:
+            return self.blocked_until - now
+        if self.remaining is not None and self.remaining <= 0:
+            if self.reset_at is not None and self.reset_at > now:
+                return self.reset_at - now
+            # 已过重置时间，乐观地恢复配额，等待下一个响应头校正
+            self.remaining = self.limit
+        self._refill(now)
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def idle(self, now: float) -> bool:
+        """配额窗口已过、令牌桶已满且无人等待：与新建的状态等价，可以丢弃"""
+        if self.lock.locked() or self.blocked_until > now:
+            return False
+        if self.reset_at is not None and self.reset_at > now:
+            return False
+        return self.tokens + (now - self.updated_at) * self.rate >= self.capacity
+
+    def consume(self) -> None:
+        self.tokens -= 1
+        if self.remaining is not None:
+            self.remaining -= 1
+
+
+class RateLimitGovernor:
+    """
+    进程内共享的 GitHub 配额调度器，所有用户和同步任务共用
+
+    每个 (token, 资源) 一份配额状态；用户重新登录会换新 token，
+    因此新建状态时定期丢弃已空闲的旧状态，条目数只与近一个配额窗口内活跃的 token 有关
+    """
+
+    def __init__(self) -> None:
+        self._budgets: Dict[Tuple[str, str], RateBudget] = {}
+        self._pruned_at = time.monotonic()
+
+    def _budget(self, github_token: str, resource: str) -> RateBudget:
+        key = (token_identity(github_token), resource)
+        budget = self._budgets.get(key)
+        if budget is None:
+            now = time.monotonic()
+            if now - self._pruned_at >= PRUNE_INTERVAL_SECONDS:
+                self._prune(now)
+            rate, capacity = _bucket_params(resource)
+            budget = RateBudget(rate=rate, capacity=capacity, tokens=capacity, updated_at=now)
+            self._budgets[key] = budget
+        return budget
+
+    def _prune(self, now: float) -> None:
+        self._budgets = {
+            key: budget for key, budget in self._budgets.items() if not budget.idle(now)
+        }
+        self._pruned_at = now
+
+    async def acquire(self, github_token: str, resource: str = RESOURCE_CORE) -> None:
+        """
+        申请发出一次请求，必要时等待
+
+        Raises:
+            RateLimitExceeded: 需要等待的时间超过 GITHUB_RATE_LIMIT_MAX_WAIT
+        """
+        budget = self._budget(github_token, resource)
+        # 持锁等待保证同一配额上的请求按到达顺序放行
+        async with budget.lock:
+            while True:
+                delay = budget.wait_time(time.monotonic())
+                if delay <= 0:
+                    budget.consume()
+                    return
+                if delay > settings.GITHUB_RATE_LIMIT_MAX_WAIT:
+                    raise RateLimitExceeded(resource, delay)
+                await asyncio.sleep(delay)
+
+    def observe(self, github_token: str, resource: str, response: httpx.Response) -> bool:
+        """
+        根据响应头更新配额
+
+        Returns:
+            响应是否为限流（403/429 且由配额或次级限制引起），调用方应重试
+        """
+        headers = response.headers
+        resource = headers.get("X-RateLimit-Resource", resource)
+        budget = self._budget(github_token, resource)
+        now = time.monotonic()
+
+        remaining = _int_header(headers, "X-RateLimit-Remaining")
+        reset_epoch = _int_header(headers, "X-RateLimit-Reset")
+        if remaining is not None and reset_epoch is not None:
+            reset_at = now + max(0.0, reset_epoch - time.time())
+            same_window = budget.reset_at is not None and abs(budget.reset_at - reset_at) < 2
+            if same_window and budget.remaining is not None:
+                # 并发请求的响应可能乱序到达，同一窗口内取较小值
+                budget.remaining = min(budget.remaining, remaining)
+            else:
+                budget.remaining = remaining
+            budget.reset_at = reset_at
+            budget.limit = _int_header(headers, "X-RateLimit-Limit") or budget.limit
+
+        if response.status_code not in (403, 429):
+            return False
+
+        retry_after = _int_header(headers, "Retry-After")
+        if retry_after is not None:
+            budget.blocked_until = max(budget.blocked_until, now + retry_after)
+            return True
+        if remaining == 0 and budget.reset_at is not None:
+            budget.blocked_until = max(budget.blocked_until, budget.reset_at)
+            return True
+        if response.status_code == 429 or "secondary rate limit" in response.text.lower():
+            budget.blocked_until = max(budget.blocked_until, now + SECONDARY_LIMIT_WAIT_SECONDS)
+            return True
+        return False
+
+    def load_rate_limit_payload(self, github_token: str, payload: dict) -> None:
+        """用 GET /rate_limit 的响应体刷新该 token 的全部配额"""
+        now = time.monotonic()
+        for resource, info in (payload.get("resources") or {}).items():
+            budget = self._budget(github_token, resource)
+            budget.limit = info.get("limit")
+            budget.remaining = info.get("remaining")
+            budget.reset_at = now + max(0.0, info.get("reset", 0) - time.time())
+
+    def snapshot(self, github_token: str) -> Dict[str, dict]:
+        """返回该 token 各类配额的剩余情况"""
+        identity = token_identity(github_token)
+        now = time.monotonic()
+        result: Dict[str, dict] = {}
+        for (owner, resource), budget in self._budgets.items():
+            if owner != identity:
+                continue
+            reset_in = None
+            if budget.reset_at is not None:
+                reset_in = max(0, int(budget.reset_at - now))
+            result[resource] = {
+                "limit": budget.limit,
+                "remaining": budget.remaining,
+                "reset_in_seconds": reset_in,
+                "blocked_for_seconds": max(0, int(budget.blocked_until - now)),
+            }
+        return result
+
+
+def _int_header(headers: httpx.Headers, name: str) -> Optional[int]:
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return int(float(value))
+    except ValueError:
+        return None
+
+
+# 全局共享实例
+rate_limit_governor = RateLimitGovernor()
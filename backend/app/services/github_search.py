@@ -0,0 +1,116 @@
+"""
+GitHub 搜索 API 的自适应范围规划
+搜索 API 单个查询最多只返回前 1000 条结果。先用整个范围的第一页读出 total_count：
+未超上限的范围直接并发拉取剩余页，超出上限的范围按结果密度切分后递归处理。
+稀疏的时间段因此自然合并成一个宽窗口，密集的时间段则细分到周、天
+"""
+import logging
+import math
+from datetime import date, timedelta
+from typing import AsyncIterator, Awaitable, Callable, List, Tuple
+
+from app.services.concurrency import BoundedScheduler, gather_all, stream_pages
+from app.services.github_client import github_request
+from app.services.github_ratelimit import RESOURCE_SEARCH
+
+logger = logging.getLogger(__name__)
+
+# 单个搜索查询最多可取回的结果数
+SEARCH_RESULT_CAP = 1000
+PER_PAGE = 100
+# 切分时每个子范围的目标结果数，留出余量以免切分后仍略超上限
+SPLIT_TARGET = 800
+
+
+def split_range(start_date: date, end_date: date, total_count: int) -> List[Tuple[date, date]]:
+    """
+    按结果数把范围均分为若干子范围，使每段预计不超过 SPLIT_TARGET 条
+
+    至少切成两段，最细到单日
+    """
+    days = (end_date - start_date).days + 1
+    parts = min(days, max(2, math.ceil(total_count / SPLIT_TARGET)))
+    ranges: List[Tuple[date, date]] = []
+    cursor = start_date
+    for index in range(parts):
+        # 把剩余天数均分到剩余段数上，保证各段长度最多相差一天
+        remaining = (end_date - cursor).days + 1
+        part_end = cursor + timedelta(days=math.ceil(remaining / (parts - index)) - 1)
+        ranges.append((cursor, part_end))
+        cursor = part_end + timedelta(days=1)
+    return ranges
+
+
+def iter_search_pages(
+    github_token: str,
+    url: str,
+    build_query: Callable[[date, date], str],
+    start_date: date,
+    end_date: date,
+    scheduler: BoundedScheduler,
+    *,
+    sort: str,
+    accept: str = "application/vnd.github+json",
+) -> AsyncIterator[List[dict]]:
+    """
+    搜索 [start_date, end_date] 内的全部结果，按页产出
+
+    build_query 根据子范围生成搜索语句；所有请求都经 scheduler 限制并发并上报进度，
+    各页按完成顺序产出，消费方处理完即可丢弃
+
+    Raises:
+        httpx.HTTPError: 如果 API 请求失败
+    """
+
+    async def _page(range_start: date, range_end: date, page: int) -> dict:
+        resp = await github_request(
+            "GET",
+            url,
+            github_token,
+            resource=RESOURCE_SEARCH,
+            accept=accept,
+            params={
+                "q": build_query(range_start, range_end),
+                "sort": sort,
+                "order": "asc",
+                "page": page,
+                "per_page": PER_PAGE,
+            },
+        )
+        resp.raise_for_status()
+        return resp.json()
+
+    async def _produce(emit: Callable[[List[dict]], Awaitable[None]]) -> None:
+        async def _search(range_start: date, range_end: date) -> None:
+            scheduler.add_chunks(1)
+            first = await scheduler.run_chunk(_page(range_start, range_end, 1))
+            total_count = first.get("total_count") or 0
+
+            if total_count > SEARCH_RESULT_CAP and range_start < range_end:
+                sub_ranges = split_range(range_start, range_end, total_count)
+                await gather_all(*(_search(sub_start, sub_end) for sub_start, sub_end in sub_ranges))
+                return
+
+            if total_count > SEARCH_RESULT_CAP:
+                logger.warning(
+                    "search for %s has %d results on a single day, only the first %d are reachable",
+                    range_start,
+                    total_count,
+                    SEARCH_RESULT_CAP,
+                )
+
+            items = first.get("items") or []
+            await emit(items)
+            pages = math.ceil(min(total_count, SEARCH_RESULT_CAP) / PER_PAGE)
+            if pages > 1 and len(items) >= PER_PAGE:
+                scheduler.add_chunks(pages - 1)
+
+                async def _rest(page: int) -> None:
+                    data = await scheduler.run_chunk(_page(range_start, range_end, page))
+                    await emit(data.get("items") or [])
+
+                await gather_all(*(_rest(page) for page in range(2, pages + 1)))
+
+        await _search(start_date, end_date)
+
+    return stream_pages(_produce, maxsize=scheduler.limit)
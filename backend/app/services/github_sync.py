@@ -2,28 +2,55 @@
 GitHub 数据同步服务
 调用 GitHub API，获取用户数据并进行聚合
 """
+from dataclasses import dataclass
 from datetime import date, datetime, time, timedelta, timezone
-from typing import Dict, List, Optional, Tuple
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 import collections
+import hashlib
+import json
 import logging
 import sys
-from calendar import monthrange
 
-import httpx
+from sqlalchemy import delete, func, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
-from app.models import GithubDailyStat, GithubRepo, User
+from app.db.dialects import dialect_insert
+from app.models import GithubDailyStat, GithubRepo, GithubSyncState, User
+from app.services.concurrency import BoundedScheduler, gather_all, stream_pages
+from app.services.github_cache import github_get_json
+from app.services.github_client import github_request
+from app.services.daily_stats import STAT_KEYS, DailyStatsAccumulator
+from app.services.event_archive import EventArchiveWriter, iter_archived_events
+from app.services.github_contributions import fetch_contribution_stats
+from app.services.github_ratelimit import RESOURCE_GRAPHQL
+from app.services.github_search import iter_search_pages
+from app.services.stat_rollups import refresh_stat_rollups
+from app.services.streaks import refresh_activity_runs
+from app.services.sync_progress import current_progress
+from app.services.timeseries import patch_daily_series
 
 logger = logging.getLogger(__name__)
 
 
-async def fetch_user_repos(github_token: str) -> List[dict]:
+async def fetch_user_repos(github_token: str, user_id: Optional[int] = None) -> List[dict]:
     """
     获取用户的所有仓库列表
 
     Args:
         github_token: GitHub access token
+        user_id: 本地用户 ID，传入时使用条件请求缓存
 
     Returns:
         仓库列表，每个仓库包含 id, name, full_name, private, language, html_url, description
@@ -35,77 +62,63 @@ async def fetch_user_repos(github_token: str) -> List[dict]:
     page = 1
     per_page = 100
 
-    async with httpx.AsyncClient() as client:
-        while True:
-            url = f"{settings.GITHUB_API_BASE_URL}/user/repos"
-            params = {
-                "page": page,
-                "per_page": per_page,
-                "sort": "updated",
-                "direction": "desc",
-            }
-
-            response = await client.get(
-                url,
-                params=params,
-                headers={
-                    "Authorization": f"Bearer {github_token}",
-                    "Accept": "application/vnd.github.v3+json",
-                },
-                timeout=10.0,
-            )
-            response.raise_for_status()
+    while True:
+        url = f"{settings.GITHUB_API_BASE_URL}/user/repos"
+        params = {
+            "page": page,
+            "per_page": per_page,
+            "sort": "updated",
+            "direction": "desc",
+        }
 
-            page_repos = response.json()
-            if not page_repos:
-                break
+        page_repos = await github_get_json(url, github_token, user_id=user_id, params=params)
+        if not page_repos:
+            break
 
-            repos.extend(page_repos)
-            page += 1
+        repos.extend(page_repos)
+        page += 1
 
-            # 如果返回的仓库数少于 per_page，说明已经是最后一页
-            if len(page_repos) < per_page:
-                break
+        # 如果返回的仓库数少于 per_page，说明已经是最后一页
+        if len(page_repos) < per_page:
+            break
 
     return repos
 
 
-async def fetch_current_username(github_token: str) -> str:
-    async with httpx.AsyncClient() as client:
-        user_response = await client.get(
-            f"{settings.GITHUB_API_BASE_URL}/user",
-            headers={
-                "Authorization": f"Bearer {github_token}",
-                "Accept": "application/vnd.github.v3+json",
-            },
-            timeout=10.0,
-        )
-        user_response.raise_for_status()
-        return user_response.json()["login"]
+async def fetch_current_username(github_token: str, user_id: Optional[int] = None) -> str:
+    user_data = await github_get_json(
+        f"{settings.GITHUB_API_BASE_URL}/user", github_token, user_id=user_id
+    )
+    return user_data["login"]
 
 
-async def fetch_user_events(
+async def iter_user_events(
     github_token: str,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     days: int = 90,
-) -> List[dict]:
+    since_event_id: Optional[str] = None,
+    user_id: Optional[int] = None,
+) -> AsyncIterator[List[dict]]:
     """
-    获取用户的事件列表（包括 push、pull request、issue 等）
+    逐页获取用户的事件（包括 push、pull request、issue 等）
 
     Args:
         github_token: GitHub access token
         start_date: 开始日期（不传则使用 days 计算）
         end_date: 结束日期（不传则默认为当前时间）
         days: 当未指定 start_date 时，获取最近多少天的事件（默认 90 天）
+        since_event_id: 增量水位线。到达该事件后停止翻页，只补齐最早新事件所在当天的
+            旧事件，使产出的事件恰好覆盖所有受影响日期的完整数据
+        user_id: 本地用户 ID，传入时第一页使用条件请求缓存。没有新事件时第一页命中 304；
+            有新事件时后续各页整体后移，缓存不会命中，因此不缓存
 
-    Returns:
-        事件列表，每个事件包含 type, created_at, payload 等信息
+    Yields:
+        每页中落在时间范围内的事件，每个事件包含 type, created_at, payload 等信息
 
     Raises:
         httpx.HTTPError: 如果 API 请求失败
     """
-    events: List[dict] = []
     page = 1
     per_page = 100
     end_dt = (
@@ -119,100 +132,87 @@ async def fetch_user_events(
         else end_dt - timedelta(days=days)
     )
 
-    async with httpx.AsyncClient() as client:
-        # 首先获取用户信息以获取用户名
-        user_response = await client.get(
-            f"{settings.GITHUB_API_BASE_URL}/user",
-            headers={
-                "Authorization": f"Bearer {github_token}",
-                "Accept": "application/vnd.github.v3+json",
-            },
-            timeout=10.0,
+    watermark = int(since_event_id) if since_event_id else None
+    # 到达水位线后，只需要继续收集该时间点之后的旧事件（最早受影响日期的零点）
+    boundary: Optional[datetime] = None
+    # 最近一个被产出的事件时间（事件按时间倒序返回，即目前最早的新事件）
+    last_kept_at: Optional[datetime] = None
+
+    # 首先获取用户信息以获取用户名
+    username = await fetch_current_username(github_token, user_id)
+
+    while True:
+        # 获取用户事件
+        url = f"{settings.GITHUB_API_BASE_URL}/users/{username}/events"
+        params = {
+            "page": page,
+            "per_page": per_page,
+        }
+
+        page_events = await github_get_json(
+            url, github_token, user_id=user_id if page == 1 else None, params=params
         )
-        user_response.raise_for_status()
-        username = user_response.json()["login"]
-
-        while True:
-            # 获取用户事件
-            url = f"{settings.GITHUB_API_BASE_URL}/users/{username}/events"
-            params = {
-                "page": page,
-                "per_page": per_page,
-            }
-
-            response = await client.get(
-                url,
-                params=params,
-                headers={
-                    "Authorization": f"Bearer {github_token}",
-                    "Accept": "application/vnd.github.v3+json",
-                },
-                timeout=10.0,
-            )
-            response.raise_for_status()
+        if not page_events:
+            break
 
-            page_events = response.json()
-            if not page_events:
-                break
+        # 过滤超出时间范围的事件
+        kept: List[dict] = []
+        finished = False
+        for event in page_events:
+            event_date = datetime.fromisoformat(event["created_at"].replace("Z", "+00:00"))
 
-            # 过滤超出时间范围的事件
-            for event in page_events:
-                event_date = datetime.fromisoformat(event["created_at"].replace("Z", "+00:00"))
+            # 过滤结束日期之后的事件
+            if event_date > end_dt:
+                continue
 
-                # 过滤结束日期之后的事件
-                if event_date > end_dt:
-                    continue
+            if event_date < cutoff_date:
+                # 已经超出时间范围，停止获取
+                finished = True
+                break
 
-                if event_date < cutoff_date:
-                    # 已经超出时间范围，停止获取
-                    return events
+            if watermark is not None and boundary is None and int(event["id"]) <= watermark:
+                # 到达已入库的事件
+                if last_kept_at is None:
+                    finished = True
+                    break
+                boundary = datetime.combine(last_kept_at.date(), time.min, tzinfo=timezone.utc)
 
-                events.append(event)
+            if boundary is not None and event_date < boundary:
+                finished = True
+                break
 
-            page += 1
+            kept.append(event)
+            last_kept_at = event_date
 
-            # 如果返回的事件数少于 per_page，说明已经是最后一页
-            if len(page_events) < per_page:
-                break
+        if kept:
+            yield kept
+        # 如果返回的事件数少于 per_page，说明已经是最后一页
+        if finished or len(page_events) < per_page:
+            break
+        page += 1
 
-    return events
 
+# 事件计入的统计字段在 STAT_KEYS 中的下标
+_COMMIT, _PR, _ISSUE, _STAR = (
+    STAT_KEYS.index(key) for key in ("commit_count", "pr_count", "issue_count", "star_delta")
+)
+_PR_ACTIONS = frozenset({"opened", "reopened", "closed"})
+_ISSUE_ACTIONS = frozenset({"opened", "reopened"})
 
-def aggregate_daily_stats(events: List[dict]) -> Dict[date, Dict[str, int]]:
-    """
-    聚合事件数据，按日期统计各类活动
 
-    Args:
-        events: GitHub 事件列表
+def add_event_stats(stats: DailyStatsAccumulator, events: Sequence[dict]) -> None:
+    """
+    按日期把一批事件的各类活动累加到 stats
 
-    Returns:
-        按日期聚合的统计数据，格式：
-        {
-            date(2025-01-01): {
-                "commit_count": 5,
-                "pr_count": 1,
-                "issue_count": 0,
-                "star_delta": 0,
-            },
-            ...
-        }
+    先逐条按事件类型确定计入的字段和数量，再按时间戳整批分桶
     """
-    stats: Dict[date, Dict[str, int]] = {}
+    timestamps: List[str] = []
+    key_indexes: List[int] = []
+    amounts: List[int] = []
 
     for event in events:
-        # 解析事件时间
-        event_date_str = event["created_at"]
-        event_datetime = datetime.fromisoformat(event_date_str.replace("Z", "+00:00"))
-        event_date = event_datetime.date()
-
-        # 初始化该日期的统计数据
-        if event_date not in stats:
-            stats[event_date] = {
-                "commit_count": 0,
-                "pr_count": 0,
-                "issue_count": 0,
-                "star_delta": 0,
-            }
+        # 其他类型的事件不计数，但其日期仍视为本次同步覆盖的日期
+        key_index, amount = -1, 0
 
         # 根据事件类型统计
         event_type = event.get("type", "")
@@ -222,212 +222,466 @@ def aggregate_daily_stats(events: List[dict]) -> Dict[date, Dict[str, int]]:
             payload = event.get("payload", {})
             commits = payload.get("commits", [])
             if commits:
-                stats[event_date]["commit_count"] += len(commits)
+                key_index, amount = _COMMIT, len(commits)
             else:
-                # 有些事件只包含 size，不返回 commits 列表
+                # 有些事件只包含 size，不返回 commits 列表；最少按 1 次提交计入，避免被漏记
                 size = payload.get("size")
-                if isinstance(size, int) and size > 0:
-                    stats[event_date]["commit_count"] += size
-                else:
-                    # 最少按 1 次提交计入，避免被漏记
-                    stats[event_date]["commit_count"] += 1
+                key_index, amount = _COMMIT, size if isinstance(size, int) and size > 0 else 1
 
         elif event_type == "PullRequestEvent":
-            action = event.get("payload", {}).get("action", "")
             # opened / reopened / closed (包含 merged) 都计一次
-            if action in {"opened", "reopened", "closed"}:
-                stats[event_date]["pr_count"] += 1
+            if event.get("payload", {}).get("action", "") in _PR_ACTIONS:
+                key_index, amount = _PR, 1
 
         elif event_type == "IssuesEvent":
-            action = event.get("payload", {}).get("action", "")
-            if action in {"opened", "reopened"}:
-                stats[event_date]["issue_count"] += 1
-
-        elif event_type == "WatchEvent":
-            # Star 事件
-            stats[event_date]["star_delta"] += 1
-        elif event_type == "PublicEvent":
-            # 仓库公开事件，按 1 次 star 增量处理，避免丢失
-            stats[event_date]["star_delta"] += 1
-
-    return stats
-
-
-def _month_chunks(start_date: date, end_date: date) -> List[Tuple[date, date]]:
-    chunks: List[Tuple[date, date]] = []
-    cursor = start_date
-    while cursor <= end_date:
-        last_day = monthrange(cursor.year, cursor.month)[1]
-        chunk_end = date(cursor.year, cursor.month, last_day)
-        if chunk_end > end_date:
-            chunk_end = end_date
-        chunks.append((cursor, chunk_end))
-        cursor = chunk_end + timedelta(days=1)
-    return chunks
-
-
-async def _search_github(
-    github_token: str, url: str, params: dict, accept: str = "application/vnd.github+json"
-) -> List[dict]:
-    items: List[dict] = []
-    page = 1
-    per_page = 100
-    async with httpx.AsyncClient() as client:
-        while True:
-            resp = await client.get(
-                url,
-                params={**params, "page": page, "per_page": per_page},
-                headers={
-                    "Authorization": f"Bearer {github_token}",
-                    "Accept": accept,
-                },
-                timeout=15.0,
-            )
-            resp.raise_for_status()
-            data = resp.json()
-            page_items = data.get("items", [])
-            items.extend(page_items)
-            if len(page_items) < per_page:
-                break
-            page += 1
-    return items
+            if event.get("payload", {}).get("action", "") in _ISSUE_ACTIONS:
+                key_index, amount = _ISSUE, 1
 
+        elif event_type == "WatchEvent" or event_type == "PublicEvent":
+            # Star 事件；仓库公开事件按 1 次 star 增量处理，避免丢失
+            key_index, amount = _STAR, 1
 
-async def search_commits_by_range(
-    github_token: str, username: str, start_date: date, end_date: date
-) -> List[datetime]:
-    dates: List[datetime] = []
-    for chunk_start, chunk_end in _month_chunks(start_date, end_date):
-        query = f"author:{username} committer-date:{chunk_start}..{chunk_end}"
-        items = await _search_github(
-            github_token,
-            f"{settings.GITHUB_API_BASE_URL}/search/commits",
-            {"q": query, "sort": "committer-date", "order": "asc"},
-            accept="application/vnd.github.cloak-preview+json",
-        )
+        timestamps.append(event["created_at"])
+        key_indexes.append(key_index)
+        amounts.append(amount)
+
+    stats.add_keyed_timestamps(timestamps, key_indexes, amounts)
+
+
+def aggregate_daily_stats(events: Sequence[dict]) -> Dict[date, Dict[str, int]]:
+    """
+    聚合事件数据，按日期统计各类活动
+
+    Args:
+        events: GitHub 事件列表
+
+    Returns:
+        按日期聚合的统计数据，格式：
+        {
+            date(2025-01-01): {
+                "commit_count": 5,
+                "pr_count": 1,
+                "issue_count": 0,
+                "star_delta": 0,
+            },
+            ...
+        }
+    """
+    stats = DailyStatsAccumulator()
+    add_event_stats(stats, events)
+    return stats.to_dict()
+
+
+async def iter_commit_dates(
+    github_token: str,
+    username: str,
+    start_date: date,
+    end_date: date,
+    concurrency: Optional[int] = None,
+) -> AsyncIterator[List[str]]:
+    """搜索范围内的 commit，按结果数自适应切分范围、并发拉取，逐页产出提交时间（ISO 字符串）"""
+    scheduler = BoundedScheduler(
+        concurrency or settings.GITHUB_DEEP_COMMIT_CONCURRENCY, label="commits"
+    )
+    pages = iter_search_pages(
+        github_token,
+        f"{settings.GITHUB_API_BASE_URL}/search/commits",
+        lambda range_start, range_end: f"author:{username} committer-date:{range_start}..{range_end}",
+        start_date,
+        end_date,
+        scheduler,
+        sort="committer-date",
+        accept="application/vnd.github.cloak-preview+json",
+    )
+    async for items in pages:
+        commit_dates: List[str] = []
         for item in items:
             commit = item.get("commit", {})
             dt_str = commit.get("author", {}).get("date") or commit.get("committer", {}).get("date")
             if dt_str:
-                dates.append(datetime.fromisoformat(dt_str.replace("Z", "+00:00")))
-    return dates
+                commit_dates.append(dt_str)
+        yield commit_dates
 
 
-async def search_issues_pr_by_range(
-    github_token: str, username: str, start_date: date, end_date: date, is_pr: bool
-) -> List[datetime]:
-    dates: List[datetime] = []
+async def iter_issue_pr_dates(
+    github_token: str,
+    username: str,
+    start_date: date,
+    end_date: date,
+    is_pr: bool,
+    concurrency: Optional[int] = None,
+) -> AsyncIterator[List[str]]:
+    """搜索范围内创建的 PR / issue，按结果数自适应切分范围、并发拉取，逐页产出创建时间（ISO 字符串）"""
     type_filter = "pr" if is_pr else "issue"
-    for chunk_start, chunk_end in _month_chunks(start_date, end_date):
-        query = f"author:{username} type:{type_filter} created:{chunk_start}..{chunk_end}"
-        items = await _search_github(
-            github_token,
-            f"{settings.GITHUB_API_BASE_URL}/search/issues",
-            {"q": query, "sort": "created", "order": "asc"},
-        )
-        for item in items:
-            dt_str = item.get("created_at")
-            if dt_str:
-                dates.append(datetime.fromisoformat(dt_str.replace("Z", "+00:00")))
-    return dates
+    default_concurrency = (
+        settings.GITHUB_DEEP_PR_CONCURRENCY if is_pr else settings.GITHUB_DEEP_ISSUE_CONCURRENCY
+    )
+    scheduler = BoundedScheduler(concurrency or default_concurrency, label=f"{type_filter}s")
+    pages = iter_search_pages(
+        github_token,
+        f"{settings.GITHUB_API_BASE_URL}/search/issues",
+        lambda range_start, range_end: (
+            f"author:{username} type:{type_filter} created:{range_start}..{range_end}"
+        ),
+        start_date,
+        end_date,
+        scheduler,
+        sort="created",
+    )
+    async for items in pages:
+        yield [item["created_at"] for item in items if item.get("created_at")]
 
 
-async def fetch_repo_stars_delta(
-    github_token: str, repos: List[dict], start_date: date, end_date: date
-) -> List[datetime]:
-    """使用 GitHub GraphQL 拉取每个仓库在时间范围内的 star 事件时间"""
-    if not repos:
-        return []
-    gql_url = "https://api.github.com/graphql"
-    query = """
-    query ($owner: String!, $name: String!, $after: String) {
-      repository(owner: $owner, name: $name) {
-        stargazers(first: 100, after: $after, orderBy: {field: STARRED_AT, direction: ASC}) {
-          pageInfo { hasNextPage endCursor }
-          edges { starredAt }
-        }
-      }
-    }
+_STARGAZERS_FIELDS = """
+    stargazers(first: 100, after: $a{i}, orderBy: {{field: STARRED_AT, direction: ASC}}) {{
+      pageInfo {{ hasNextPage endCursor }}
+      edges {{ starredAt }}
+    }}
+"""
+
+
+def _build_stargazers_query(batch_size: int) -> str:
+    """构造批量查询：每个仓库一个别名 r{i}，owner / name / 游标都通过变量传入"""
+    variables = ", ".join(f"$o{i}: String!, $n{i}: String!, $a{i}: String" for i in range(batch_size))
+    fields = "\n".join(
+        f"  r{i}: repository(owner: $o{i}, name: $n{i}) {{{_STARGAZERS_FIELDS.format(i=i)}  }}"
+        for i in range(batch_size)
+    )
+    return f"query ({variables}) {{\n{fields}\n}}"
+
+
+async def iter_repo_star_dates(
+    github_token: str,
+    repos: List[dict],
+    start_date: date,
+    end_date: date,
+    concurrency: Optional[int] = None,
+) -> AsyncIterator[List[str]]:
     """
-    headers = {
-        "Authorization": f"Bearer {github_token}",
-        "Accept": "application/vnd.github+json",
-    }
-    collected: List[datetime] = []
+    使用 GitHub GraphQL 拉取仓库在时间范围内的 star 事件时间（ISO 字符串），逐个响应产出
 
-    async with httpx.AsyncClient() as client:
-        for repo in repos:
-            full_name = repo.get("full_name") if isinstance(repo, dict) else getattr(repo, "full_name", "")
-            if not full_name:
-                continue
-            owner, name = full_name.split("/", 1)
-            after = None
-            while True:
-                resp = await client.post(
-                    gql_url,
-                    json={"query": query, "variables": {"owner": owner, "name": name, "after": after}},
-                    headers=headers,
-                    timeout=20.0,
-                )
-                resp.raise_for_status()
-                data = resp.json()
-                edges = (
-                    data.get("data", {})
-                    .get("repository", {})
-                    .get("stargazers", {})
-                    .get("edges", [])
-                )
-                page_info = (
-                    data.get("data", {})
-                    .get("repository", {})
-                    .get("stargazers", {})
-                    .get("pageInfo", {})
-                )
-                for edge in edges:
+    多个仓库通过别名合并到同一个查询文档中；stargazers_count 为 0 的仓库直接跳过，
+    后续分页只请求仍有下一页且尚未越过结束日期的仓库
+    """
+    if not repos:
+        return
+    # ISO 时间字符串的日期部分可直接按字典序与范围比较
+    start_iso, end_iso = start_date.isoformat(), end_date.isoformat()
+    gql_url = f"{settings.GITHUB_API_BASE_URL}/graphql"
+    batch_size = max(1, settings.GITHUB_STARS_BATCH_SIZE)
+    scheduler = BoundedScheduler(concurrency or settings.GITHUB_DEEP_STAR_CONCURRENCY, label="stars")
+
+    full_names: List[str] = []
+    for repo in repos:
+        if isinstance(repo, dict):
+            full_name = repo.get("full_name")
+            star_count = repo.get("stargazers_count")
+        else:
+            full_name = getattr(repo, "full_name", "")
+            star_count = getattr(repo, "stargazers_count", None)
+        if not full_name or star_count == 0:
+            continue
+        full_names.append(full_name)
+
+    async def _fetch_batch(
+        batch: List[str], emit: Callable[[List[str]], Awaitable[None]]
+    ) -> None:
+        # 仍需分页的仓库：full_name -> 游标
+        pending: Dict[str, Optional[str]] = {full_name: None for full_name in batch}
+        while pending:
+            names = list(pending)
+            variables: Dict[str, Optional[str]] = {}
+            for i, full_name in enumerate(names):
+                owner, name = full_name.split("/", 1)
+                variables[f"o{i}"] = owner
+                variables[f"n{i}"] = name
+                variables[f"a{i}"] = pending[full_name]
+            resp = await github_request(
+                "POST",
+                gql_url,
+                github_token,
+                resource=RESOURCE_GRAPHQL,
+                accept="application/vnd.github+json",
+                json={"query": _build_stargazers_query(len(names)), "variables": variables},
+            )
+            resp.raise_for_status()
+            data = resp.json().get("data") or {}
+
+            next_pending: Dict[str, Optional[str]] = {}
+            page_dates: List[str] = []
+            for i, full_name in enumerate(names):
+                # 仓库已删除或无权限时该别名为 null
+                stargazers = (data.get(f"r{i}") or {}).get("stargazers") or {}
+                page_info = stargazers.get("pageInfo") or {}
+                has_next = bool(page_info.get("hasNextPage"))
+                for edge in stargazers.get("edges", []):
                     starred_at = edge.get("starredAt")
                     if starred_at:
-                        dt = datetime.fromisoformat(starred_at.replace("Z", "+00:00"))
-                        if dt.date() < start_date:
+                        if starred_at[:10] < start_iso:
                             continue
-                        if dt.date() > end_date:
+                        if starred_at[:10] > end_iso:
                             # 因为按时间升序，超过范围即可停止本仓库
-                            page_info["hasNextPage"] = False
+                            has_next = False
                             break
-                        collected.append(dt)
-                if not page_info.get("hasNextPage"):
-                    break
-                after = page_info.get("endCursor")
-    return collected
+                        page_dates.append(starred_at)
+                if has_next:
+                    next_pending[full_name] = page_info.get("endCursor")
+            await emit(page_dates)
+            pending = next_pending
+
+    batches = [full_names[i : i + batch_size] for i in range(0, len(full_names), batch_size)]
+
+    async def _produce(emit: Callable[[List[str]], Awaitable[None]]) -> None:
+        await scheduler.map(lambda batch: _fetch_batch(batch, emit), batches)
+
+    async for page_dates in stream_pages(_produce, maxsize=scheduler.limit):
+        yield page_dates
+
+
+def get_sync_state(db: Session, user_id: int) -> GithubSyncState:
+    """获取用户的同步水位线，不存在时创建"""
+    state = db.query(GithubSyncState).filter(GithubSyncState.user_id == user_id).first()
+    if state is None:
+        state = GithubSyncState(user_id=user_id)
+        db.add(state)
+        db.flush()
+    return state
+
+
+# 参与变化检测的仓库字段
+_REPO_FIELDS = ("name", "full_name", "private", "language", "html_url", "description")
+
+
+@dataclass
+class RepoSyncResult:
+    """一次仓库同步的变化计数"""
 
+    inserted: int = 0
+    updated: int = 0
+    deleted: int = 0
+    unchanged: int = 0
+    skipped: int = 0  # 已记在其他用户名下
 
-def aggregate_deep_stats(
-    commit_dates: List[datetime],
-    pr_dates: List[datetime],
-    issue_dates: List[datetime],
-    star_dates: List[datetime],
-) -> Dict[date, Dict[str, int]]:
-    stats: Dict[date, Dict[str, int]] = {}
+    @property
+    def total(self) -> int:
+        return self.inserted + self.updated + self.unchanged + self.skipped
 
-    def _add(d: date, key: str, amount: int = 1):
-        if d not in stats:
-            stats[d] = {"commit_count": 0, "pr_count": 0, "issue_count": 0, "star_delta": 0}
-        stats[d][key] += amount
 
-    for dt in commit_dates:
-        _add(dt.date(), "commit_count", 1)
-    for dt in pr_dates:
-        _add(dt.date(), "pr_count", 1)
-    for dt in issue_dates:
-        _add(dt.date(), "issue_count", 1)
-    for dt in star_dates:
-        _add(dt.date(), "star_delta", 1)
+def _repo_values(repo_data: dict) -> Dict[str, object]:
+    values = {field: repo_data.get(field) for field in _REPO_FIELDS}
+    values["private"] = bool(values["private"])
+    values["content_hash"] = hashlib.sha256(
+        json.dumps([values[field] for field in _REPO_FIELDS], ensure_ascii=False).encode("utf-8")
+    ).hexdigest()
+    return values
 
-    return stats
+
+def sync_user_repos(db: Session, user_id: int, repos: List[dict]) -> RepoSyncResult:
+    """
+    把 GitHub 返回的仓库列表同步到 github_repos，由调用方提交
+
+    一次查询载入用户已有仓库，按跟踪字段的摘要比对：只插入新仓库、更新内容变化的仓库、
+    删除已不在列表中的仓库（已删除或转移）。已记在其他用户名下的同一仓库跳过，不在用户之间移动
+    """
+    incoming: Dict[int, Dict[str, object]] = {}
+    for repo_data in repos:
+        incoming[repo_data["id"]] = _repo_values(repo_data)
+
+    existing: Dict[int, Tuple[int, Optional[str]]] = {
+        repo_id: (row_id, content_hash)
+        for row_id, repo_id, content_hash in db.query(
+            GithubRepo.id, GithubRepo.repo_id, GithubRepo.content_hash
+        ).filter(GithubRepo.user_id == user_id)
+    }
+    unknown_ids = [repo_id for repo_id in incoming if repo_id not in existing]
+    owned_by_others: Set[int] = set()
+    for offset in range(0, len(unknown_ids), UPSERT_CHUNK_ROWS):
+        owned_by_others.update(
+            repo_id
+            for (repo_id,) in db.query(GithubRepo.repo_id).filter(
+                GithubRepo.repo_id.in_(unknown_ids[offset : offset + UPSERT_CHUNK_ROWS])
+            )
+        )
+
+    now = datetime.utcnow()
+    result = RepoSyncResult()
+    inserts: List[Dict[str, object]] = []
+    updates: List[Dict[str, object]] = []
+    for repo_id, values in incoming.items():
+        if repo_id in existing:
+            row_id, content_hash = existing[repo_id]
+            if content_hash == values["content_hash"]:
+                result.unchanged += 1
+                continue
+            updates.append({"id": row_id, **values, "updated_at": now})
+        elif repo_id in owned_by_others:
+            # repo_id 全局唯一：协作者、组织仓库等已记在其他用户名下的不改动
+            result.skipped += 1
+        else:
+            inserts.append(
+                {"user_id": user_id, "repo_id": repo_id, **values, "created_at": now, "updated_at": now}
+            )
+    deleted_ids = [row_id for repo_id, (row_id, _) in existing.items() if repo_id not in incoming]
+
+    if inserts:
+        db.execute(insert(GithubRepo), inserts)
+    if updates:
+        db.execute(update(GithubRepo), updates)
+    for offset in range(0, len(deleted_ids), UPSERT_CHUNK_ROWS):
+        db.execute(
+            delete(GithubRepo)
+            .where(GithubRepo.id.in_(deleted_ids[offset : offset + UPSERT_CHUNK_ROWS]))
+            .execution_options(synchronize_session=False)
+        )
+
+    result.inserted = len(inserts)
+    result.updated = len(updates)
+    result.deleted = len(deleted_ids)
+    return result
+
+
+def _advance_event_watermark(
+    state: GithubSyncState, newest: Optional[dict], window_start: date, incremental: bool
+) -> None:
+    """根据本次拉取到的最新事件推进水位线"""
+    previous_event_at = state.last_event_at
+    if newest is not None:
+        if state.last_event_id is None or int(newest["id"]) > int(state.last_event_id):
+            state.last_event_id = str(newest["id"])
+            state.last_event_at = datetime.fromisoformat(
+                newest["created_at"].replace("Z", "+00:00")
+            ).replace(tzinfo=None)
+
+    if incremental:
+        return
+    # 全量拉取覆盖了 [window_start, 现在]；与上次覆盖区间相连时合并
+    contiguous = (
+        state.events_synced_from is not None
+        and previous_event_at is not None
+        and window_start <= previous_event_at.date()
+    )
+    if contiguous:
+        state.events_synced_from = min(state.events_synced_from, window_start)
+    else:
+        state.events_synced_from = window_start
+
+
+async def _accumulate_dates(
+    stats: DailyStatsAccumulator, key: str, pages: AsyncIterator[List[str]]
+) -> int:
+    """把逐页产出的 ISO 时间按日期累加到 stats 的 key 计数上，返回总条数"""
+    total = 0
+    async for page in pages:
+        stats.add_timestamps(key, page)
+        total += len(page)
+    return total
+
+
+# 每条 upsert 语句携带的行数，保持在 SQLite / PostgreSQL 的绑定参数上限以内
+UPSERT_CHUNK_ROWS = 1000
+
+
+def save_daily_stats(
+    db: Session, user_id: int, daily_stats: DailyStatsAccumulator
+) -> List[date]:
+    """
+    把每日统计批量 upsert 到 github_daily_stats，由调用方提交
+
+    以 (user_id, date) 唯一键做 INSERT ... ON CONFLICT DO UPDATE，
+    计数与库中完全相同的日期不会被改写；有日期变化时递增用户的统计数据版本，
+    重算这些日期所在的周 / 月 / 年汇总和连续活动区间，并修补本进程缓存的时间序列
+
+    Returns:
+        实际新增或变化的日期
+    """
+    now = datetime.utcnow()
+    rows = [
+        {"user_id": user_id, "date": stat_date, **stat_data, "created_at": now, "updated_at": now}
+        for stat_date, stat_data in sorted(daily_stats.items())
+    ]
+    insert = dialect_insert(db)
+    changed: List[date] = []
+    for offset in range(0, len(rows), UPSERT_CHUNK_ROWS):
+        stmt = insert(GithubDailyStat).values(rows[offset : offset + UPSERT_CHUNK_ROWS])
+        excluded = stmt.excluded
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[GithubDailyStat.user_id, GithubDailyStat.date],
+            set_={
+                **{key: excluded[key] for key in STAT_KEYS},
+                "updated_at": excluded.updated_at,
+            },
+            where=or_(
+                *(
+                    getattr(GithubDailyStat, key).is_distinct_from(excluded[key])
+                    for key in STAT_KEYS
+                )
+            ),
+        ).returning(GithubDailyStat.date)
+        changed.extend(stat_date for (stat_date,) in db.execute(stmt))
+    if changed:
+        version = bump_stats_version(db, user_id)
+        refresh_stat_rollups(db, user_id, changed)
+        refresh_activity_runs(db, user_id, changed)
+        by_date = {row["date"]: row for row in rows}
+        patch_daily_series(
+            user_id, version, ((day, [by_date[day][key] for key in STAT_KEYS]) for day in changed)
+        )
+    return changed
+
+
+def bump_stats_version(db: Session, user_id: int) -> int:
+    """
+    递增用户的统计数据版本，以旧版本为键缓存的查询响应随之失效；由调用方提交
+
+    Returns:
+        递增后的版本
+    """
+    get_sync_state(db, user_id)
+    return db.execute(
+        update(GithubSyncState)
+        .where(GithubSyncState.user_id == user_id)
+        .values(stats_version=GithubSyncState.stats_version + 1)
+        .returning(GithubSyncState.stats_version)
+        .execution_options(synchronize_session=False)
+    ).scalar_one()
+
+
+# 重新聚合时每攒够这么多事件整批分桶一次
+REAGGREGATE_BATCH_EVENTS = 20000
+
+
+def reaggregate_user_stats(
+    db: Session,
+    user_id: int,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+) -> int:
+    """
+    从事件归档重建用户的每日统计，不调用 GitHub API
+
+    只覆盖有归档的日期；没有归档的日期（如 deep 同步写入的历史）保持不变
+
+    Returns:
+        统计发生变化的天数
+    """
+    daily_stats = DailyStatsAccumulator()
+    batch: List[dict] = []
+    for _, events in iter_archived_events(db, user_id, start_date, end_date):
+        batch.extend(events)
+        if len(batch) >= REAGGREGATE_BATCH_EVENTS:
+            add_event_stats(daily_stats, batch)
+            batch = []
+    if batch:
+        add_event_stats(daily_stats, batch)
+
+    stats_updated = len(save_daily_stats(db, user_id, daily_stats))
+    db.commit()
+    return stats_updated
 
 
 async def sync_github_data(
     user: User,
-    db: Session,
+    db: AsyncSession,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     days: int = 90,
@@ -438,118 +692,196 @@ async def sync_github_data(
 
     Args:
         user: 用户对象
-        db: 数据库会话
+        db: 异步数据库会话；与同步调度、离线命令共用的写库函数经 run_sync 执行
         start_date: 同步的开始日期
         end_date: 同步的结束日期
         days: 未提供开始日期时默认回溯的天数
-        mode: standard（90 天事件）/ deep（任意时间段，使用搜索+GraphQL）
+        mode: standard（90 天事件）/ deep（任意时间段，默认使用搜索+GraphQL，
+            GITHUB_DEEP_ENGINE=contributions 时使用贡献日历）
 
     Returns:
-        (repos_count, stats_updated_count) - 仓库数和更新的统计记录数
+        (repos_count, stats_updated_count) - 仓库数和实际新增或变化的统计天数
 
     Raises:
         httpx.HTTPError: 如果 API 请求失败
     """
     github_token = user.github_access_token
+    state = await db.run_sync(get_sync_state, user.id)
+    # 结束事务，拉取 GitHub 数据期间不占用连接池中的连接，也不持有写锁
+    await db.commit()
+    now = datetime.utcnow()
+    # 在同步任务中执行时上报阶段进度
+    progress = current_progress()
 
-    # 第 1 步：获取仓库列表
-    repos = await fetch_user_repos(github_token)
+    def _phase(name: str) -> None:
+        if progress is not None:
+            progress.set_phase(name)
 
-    # 更新仓库信息
-    for repo_data in repos:
-        existing_repo = db.query(GithubRepo).filter(
-            GithubRepo.repo_id == repo_data["id"]
-        ).first()
-
-        if existing_repo:
-            # 更新现有仓库
-            existing_repo.name = repo_data["name"]
-            existing_repo.full_name = repo_data["full_name"]
-            existing_repo.private = repo_data["private"]
-            existing_repo.language = repo_data.get("language")
-            existing_repo.html_url = repo_data["html_url"]
-            existing_repo.description = repo_data.get("description")
-        else:
-            # 创建新仓库
-            new_repo = GithubRepo(
-                user_id=user.id,
-                repo_id=repo_data["id"],
-                name=repo_data["name"],
-                full_name=repo_data["full_name"],
-                private=repo_data["private"],
-                language=repo_data.get("language"),
-                html_url=repo_data["html_url"],
-                description=repo_data.get("description"),
-            )
-            db.add(new_repo)
+    def _count(key: str, value: int) -> None:
+        if progress is not None:
+            progress.set_count(key, value)
 
-    db.commit()
+    _phase("repos")
 
     def _log(msg: str):
         # print + flush 确保在容器/终端可见
         print(msg, file=sys.stdout, flush=True)
         logger.info(msg)
 
-    if mode == "deep":
-        username = await fetch_current_username(github_token)
+    # 第 1 步：获取仓库列表（standard 模式在间隔内复用上次结果，deep 模式需要 star 数）
+    repo_sync_due = (
+        mode == "deep"
+        or state.last_repo_sync_at is None
+        or now - state.last_repo_sync_at
+        >= timedelta(minutes=settings.GITHUB_REPO_SYNC_INTERVAL_MINUTES)
+    )
+    if repo_sync_due:
+        repos = await fetch_user_repos(github_token, user.id)
+
+        # 更新仓库信息：只写入新增、变化和已消失的仓库
+        repo_changes = await db.run_sync(sync_user_repos, user.id, repos)
+        _log(
+            f"[github_sync] repos inserted={repo_changes.inserted} updated={repo_changes.updated} "
+            f"deleted={repo_changes.deleted} unchanged={repo_changes.unchanged} "
+            f"skipped={repo_changes.skipped}"
+        )
+        for key in ("inserted", "updated", "deleted", "skipped"):
+            _count(f"repos_{key}", getattr(repo_changes, key))
+
+        state.last_repo_sync_at = now
+        await db.commit()
+        repos_count = repo_changes.total
+    else:
+        repos_count = await db.scalar(
+            select(func.count(GithubRepo.id)).where(GithubRepo.user_id == user.id)
+        )
+    _count("repos", repos_count)
+    _phase("fetch")
+
+    # 各数据源逐页累加到同一个按日计数器，原始数据用完即弃
+    daily_stats = DailyStatsAccumulator()
+
+    if mode == "deep" and settings.GITHUB_DEEP_ENGINE == "contributions":
+        username = await fetch_current_username(github_token, user.id)
+        _log(
+            f"[github_sync][deep][contributions] username={username} range={start_date}..{end_date}"
+        )
+        # 贡献日历提供 commit / PR / issue，star 仍由 stargazer 批量查询提供
+        contributions, star_total = await gather_all(
+            fetch_contribution_stats(
+                github_token, username, start_date, end_date, stats=daily_stats
+            ),
+            _accumulate_dates(
+                daily_stats,
+                "star_delta",
+                iter_repo_star_dates(github_token, repos, start_date, end_date),
+            ),
+        )
+        # 仓库数超过日历上限的窗口，commit 改走搜索路径
+        fallback_totals = await gather_all(
+            *(
+                _accumulate_dates(
+                    daily_stats,
+                    "commit_count",
+                    iter_commit_dates(github_token, username, window_start, window_end),
+                )
+                for window_start, window_end in contributions.commit_fallback_windows
+            )
+        )
+
+        _log(
+            f"[github_sync][deep][contributions] days={len(daily_stats)} "
+            f"fallback_windows={len(contributions.commit_fallback_windows)} "
+            f"fallback_commits={sum(fallback_totals)} stars={star_total}"
+        )
+        _phase("aggregate")
+    elif mode == "deep":
+        username = await fetch_current_username(github_token, user.id)
         _log(f"[github_sync][deep] username={username} range={start_date}..{end_date}")
-        commit_dates = await search_commits_by_range(github_token, username, start_date, end_date)
-        pr_dates = await search_issues_pr_by_range(github_token, username, start_date, end_date, True)
-        issue_dates = await search_issues_pr_by_range(
-            github_token, username, start_date, end_date, False
+        # 四个阶段并发执行，各阶段内部的范围分片 / 仓库再受各自的并发上限约束
+        commit_total, pr_total, issue_total, star_total = await gather_all(
+            _accumulate_dates(
+                daily_stats,
+                "commit_count",
+                iter_commit_dates(github_token, username, start_date, end_date),
+            ),
+            _accumulate_dates(
+                daily_stats,
+                "pr_count",
+                iter_issue_pr_dates(github_token, username, start_date, end_date, True),
+            ),
+            _accumulate_dates(
+                daily_stats,
+                "issue_count",
+                iter_issue_pr_dates(github_token, username, start_date, end_date, False),
+            ),
+            _accumulate_dates(
+                daily_stats,
+                "star_delta",
+                iter_repo_star_dates(github_token, repos, start_date, end_date),
+            ),
         )
-        star_dates = await fetch_repo_stars_delta(github_token, repos, start_date, end_date)
 
         _log(
-            f"[github_sync][deep] commits={len(commit_dates)} prs={len(pr_dates)} issues={len(issue_dates)} stars={len(star_dates)}"
+            f"[github_sync][deep] commits={commit_total} prs={pr_total} issues={issue_total} stars={star_total}"
         )
-        daily_stats = aggregate_deep_stats(commit_dates, pr_dates, issue_dates, star_dates)
+        _phase("aggregate")
     else:
         # 第 2 步：获取用户事件（仅近 90 天）
-        events = await fetch_user_events(
+        # 同步范围延伸到当前且水位线覆盖了起始日期时，只拉取水位线之后的新事件
+        reaches_now = end_date is None or end_date >= datetime.now(timezone.utc).date()
+        window_start = start_date or (now.date() - timedelta(days=days))
+        incremental = (
+            reaches_now
+            and state.last_event_id is not None
+            and state.events_synced_from is not None
+            and state.events_synced_from <= window_start
+        )
+        # 第 3 步：逐页聚合每日统计（增量模式下只包含受影响的日期）
+        # 同时把原始事件裁剪归档，供计数规则变化后离线重新聚合
+        archive = EventArchiveWriter(user.id) if settings.GITHUB_EVENT_ARCHIVE_ENABLED else None
+        event_types: collections.Counter = collections.Counter()
+        event_total = 0
+        first_event: Optional[dict] = None
+        newest_event: Optional[dict] = None
+        async for page in iter_user_events(
             github_token,
             start_date=start_date,
             end_date=end_date,
             days=days,
+            since_event_id=state.last_event_id if incremental else None,
+            user_id=user.id,
+        ):
+            add_event_stats(daily_stats, page)
+            if archive is not None:
+                await db.run_sync(archive.add, page)
+            event_types.update(e.get("type", "") for e in page)
+            event_total += len(page)
+            first_event = first_event or page[0]
+            page_newest = max(page, key=lambda e: int(e["id"]))
+            if newest_event is None or int(page_newest["id"]) > int(newest_event["id"]):
+                newest_event = page_newest
+            _count("events", event_total)
+
+        archived_days = await db.run_sync(archive.close) if archive is not None else 0
+        _log(
+            f"[github_sync] events total={event_total} incremental={incremental} "
+            f"archived_days={archived_days} types={dict(event_types)}"
         )
-        event_types = collections.Counter(e.get("type", "") for e in events)
-        first_event = events[0] if events else None
-        _log(f"[github_sync] events total={len(events)} types={dict(event_types)}")
         _log(f"[github_sync] first event={first_event}")
-
-        # 第 3 步：聚合每日统计
-        daily_stats = aggregate_daily_stats(events)
+        _phase("aggregate")
         _log(f"[github_sync] aggregated days={len(daily_stats)}")
 
-    # 第 4 步：更新数据库中的每日统计
-    stats_updated = 0
-    for stat_date, stat_data in daily_stats.items():
-        existing_stat = db.query(GithubDailyStat).filter(
-            GithubDailyStat.user_id == user.id,
-            GithubDailyStat.date == stat_date,
-        ).first()
-
-        if existing_stat:
-            # 更新现有统计
-            existing_stat.commit_count = stat_data["commit_count"]
-            existing_stat.pr_count = stat_data["pr_count"]
-            existing_stat.issue_count = stat_data["issue_count"]
-            existing_stat.star_delta = stat_data["star_delta"]
-        else:
-            # 创建新统计
-            new_stat = GithubDailyStat(
-                user_id=user.id,
-                date=stat_date,
-                commit_count=stat_data["commit_count"],
-                pr_count=stat_data["pr_count"],
-                issue_count=stat_data["issue_count"],
-                star_delta=stat_data["star_delta"],
-            )
-            db.add(new_stat)
+        if reaches_now:
+            _advance_event_watermark(state, newest_event, window_start, incremental)
 
-        stats_updated += 1
+    # 第 4 步：更新数据库中的每日统计
+    _phase("persist")
+    _count("days", len(daily_stats))
+    stats_updated = len(await db.run_sync(save_daily_stats, user.id, daily_stats))
 
-    db.commit()
+    state.last_synced_at = now
+    await db.commit()
 
-    return len(repos), stats_updated
+    return repos_count, stats_updated
 
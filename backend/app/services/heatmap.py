@@ -0,0 +1,43 @@
+"""
+热力图列式统计
+把一段日期内的每日统计铺成稠密的 int32 矩阵（每个计数字段一行，每天一列），
+无活动的日期补 0。客户端按下标即可定位日期，无需逐个对象重建，
+响应体只有按对象返回的每日统计的十分之一左右
+"""
+import base64
+from datetime import date
+from typing import Any, Dict, Iterable, Tuple
+
+import numpy as np
+
+from app.services.daily_stats import STAT_KEYS
+
+HEATMAP_ENCODING_JSON = "json"
+HEATMAP_ENCODING_BASE64 = "base64"
+
+
+def build_heatmap(
+    rows: Iterable[Tuple], start_date: date, end_date: date, encoding: str
+) -> Dict[str, Any]:
+    """
+    构造与 GithubHeatmapResponse 结构相同的 dict
+
+    Args:
+        rows: (date, commit_count, pr_count, issue_count, star_delta) 行
+        encoding: json 返回整数数组；base64 返回小端 int32 数组的 Base64 字符串
+    """
+    days = (end_date - start_date).days + 1
+    matrix = np.zeros((len(STAT_KEYS), days), dtype="<i4")
+    for day, *counts in rows:
+        matrix[:, (day - start_date).days] = [value or 0 for value in counts]
+
+    if encoding == HEATMAP_ENCODING_BASE64:
+        columns = [base64.b64encode(row.tobytes()).decode("ascii") for row in matrix]
+    else:
+        columns = matrix.tolist()
+    return {
+        "start_date": start_date,
+        "days": days,
+        "encoding": encoding,
+        **dict(zip(STAT_KEYS, columns)),
+    }
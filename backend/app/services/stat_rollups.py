@@ -0,0 +1,144 @@
+"""
+周 / 月 / 年统计汇总
+每日统计写入后，只重算变化日期所在的周期：周和月由这些周期内的每日统计求和，
+年由当年的月汇总求和（至多 12 行），不需要扫描全部历史
+"""
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Sequence, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db.dialects import dialect_insert
+from app.models import GithubDailyStat, GithubStatRollup
+from app.models.github_stat_rollup import ROLLUP_MONTH, ROLLUP_WEEK, ROLLUP_YEAR
+from app.services.daily_stats import STAT_KEYS, is_active_day
+
+# 汇总行的计数字段：每日计数之和 + 活跃天数（见 is_active_day）
+ROLLUP_KEYS = STAT_KEYS + ("active_days",)
+# 每条 upsert 语句携带的行数
+ROLLUP_UPSERT_CHUNK_ROWS = 1000
+
+
+def period_start(day: date, granularity: str) -> date:
+    """day 所在周期的第一天（周从周一开始）"""
+    if granularity == ROLLUP_WEEK:
+        return day - timedelta(days=day.weekday())
+    if granularity == ROLLUP_MONTH:
+        return day.replace(day=1)
+    if granularity == ROLLUP_YEAR:
+        return date(day.year, 1, 1)
+    raise ValueError(f"unknown rollup granularity: {granularity}")
+
+
+def period_end(start: date, granularity: str) -> date:
+    """周期的最后一天（含）"""
+    if granularity == ROLLUP_WEEK:
+        return start + timedelta(days=6)
+    if granularity == ROLLUP_MONTH:
+        next_month = (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+        return next_month - timedelta(days=1)
+    if granularity == ROLLUP_YEAR:
+        return date(start.year, 12, 31)
+    raise ValueError(f"unknown rollup granularity: {granularity}")
+
+
+def _sum_days(
+    rows: Iterable[Tuple], granularity: str, periods: Set[date]
+) -> Dict[date, List[int]]:
+    """把 (date, 计数...) 行按周期求和，只保留 periods 中的周期"""
+    totals: Dict[date, List[int]] = {start: [0] * len(ROLLUP_KEYS) for start in periods}
+    for day, *counts in rows:
+        counters = totals.get(period_start(day, granularity))
+        if counters is None:
+            continue
+        for index, value in enumerate(counts):
+            counters[index] += value or 0
+        if is_active_day(counts):
+            counters[-1] += 1
+    return totals
+
+
+def _upsert(
+    db: Session, user_id: int, granularity: str, totals: Dict[date, List[int]], now: datetime
+) -> None:
+    insert = dialect_insert(db)
+    rows = [
+        {
+            "user_id": user_id,
+            "granularity": granularity,
+            "period_start": start,
+            **dict(zip(ROLLUP_KEYS, counters)),
+            "updated_at": now,
+        }
+        for start, counters in sorted(totals.items())
+    ]
+    for offset in range(0, len(rows), ROLLUP_UPSERT_CHUNK_ROWS):
+        stmt = insert(GithubStatRollup).values(rows[offset : offset + ROLLUP_UPSERT_CHUNK_ROWS])
+        excluded = stmt.excluded
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[
+                    GithubStatRollup.user_id,
+                    GithubStatRollup.granularity,
+                    GithubStatRollup.period_start,
+                ],
+                set_={
+                    **{key: excluded[key] for key in ROLLUP_KEYS},
+                    "updated_at": excluded.updated_at,
+                },
+            )
+        )
+
+
+def refresh_stat_rollups(db: Session, user_id: int, changed_days: Sequence[date]) -> int:
+    """
+    重算 changed_days 所在的周、月、年汇总，由调用方提交
+
+    Returns:
+        写入的汇总行数
+    """
+    if not changed_days:
+        return 0
+    now = datetime.utcnow()
+    weeks = {period_start(day, ROLLUP_WEEK) for day in changed_days}
+    months = {period_start(day, ROLLUP_MONTH) for day in changed_days}
+
+    # 一次取出覆盖这些周和月的每日统计
+    low = min(min(weeks), min(months))
+    high = max(period_end(max(weeks), ROLLUP_WEEK), period_end(max(months), ROLLUP_MONTH))
+    rows = db.execute(
+        select(GithubDailyStat.date, *(getattr(GithubDailyStat, key) for key in STAT_KEYS))
+        .where(
+            GithubDailyStat.user_id == user_id,
+            GithubDailyStat.date >= low,
+            GithubDailyStat.date <= high,
+        )
+    ).all()
+    week_totals = _sum_days(rows, ROLLUP_WEEK, weeks)
+    month_totals = _sum_days(rows, ROLLUP_MONTH, months)
+    _upsert(db, user_id, ROLLUP_WEEK, week_totals, now)
+    _upsert(db, user_id, ROLLUP_MONTH, month_totals, now)
+
+    # 年汇总由当年已更新的月汇总求和
+    years = {period_start(day, ROLLUP_YEAR) for day in changed_days}
+    month_rows = db.execute(
+        select(
+            GithubStatRollup.period_start,
+            *(getattr(GithubStatRollup, key) for key in ROLLUP_KEYS),
+        ).where(
+            GithubStatRollup.user_id == user_id,
+            GithubStatRollup.granularity == ROLLUP_MONTH,
+            GithubStatRollup.period_start >= min(years),
+            GithubStatRollup.period_start <= period_end(max(years), ROLLUP_YEAR),
+        )
+    ).all()
+    year_totals: Dict[date, List[int]] = {start: [0] * len(ROLLUP_KEYS) for start in years}
+    for month_start, *counts in month_rows:
+        counters = year_totals.get(period_start(month_start, ROLLUP_YEAR))
+        if counters is not None:
+            for index, value in enumerate(counts):
+                counters[index] += value
+    _upsert(db, user_id, ROLLUP_YEAR, year_totals, now)
+
+    return len(week_totals) + len(month_totals) + len(year_totals)
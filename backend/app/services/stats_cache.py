@@ -0,0 +1,63 @@
+"""
+统计查询响应缓存
+统计数据只在同步写入时变化（每次写入递增 GithubSyncState.stats_version），
+因此按 (用户, 查询, 数据版本) 缓存序列化好的响应体及其强 ETag：
+重复的仪表盘加载既不查询统计表也不重新编码 JSON，浏览器带 If-None-Match 时直接返回 304。
+版本变化后旧条目不再命中，按 LRU 自然淘汰
+"""
+import hashlib
+from dataclasses import dataclass
+from typing import Hashable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models import GithubSyncState
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """序列化好的 JSON 响应体及其强 ETag"""
+
+    body: bytes
+    etag: str
+
+
+_responses: TTLCache[tuple, CachedResponse] = TTLCache(
+    settings.STATS_RESPONSE_CACHE_MAX_ENTRIES, settings.STATS_RESPONSE_CACHE_TTL_SECONDS
+)
+
+
+async def load_stats_version(db: AsyncSession, user_id: int) -> int:
+    """
+    读取用户当前的统计数据版本
+
+    须在查询统计数据之前读取：两者之间若有同步提交，新数据只会缓存在旧版本键下，不会反过来
+    """
+    version = await db.scalar(
+        select(GithubSyncState.stats_version).where(GithubSyncState.user_id == user_id)
+    )
+    return version or 0
+
+
+def get_response(user_id: int, version: int, query: Hashable) -> Optional[CachedResponse]:
+    return _responses.get((user_id, version, query))
+
+
+def store_response(user_id: int, version: int, query: Hashable, body: bytes) -> CachedResponse:
+    entry = CachedResponse(body=body, etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"')
+    _responses.set((user_id, version, query), entry)
+    return entry
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """按 If-None-Match 的弱比较规则判断客户端缓存是否仍然有效"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
@@ -0,0 +1,141 @@
+"""
+连续活动与空闲间隔
+每段连续活跃的日期（见 is_active_day：commit、PR、issue 任一不为 0，收到的 star 不算）
+存为一行 GithubActivityRun。每日统计写入后，
+只重算与变化日期相交或相邻的区间：取出这些区间覆盖范围内的活动日期重新切分，
+不需要扫描全部历史。连续天数、空闲间隔都由区间端点算出，十年的数据也只有至多千余行
+"""
+import heapq
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from app.models import GithubActivityRun, GithubDailyStat
+from app.services.daily_stats import STAT_KEYS, is_active_day
+
+Run = Tuple[date, date]
+
+
+def split_runs(active_days: Iterable[date]) -> List[Run]:
+    """把升序的活动日期切分为连续区间 (开始, 结束)"""
+    runs: List[Run] = []
+    for day in active_days:
+        if runs and day - runs[-1][1] == timedelta(days=1):
+            runs[-1] = (runs[-1][0], day)
+        else:
+            runs.append((day, day))
+    return runs
+
+
+def refresh_activity_runs(db: Session, user_id: int, changed_days: Sequence[date]) -> int:
+    """
+    重算 changed_days 涉及的连续活动区间，由调用方提交
+
+    Returns:
+        重算后该范围内的区间数
+    """
+    if not changed_days:
+        return 0
+    low, high = min(changed_days), max(changed_days)
+    # 与变化范围相交或紧邻的区间可能被合并或拆分，一并重算
+    touching = db.execute(
+        select(
+            GithubActivityRun.id, GithubActivityRun.start_date, GithubActivityRun.end_date
+        ).where(
+            GithubActivityRun.user_id == user_id,
+            GithubActivityRun.end_date >= low - timedelta(days=1),
+            GithubActivityRun.start_date <= high + timedelta(days=1),
+        )
+    ).all()
+    if touching:
+        low = min(low, min(start for _, start, _ in touching))
+        high = max(high, max(end for _, _, end in touching))
+
+    rows = db.execute(
+        select(GithubDailyStat.date, *(getattr(GithubDailyStat, key) for key in STAT_KEYS))
+        .where(
+            GithubDailyStat.user_id == user_id,
+            GithubDailyStat.date >= low,
+            GithubDailyStat.date <= high,
+        )
+        .order_by(GithubDailyStat.date)
+    ).all()
+    runs = split_runs(day for day, *counts in rows if is_active_day(counts))
+
+    if touching:
+        db.execute(
+            delete(GithubActivityRun).where(
+                GithubActivityRun.id.in_([run_id for run_id, _, _ in touching])
+            )
+        )
+    if runs:
+        now = datetime.utcnow()
+        db.execute(
+            insert(GithubActivityRun),
+            [
+                {"user_id": user_id, "start_date": start, "end_date": end, "updated_at": now}
+                for start, end in runs
+            ],
+        )
+    return len(runs)
+
+
+def _period(run: Optional[Run]) -> Optional[Dict[str, Any]]:
+    if run is None:
+        return None
+    start, end = run
+    return {"start_date": start, "end_date": end, "days": (end - start).days + 1}
+
+
+def summarize_runs(
+    runs: Sequence[Run], today: date, min_gap_days: int, limit: int
+) -> Dict[str, Any]:
+    """
+    由按开始日期升序的区间计算连续活动和空闲间隔
+
+    今天尚无活动时，截至昨天的连续活动仍算作当前连续；否则从最后一次活动的次日到今天
+    为当前的空闲间隔，参与最长间隔的比较
+
+    Args:
+        min_gap_days: 列出的空闲间隔的最少天数
+        limit: 列出的连续活动和空闲间隔的条数上限
+    """
+    gaps = [
+        (previous_end + timedelta(days=1), start - timedelta(days=1))
+        for (_, previous_end), (start, _) in zip(runs, runs[1:])
+    ]
+    current_streak: Optional[Run] = None
+    current_gap: Optional[Run] = None
+    if runs:
+        last_start, last_end = runs[-1]
+        if last_end >= today - timedelta(days=1):
+            current_streak = (last_start, last_end)
+        else:
+            current_gap = (last_end + timedelta(days=1), today)
+            gaps.append(current_gap)
+
+    # 天数相同时取较近的一段
+    def by_length(run: Run) -> Tuple[int, date]:
+        return (run[1] - run[0]).days, run[0]
+
+    longest_streaks = heapq.nlargest(limit, runs, key=by_length)
+    longest_gaps = heapq.nlargest(
+        limit,
+        (gap for gap in gaps if (gap[1] - gap[0]).days + 1 >= min_gap_days),
+        key=by_length,
+    )
+    longest_streak = max(runs, key=by_length, default=None)
+    longest_gap = max(gaps, key=by_length, default=None)
+    return {
+        "active_days": sum((end - start).days + 1 for start, end in runs),
+        "first_active_date": runs[0][0] if runs else None,
+        "last_active_date": runs[-1][1] if runs else None,
+        "current_streak": _period(current_streak),
+        "longest_streak": _period(longest_streak),
+        "current_gap": _period(current_gap),
+        "longest_gap": _period(longest_gap),
+        "streaks": [_period(run) for run in longest_streaks],
+        "gaps": [_period(gap) for gap in longest_gaps],
+    }
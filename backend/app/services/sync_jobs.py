@@ -0,0 +1,422 @@
+"""
+GitHub 同步任务
+POST /github/sync 只负责入队并立即返回任务 ID；
+执行方（API 进程内或独立 worker）通过租约领取任务，执行期间定期续约、
+把阶段进度写入 github_sync_jobs 并检查取消请求。
+执行方失联时租约过期，任务可被其他执行方重新领取
+"""
+import asyncio
+import copy
+import logging
+import os
+import socket
+import uuid
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.dialects import dialect_insert
+from app.db.session import AsyncSessionLocal
+from app.models import GithubSyncJob, GithubSyncState, User
+from app.models.github_sync_job import (
+    SYNC_JOB_ACTIVE_STATUSES,
+    SYNC_JOB_ACTIVE_WHERE,
+    SYNC_JOB_CANCELLED,
+    SYNC_JOB_FAILED,
+    SYNC_JOB_PENDING,
+    SYNC_JOB_RUNNING,
+    SYNC_JOB_SUCCEEDED,
+)
+from app.services.github_ratelimit import RateLimitExceeded
+from app.services.github_sync import sync_github_data
+from app.services.sync_progress import SyncProgress, track_progress
+
+logger = logging.getLogger(__name__)
+
+# 本进程作为租约持有者的标识
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+# 本进程内正在执行的任务：job_id -> asyncio.Task
+_running_tasks: Dict[int, asyncio.Task] = {}
+
+
+def enqueue_sync_job(
+    db: Session, user_id: int, start_date: date, end_date: date, mode: str
+) -> GithubSyncJob:
+    """
+    创建同步任务
+
+    同一用户同一时间只允许一个进行中的任务，已有进行中的任务时直接返回该任务。
+    由部分唯一索引 uq_github_sync_jobs_user_active 保证：并发入队时只有一个 INSERT 生效，
+    其余 ON CONFLICT DO NOTHING 后取回已有的任务
+    """
+    insert = dialect_insert(db)
+    while True:
+        job_id = db.execute(
+            insert(GithubSyncJob)
+            .values(
+                user_id=user_id,
+                mode=mode,
+                from_date=start_date,
+                to_date=end_date,
+                status=SYNC_JOB_PENDING,
+                cancel_requested=False,
+            )
+            .on_conflict_do_nothing(index_elements=["user_id"], index_where=SYNC_JOB_ACTIVE_WHERE)
+            .returning(GithubSyncJob.id)
+        ).scalar()
+        if job_id is None:
+            job_id = db.execute(
+                select(GithubSyncJob.id).where(
+                    GithubSyncJob.user_id == user_id,
+                    GithubSyncJob.status.in_(SYNC_JOB_ACTIVE_STATUSES),
+                )
+            ).scalar()
+        db.commit()
+        if job_id is not None:
+            return db.get(GithubSyncJob, job_id)
+        # 冲突的任务在两条语句之间已结束，重新入队
+
+
+def _lease_expiry(now: datetime) -> datetime:
+    return now + timedelta(seconds=settings.SYNC_JOB_LEASE_SECONDS)
+
+
+def _claimable(now: datetime):
+    """待执行，或执行中但租约已过期（执行方失联）的任务"""
+    return or_(
+        GithubSyncJob.status == SYNC_JOB_PENDING,
+        and_(
+            GithubSyncJob.status == SYNC_JOB_RUNNING,
+            or_(GithubSyncJob.lease_expires_at.is_(None), GithubSyncJob.lease_expires_at < now),
+        ),
+    )
+
+
+def claim_sync_job(db: Session, owner: str, job_id: Optional[int] = None) -> Optional[int]:
+    """
+    领取一个可执行的任务（指定 job_id 时只尝试该任务）
+
+    候选行在 PostgreSQL 上以 FOR UPDATE SKIP LOCKED 选出，
+    再以带条件的 UPDATE 比较并设置状态，只有一个执行方能领取成功。
+    同一用户不会被两个执行方同时处理：部分唯一索引 uq_github_sync_jobs_user_active
+    保证每个用户至多一个待执行或执行中的任务，领取只会在这一行上竞争，
+    不依赖看不到其他事务未提交领取的存在性检查
+
+    Returns:
+        领取到的任务 ID，没有可领取的任务时返回 None
+    """
+    now = datetime.utcnow()
+    query = db.query(GithubSyncJob.id).filter(_claimable(now))
+    if job_id is not None:
+        query = query.filter(GithubSyncJob.id == job_id)
+    candidate_ids = [
+        candidate_id
+        for (candidate_id,) in query.order_by(GithubSyncJob.created_at, GithubSyncJob.id)
+        .limit(5)
+        .with_for_update(skip_locked=True)
+        .all()
+    ]
+
+    for candidate_id in candidate_ids:
+        result = db.execute(
+            update(GithubSyncJob)
+            .where(GithubSyncJob.id == candidate_id, _claimable(now))
+            .values(
+                status=SYNC_JOB_RUNNING,
+                lease_owner=owner,
+                lease_expires_at=_lease_expiry(now),
+                heartbeat_at=now,
+                started_at=func.coalesce(GithubSyncJob.started_at, now),
+                attempts=GithubSyncJob.attempts + 1,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 1:
+            db.commit()
+            return candidate_id
+    db.commit()
+    return None
+
+
+def recoverable_job_ids(db: Session) -> List[int]:
+    """尚未被领取或租约已过期的任务 ID"""
+    now = datetime.utcnow()
+    return [
+        job_id
+        for (job_id,) in db.query(GithubSyncJob.id)
+        .filter(_claimable(now))
+        .order_by(GithubSyncJob.created_at, GithubSyncJob.id)
+        .all()
+    ]
+
+
+async def claim_next_job(job_id: Optional[int] = None) -> Optional[int]:
+    """以本进程身份（WORKER_ID）领取任务，自行管理会话"""
+    async with AsyncSessionLocal() as db:
+        return await db.run_sync(claim_sync_job, WORKER_ID, job_id)
+
+
+async def _claim_and_run(job_id: int) -> None:
+    if await claim_next_job(job_id) == job_id:
+        await run_sync_job(job_id, WORKER_ID)
+
+
+def start_sync_job(job_id: int) -> None:
+    """
+    在当前事件循环中后台领取并执行任务
+
+    SYNC_EXECUTION_MODE 为 worker 时任务交由独立 worker 领取，这里不做任何事
+    """
+    if settings.SYNC_EXECUTION_MODE != "inline" or job_id in _running_tasks:
+        return
+    task = asyncio.create_task(_claim_and_run(job_id))
+    _running_tasks[job_id] = task
+    task.add_done_callback(lambda _: _running_tasks.pop(job_id, None))
+
+
+def request_cancel(db: Session, job: GithubSyncJob) -> GithubSyncJob:
+    """
+    请求取消任务
+
+    未开始的任务直接标记为已取消；执行中的任务设置取消标记，
+    在本进程内执行时立即中断，否则由执行方在下一次续约时中断
+    """
+    if job.status not in SYNC_JOB_ACTIVE_STATUSES:
+        return job
+
+    if job.status == SYNC_JOB_PENDING:
+        job.status = SYNC_JOB_CANCELLED
+        job.finished_at = datetime.utcnow()
+    job.cancel_requested = True
+    db.commit()
+    db.refresh(job)
+
+    task = _running_tasks.get(job.id)
+    if task is not None:
+        task.cancel()
+    return job
+
+
+async def shutdown_sync_jobs() -> None:
+    """应用关闭时中断本进程内仍在执行的任务，未被请求取消的任务交还给其他执行方"""
+    tasks = list(_running_tasks.values())
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def _heartbeat(
+    job_id: int, owner: str, phase: Optional[str], data: Optional[dict]
+) -> Tuple[bool, bool]:
+    """
+    续约并持久化进度（data 为 None 时只续约）
+
+    Returns:
+        (是否仍持有租约, 任务是否已被请求取消)
+    """
+    async with AsyncSessionLocal() as db:
+        now = datetime.utcnow()
+        values = {"lease_expires_at": _lease_expiry(now), "heartbeat_at": now}
+        if data is not None:
+            values.update(phase=phase, progress=data)
+        result = await db.execute(
+            update(GithubSyncJob)
+            .where(
+                GithubSyncJob.id == job_id,
+                GithubSyncJob.lease_owner == owner,
+                GithubSyncJob.status == SYNC_JOB_RUNNING,
+            )
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        if result.rowcount != 1:
+            return False, False
+        cancel_requested = await db.scalar(
+            select(GithubSyncJob.cancel_requested).where(GithubSyncJob.id == job_id)
+        )
+        return True, bool(cancel_requested)
+
+
+async def _cancel_requested(job_id: int) -> bool:
+    async with AsyncSessionLocal() as db:
+        job = await db.get(GithubSyncJob, job_id)
+        return job is None or bool(job.cancel_requested)
+
+
+async def _owned_job(db: AsyncSession, job_id: int, owner: str) -> Optional[GithubSyncJob]:
+    job = await db.get(GithubSyncJob, job_id)
+    if job is None or job.lease_owner != owner:
+        return None
+    return job
+
+
+async def _release_job(job_id: int, owner: str) -> None:
+    """交还任务：回到待执行状态，本次领取不计入重试次数"""
+    async with AsyncSessionLocal() as db:
+        job = await _owned_job(db, job_id, owner)
+        if job is None or job.status != SYNC_JOB_RUNNING:
+            return
+        job.status = SYNC_JOB_PENDING
+        job.lease_owner = None
+        job.lease_expires_at = None
+        job.attempts = max((job.attempts or 1) - 1, 0)
+        await db.commit()
+
+
+async def _finish_job(
+    job_id: int,
+    owner: str,
+    status: str,
+    progress: SyncProgress,
+    repos_count: Optional[int] = None,
+    stats_updated: Optional[int] = None,
+    error: Optional[str] = None,
+) -> None:
+    async with AsyncSessionLocal() as db:
+        job = await _owned_job(db, job_id, owner)
+        if job is None:
+            return
+        job.status = status
+        job.lease_expires_at = None
+        job.phase = progress.phase
+        job.progress = copy.deepcopy(progress.as_dict())
+        job.repos_count = repos_count
+        job.stats_updated = stats_updated
+        job.error = error
+        job.finished_at = datetime.utcnow()
+        await db.commit()
+
+
+async def _defer_next_sync(job_id: int, delay: float) -> None:
+    """配额用尽时把该用户的下一次自动同步推迟到配额重置之后"""
+    async with AsyncSessionLocal() as db:
+        user_id = await db.scalar(select(GithubSyncJob.user_id).where(GithubSyncJob.id == job_id))
+        if user_id is None:
+            return
+        next_sync_at = datetime.utcnow() + timedelta(seconds=delay)
+        await db.execute(
+            update(GithubSyncState)
+            .where(
+                GithubSyncState.user_id == user_id,
+                or_(
+                    GithubSyncState.next_sync_at.is_(None),
+                    GithubSyncState.next_sync_at < next_sync_at,
+                ),
+            )
+            .values(next_sync_at=next_sync_at)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+
+
+async def _cancel_and_wait(task: asyncio.Future) -> None:
+    """取消 task 并等待其完全退出；等待期间当前协程再次被取消也继续等待"""
+    task.cancel()
+    while not task.done():
+        try:
+            await asyncio.wait({task})
+        except asyncio.CancelledError:
+            continue
+
+
+async def run_sync_job(job_id: int, owner: str) -> None:
+    """
+    执行一个已由 owner 领取的同步任务
+
+    同步本身在子任务中运行；当前协程每隔 SYNC_JOB_PROGRESS_INTERVAL 秒
+    续约并持久化一次进度，发现取消标记时中断子任务，租约被他人接管时直接放弃。
+    协程被外部取消（如进程退出）且用户未请求取消时，任务交还给其他执行方。
+    GitHub 配额用尽（RateLimitExceeded）时任务以失败结束并注明原因，
+    该用户的下一次自动同步推迟到配额重置之后
+    """
+    db = AsyncSessionLocal()
+    progress = SyncProgress()
+    try:
+        job = await db.get(GithubSyncJob, job_id)
+        if job is None or job.status != SYNC_JOB_RUNNING or job.lease_owner != owner:
+            return
+        if job.cancel_requested:
+            await _finish_job(job_id, owner, SYNC_JOB_CANCELLED, progress, error="任务已取消")
+            return
+        if job.attempts > settings.SYNC_JOB_MAX_ATTEMPTS:
+            await _finish_job(
+                job_id, owner, SYNC_JOB_FAILED, progress, error="执行方多次中断，任务已放弃"
+            )
+            return
+
+        user = await db.get(User, job.user_id)
+        start_date, end_date, mode = job.from_date, job.to_date, job.mode
+
+        async def _sync():
+            with track_progress(progress):
+                return await sync_github_data(
+                    user,
+                    db,
+                    start_date=start_date,
+                    end_date=end_date,
+                    days=(end_date - start_date).days + 1,
+                    mode=mode,
+                )
+
+        sync_task = asyncio.ensure_future(_sync())
+        written_version = -1
+        try:
+            while not sync_task.done():
+                await asyncio.wait({sync_task}, timeout=settings.SYNC_JOB_PROGRESS_INTERVAL)
+                if sync_task.done():
+                    break
+                snapshot = None
+                if progress.version != written_version:
+                    written_version = progress.version
+                    # 取快照，避免写库期间同步协程继续修改字典
+                    snapshot = copy.deepcopy(progress.as_dict())
+                still_owner, cancel_requested = await _heartbeat(
+                    job_id, owner, progress.phase, snapshot
+                )
+                if not still_owner:
+                    logger.warning("sync job %s lease lost, abandoning", job_id)
+                    await _cancel_and_wait(sync_task)
+                    await db.rollback()
+                    return
+                if cancel_requested:
+                    sync_task.cancel()
+                    break
+            repos_count, stats_updated = await sync_task
+        except BaseException:
+            # 子任务与当前协程共用同一个会话，须等它完全退出后才能回滚和收尾
+            await _cancel_and_wait(sync_task)
+            raise
+
+        await _finish_job(
+            job_id,
+            owner,
+            SYNC_JOB_SUCCEEDED,
+            progress,
+            repos_count=repos_count,
+            stats_updated=stats_updated,
+        )
+    except asyncio.CancelledError:
+        await db.rollback()
+        if await _cancel_requested(job_id):
+            await _finish_job(job_id, owner, SYNC_JOB_CANCELLED, progress, error="任务已取消")
+        else:
+            await _release_job(job_id, owner)
+    except RateLimitExceeded as e:
+        logger.warning("sync job %s stopped by rate limit: %s", job_id, e)
+        await db.rollback()
+        await _defer_next_sync(job_id, e.retry_after)
+        await _finish_job(
+            job_id, owner, SYNC_JOB_FAILED, progress, error=f"{e}，将在配额重置后自动重新同步"
+        )
+    except Exception as e:
+        logger.exception("sync job %s failed", job_id)
+        await db.rollback()
+        await _finish_job(job_id, owner, SYNC_JOB_FAILED, progress, error=str(e))
+    finally:
+        await db.close()
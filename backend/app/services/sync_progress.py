@@ -0,0 +1,64 @@
+"""
+同步进度跟踪
+通过 contextvar 在一次同步的所有协程（含并发分片）之间共享进度对象，
+同步服务和调度器无需逐层传参即可上报阶段与分片进度
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
+
+
+class SyncProgress:
+    """
+    一次同步的进度：当前阶段、各阶段分片完成情况和计数
+
+    只在内存中累计，由任务执行方定期读取并持久化；version 在每次变化时递增
+    """
+
+    def __init__(self) -> None:
+        self.phase: Optional[str] = None
+        self.chunks: Dict[str, Dict[str, int]] = {}
+        self.counts: Dict[str, int] = {}
+        self.version = 0
+
+    def set_phase(self, phase: str) -> None:
+        self.phase = phase
+        self._notify()
+
+    def add_chunks(self, label: str, total: int) -> None:
+        entry = self.chunks.setdefault(label, {"done": 0, "total": 0})
+        entry["total"] += total
+        self._notify()
+
+    def chunk_done(self, label: str) -> None:
+        entry = self.chunks.setdefault(label, {"done": 0, "total": 0})
+        entry["done"] += 1
+        self._notify()
+
+    def set_count(self, key: str, value: int) -> None:
+        self.counts[key] = value
+        self._notify()
+
+    def as_dict(self) -> dict:
+        return {"chunks": self.chunks, "counts": self.counts}
+
+    def _notify(self) -> None:
+        self.version += 1
+
+
+_current_progress: ContextVar[Optional[SyncProgress]] = ContextVar("sync_progress", default=None)
+
+
+def current_progress() -> Optional[SyncProgress]:
+    """当前同步上下文中的进度对象（不在任务中执行时为 None）"""
+    return _current_progress.get()
+
+
+@contextmanager
+def track_progress(progress: SyncProgress) -> Iterator[SyncProgress]:
+    """在该上下文内启动的同步（及其派生的协程）都向 progress 上报"""
+    token = _current_progress.set(progress)
+    try:
+        yield progress
+    finally:
+        _current_progress.reset(token)
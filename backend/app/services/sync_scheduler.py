@@ -0,0 +1,204 @@
+"""
+自动同步调度
+按用户近期在 GithubDailyStat 中的活跃程度自适应决定同步频率：
+活跃用户几分钟一次，沉寂用户一天一次；
+计划时间带随机抖动互相错开，并受全局并发上限约束，避免整点集中请求。
+每个 API 进程都会启动调度循环，每轮调度先取得数据库锁，同一时刻只有一个进程执行；
+调度的同时清理长期未使用的 GitHub 条件请求缓存
+"""
+import asyncio
+import logging
+import random
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterator, List, Optional
+
+from sqlalchemy import func, or_, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal, engine
+from app.models import GithubDailyStat, GithubSyncJob, GithubSyncState, User
+from app.models.github_sync_job import SYNC_JOB_ACTIVE_STATUSES, SYNC_JOB_PENDING
+from app.services.daily_stats import ACTIVITY_KEYS
+from app.services.github_cache import prune_http_cache
+from app.services.github_sync import get_sync_state
+from app.services.sync_jobs import enqueue_sync_job, recoverable_job_ids, start_sync_job
+
+logger = logging.getLogger(__name__)
+
+# standard 模式自动同步回溯的天数
+AUTO_SYNC_WINDOW_DAYS = 90
+# 调度锁（PostgreSQL advisory lock）的键
+SCHEDULER_LOCK_KEY = 0x4445564F
+
+_scheduler_task: Optional[asyncio.Task] = None
+
+
+def sync_interval(last_active: Optional[date], today: date) -> timedelta:
+    """根据最近一次有活动的日期决定同步间隔"""
+    if last_active is None:
+        return timedelta(minutes=settings.AUTO_SYNC_DORMANT_MINUTES)
+    idle_days = (today - last_active).days
+    if idle_days <= settings.AUTO_SYNC_HOT_IDLE_DAYS:
+        return timedelta(minutes=settings.AUTO_SYNC_HOT_MINUTES)
+    if idle_days <= settings.AUTO_SYNC_WARM_IDLE_DAYS:
+        return timedelta(minutes=settings.AUTO_SYNC_WARM_MINUTES)
+    if idle_days <= settings.AUTO_SYNC_COOL_IDLE_DAYS:
+        return timedelta(minutes=settings.AUTO_SYNC_COOL_MINUTES)
+    return timedelta(minutes=settings.AUTO_SYNC_DORMANT_MINUTES)
+
+
+def _jittered(interval: timedelta) -> timedelta:
+    jitter = settings.AUTO_SYNC_JITTER
+    return interval * random.uniform(1 - jitter, 1 + jitter)
+
+
+def _last_active_dates(db: Session, user_ids: List[int]) -> Dict[int, date]:
+    """一次查询取出每个用户最近一次有活动的日期"""
+    if not user_ids:
+        return {}
+    # 与 is_active_day 一致：commit、PR、issue 任一不为 0，收到的 star 不算
+    has_activity = or_(*(getattr(GithubDailyStat, key) != 0 for key in ACTIVITY_KEYS))
+    rows = (
+        db.query(GithubDailyStat.user_id, func.max(GithubDailyStat.date))
+        .filter(GithubDailyStat.user_id.in_(user_ids), has_activity)
+        .group_by(GithubDailyStat.user_id)
+        .all()
+    )
+    return {user_id: last_active for user_id, last_active in rows}
+
+
+def schedule_due_syncs(db: Session, now: Optional[datetime] = None) -> List[int]:
+    """
+    执行一次调度
+
+    为尚未排期的用户分配一个随机错开的首次同步时间，
+    再在全局并发上限内为到期用户创建 standard 同步任务并排定下一次时间
+
+    Returns:
+        新创建、需要启动的任务 ID
+    """
+    now = now or datetime.utcnow()
+    today = now.date()
+
+    # 1. 新用户：首次同步时间在一个同步间隔内随机分布
+    unscheduled_ids = [
+        user_id
+        for (user_id,) in db.query(User.id)
+        .outerjoin(GithubSyncState, GithubSyncState.user_id == User.id)
+        .filter(or_(GithubSyncState.id.is_(None), GithubSyncState.next_sync_at.is_(None)))
+        .all()
+    ]
+    last_active = _last_active_dates(db, unscheduled_ids)
+    for user_id in unscheduled_ids:
+        state = get_sync_state(db, user_id)
+        interval = sync_interval(last_active.get(user_id), today)
+        state.next_sync_at = now + interval * random.random()
+    db.commit()
+
+    # 2. 全局并发上限：进行中的任务（含手动触发）占用名额
+    active_jobs = (
+        db.query(func.count(GithubSyncJob.id))
+        .filter(GithubSyncJob.status.in_(SYNC_JOB_ACTIVE_STATUSES))
+        .scalar()
+    )
+    capacity = settings.AUTO_SYNC_MAX_CONCURRENCY - active_jobs
+    if capacity <= 0:
+        return []
+
+    due_states = (
+        db.query(GithubSyncState)
+        .filter(GithubSyncState.next_sync_at <= now)
+        .order_by(GithubSyncState.next_sync_at)
+        .limit(capacity)
+        .all()
+    )
+    last_active = _last_active_dates(db, [state.user_id for state in due_states])
+
+    job_ids: List[int] = []
+    for state in due_states:
+        job = enqueue_sync_job(
+            db,
+            state.user_id,
+            today - timedelta(days=AUTO_SYNC_WINDOW_DAYS),
+            today,
+            "standard",
+        )
+        if job.status == SYNC_JOB_PENDING:
+            job_ids.append(job.id)
+        state.next_sync_at = now + _jittered(sync_interval(last_active.get(state.user_id), today))
+    db.commit()
+    return job_ids
+
+
+@contextmanager
+def _scheduler_lock() -> Iterator[Optional[Session]]:
+    """
+    取得调度锁，返回绑定在持锁连接上的会话；锁被其他进程持有时返回 None
+
+    PostgreSQL 上使用会话级 advisory lock，跨越调度过程中的多次提交，结束后显式释放；
+    SQLite 只用于单机部署，不加锁，并发入队由任务表的部分唯一索引去重
+    """
+    with engine.connect() as conn:
+        postgresql = conn.dialect.name == "postgresql"
+        if postgresql:
+            locked = conn.execute(select(func.pg_try_advisory_lock(SCHEDULER_LOCK_KEY))).scalar()
+            conn.commit()
+            if not locked:
+                yield None
+                return
+        db = SessionLocal(bind=conn)
+        try:
+            yield db
+        finally:
+            db.close()
+            if postgresql:
+                try:
+                    conn.execute(select(func.pg_advisory_unlock(SCHEDULER_LOCK_KEY)))
+                    conn.commit()
+                except Exception:
+                    # 连接异常时丢弃该连接，锁随数据库会话结束一并释放
+                    conn.invalidate()
+                    raise
+
+
+def _schedule_tick() -> List[int]:
+    with _scheduler_lock() as db:
+        if db is None:
+            return []
+        job_ids = schedule_due_syncs(db)
+        prune_http_cache(db)
+        db.commit()
+        if settings.SYNC_EXECUTION_MODE == "inline":
+            # 进程重启前未完成、或租约已过期的任务由本进程接手
+            job_ids.extend(job_id for job_id in recoverable_job_ids(db) if job_id not in job_ids)
+        return job_ids
+
+
+async def _scheduler_loop() -> None:
+    while True:
+        try:
+            for job_id in await asyncio.to_thread(_schedule_tick):
+                start_sync_job(job_id)
+        except Exception:
+            logger.exception("auto sync scheduling failed")
+        await asyncio.sleep(settings.AUTO_SYNC_TICK_SECONDS)
+
+
+def start_sync_scheduler() -> None:
+    """启动自动同步调度循环（AUTO_SYNC_ENABLED 关闭时不启动）"""
+    global _scheduler_task
+    if not settings.AUTO_SYNC_ENABLED or _scheduler_task is not None:
+        return
+    _scheduler_task = asyncio.create_task(_scheduler_loop())
+
+
+async def stop_sync_scheduler() -> None:
+    """停止自动同步调度循环"""
+    global _scheduler_task
+    if _scheduler_task is None:
+        return
+    _scheduler_task.cancel()
+    await asyncio.gather(_scheduler_task, return_exceptions=True)
+    _scheduler_task = None
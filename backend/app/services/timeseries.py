@@ -0,0 +1,168 @@
+"""
+每用户每日统计时间序列缓存
+首次查询时从 github_daily_stats 载入用户全部历史，按天铺成稠密的计数矩阵（每个计数字段一行）
+并计算前缀和：任意日期范围的合计 O(1)，滑动平均和最佳窗口 O(天数)，都不再查询数据库。
+
+缓存条目带统计数据版本（GithubSyncState.stats_version）：同步写入变化的日期时在本进程内
+就地修补并推进版本；版本对不上（其他进程写入、事务回滚）时丢弃并重新载入。
+按条目占用的内存总量做 LRU 淘汰
+"""
+from datetime import date, timedelta
+from typing import Dict, Iterable, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import SizedLRUCache
+from app.core.config import settings
+from app.models import GithubDailyStat
+from app.services.daily_stats import STAT_KEYS
+from app.services.stats_cache import load_stats_version
+
+_KEY_INDEX = {key: index for index, key in enumerate(STAT_KEYS)}
+
+
+class DailySeries:
+    """
+    一个用户从 start 起连续每天的计数
+
+    counts[k, i] 为第 k 个计数字段在 start + i 天的值；prefix[k, j] 为前 j 天之和。
+    查询可以落在序列之外，范围外的日期按 0 计
+    """
+
+    __slots__ = ("version", "start", "counts", "prefix")
+
+    def __init__(self, version: int, start: date, counts: np.ndarray) -> None:
+        self.version = version
+        self.start = start
+        self.counts = counts
+        self.prefix = np.zeros((len(STAT_KEYS), counts.shape[1] + 1), dtype=np.int64)
+        np.cumsum(counts, axis=1, out=self.prefix[:, 1:])
+
+    @classmethod
+    def from_rows(cls, version: int, rows: Sequence[Tuple]) -> "DailySeries":
+        """由按日期升序的 (date, 计数...) 行构造"""
+        if not rows:
+            return cls(version, date.today(), np.zeros((len(STAT_KEYS), 0), dtype=np.int64))
+        start = rows[0][0]
+        days = (rows[-1][0] - start).days + 1
+        counts = np.zeros((len(STAT_KEYS), days), dtype=np.int64)
+        offsets = np.fromiter(
+            ((row[0] - start).days for row in rows), dtype=np.int64, count=len(rows)
+        )
+        counts[:, offsets] = np.array([row[1:] for row in rows], dtype=np.int64).T
+        return cls(version, start, counts)
+
+    @property
+    def days(self) -> int:
+        return self.counts.shape[1]
+
+    @property
+    def nbytes(self) -> int:
+        return self.counts.nbytes + self.prefix.nbytes
+
+    def _offset(self, day: date) -> int:
+        return (day - self.start).days
+
+    def _prefix_at(self, offsets) -> np.ndarray:
+        """序列之前的天数不计入，超出序列末尾按总和计"""
+        return self.prefix[:, np.clip(offsets, 0, self.days)]
+
+    def totals(self, start: date, end: date) -> Dict[str, int]:
+        """[start, end] 内各计数字段的合计"""
+        sums = self._prefix_at(self._offset(end) + 1) - self._prefix_at(self._offset(start))
+        return {key: int(value) for key, value in zip(STAT_KEYS, sums)}
+
+    def _window_sums(self, key: str, window: int, start: date, end: date) -> np.ndarray:
+        """以 [start, end] 内每一天结尾、长度为 window 天的窗口合计"""
+        index = _KEY_INDEX[key]
+        ends = np.arange(self._offset(start), self._offset(end) + 1) + 1
+        return self._prefix_at(ends)[index] - self._prefix_at(ends - window)[index]
+
+    def moving_average(self, key: str, window: int, start: date, end: date) -> np.ndarray:
+        """[start, end] 内每一天的 window 天尾随平均"""
+        return self._window_sums(key, window, start, end) / window
+
+    def best_window(
+        self, key: str, window: int, start: date, end: date
+    ) -> Optional[Tuple[date, int]]:
+        """
+        [start, end] 内合计最大的连续 window 天，相同时取最早的一段
+
+        Returns:
+            (窗口第一天, 合计)；范围不足 window 天时为 None
+        """
+        if (end - start).days + 1 < window:
+            return None
+        sums = self._window_sums(key, window, start + timedelta(days=window - 1), end)
+        best = int(np.argmax(sums))
+        return start + timedelta(days=best), int(sums[best])
+
+    def patch(self, version: int, values: Mapping[date, Sequence[int]]) -> None:
+        """写入变化日期的计数，必要时向两端扩展序列，并从最早的变化日期起重算前缀和"""
+        low, high = min(values), max(values)
+        if self.days == 0:
+            self.start = low
+            self.counts = np.zeros((len(STAT_KEYS), 0), dtype=np.int64)
+        if low < self.start:
+            pad = np.zeros((len(STAT_KEYS), (self.start - low).days), dtype=np.int64)
+            self.counts = np.concatenate([pad, self.counts], axis=1)
+            self.start = low
+        if self._offset(high) >= self.days:
+            pad = np.zeros((len(STAT_KEYS), self._offset(high) + 1 - self.days), dtype=np.int64)
+            self.counts = np.concatenate([self.counts, pad], axis=1)
+        for day, counts in values.items():
+            self.counts[:, self._offset(day)] = counts
+
+        if self.prefix.shape[1] != self.days + 1:
+            self.prefix = np.zeros((len(STAT_KEYS), self.days + 1), dtype=np.int64)
+            first = 0
+        else:
+            first = self._offset(low)
+        np.cumsum(self.counts[:, first:], axis=1, out=self.prefix[:, first + 1 :])
+        self.prefix[:, first + 1 :] += self.prefix[:, first : first + 1]
+        self.version = version
+
+
+_series: SizedLRUCache[int, DailySeries] = SizedLRUCache(settings.TIMESERIES_CACHE_MAX_BYTES)
+
+
+async def load_daily_series(db: AsyncSession, user_id: int) -> DailySeries:
+    """取用户的时间序列；未缓存或版本过期时从数据库载入"""
+    version = await load_stats_version(db, user_id)
+    series = _series.get(user_id)
+    if series is not None and series.version == version:
+        return series
+
+    rows = (
+        await db.execute(
+            select(GithubDailyStat.date, *(getattr(GithubDailyStat, key) for key in STAT_KEYS))
+            .where(GithubDailyStat.user_id == user_id)
+            .order_by(GithubDailyStat.date)
+        )
+    ).all()
+    series = DailySeries.from_rows(version, rows)
+    _series.set(user_id, series, series.nbytes)
+    return series
+
+
+def patch_daily_series(
+    user_id: int, version: int, values: Iterable[Tuple[date, Sequence[int]]]
+) -> None:
+    """
+    同步写入后修补已缓存的序列
+
+    Args:
+        version: 写入后的统计数据版本；缓存的序列须恰好是上一个版本，否则丢弃
+        values: 变化日期及其全部计数（按 STAT_KEYS 顺序）
+    """
+    series = _series.get(user_id)
+    if series is None:
+        return
+    values = dict(values)
+    if series.version != version - 1 or not values:
+        _series.pop(user_id)
+        return
+    series.patch(version, values)
+    _series.set(user_id, series, series.nbytes)
@@ -0,0 +1,3 @@
+"""
+后台 Worker 与离线命令
+"""
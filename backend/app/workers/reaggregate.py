@@ -0,0 +1,53 @@
+"""
+离线重新聚合
+从事件归档重建 github_daily_stats，不调用 GitHub API：
+
+    python -m app.workers.reaggregate --user-id 1 [--user-id 2 ...]
+    python -m app.workers.reaggregate --all [--from 2024-01-01] [--to 2024-12-31]
+"""
+import argparse
+import logging
+from datetime import date
+
+from app.db.session import SessionLocal
+from app.models import GithubEventArchive
+from app.services.github_sync import reaggregate_user_stats
+
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild GitHub daily stats from the event archive")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--user-id", type=int, action="append", dest="user_ids", help="要重建的用户 ID")
+    target.add_argument("--all", action="store_true", help="重建所有有归档的用户")
+    parser.add_argument("--from", dest="start_date", type=date.fromisoformat, help="起始日期（含）")
+    parser.add_argument("--to", dest="end_date", type=date.fromisoformat, help="结束日期（含）")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    db = SessionLocal()
+    try:
+        if args.all:
+            user_ids = [
+                user_id
+                for (user_id,) in db.query(GithubEventArchive.user_id)
+                .distinct()
+                .order_by(GithubEventArchive.user_id)
+                .all()
+            ]
+        else:
+            user_ids = args.user_ids
+
+        total_days = 0
+        for user_id in user_ids:
+            days = reaggregate_user_stats(db, user_id, args.start_date, args.end_date)
+            total_days += days
+            logger.info("user %s: %d days changed", user_id, days)
+        logger.info("%d days changed across %d users", total_days, len(user_ids))
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
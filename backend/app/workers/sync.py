@@ -0,0 +1,84 @@
+"""
+独立同步 Worker
+从数据库中以租约方式领取待执行的同步任务并执行，执行期间定期续约（心跳）。
+同一任务、同一用户同时只会被一个执行方处理，可启动任意多个进程或容器水平扩展：
+
+    python -m app.workers.sync [--concurrency N]
+
+API 侧需设置 SYNC_EXECUTION_MODE=worker，只负责入队
+"""
+import argparse
+import asyncio
+import logging
+import signal
+from typing import Optional, Set
+
+from app.core.config import settings
+from app.db.partitions import ensure_daily_stats_partitions
+from app.db.session import async_engine
+from app.services.github_client import close_github_client, init_github_client
+from app.services.sync_jobs import WORKER_ID, claim_next_job, run_sync_job
+
+logger = logging.getLogger(__name__)
+
+
+async def run_worker(concurrency: int) -> None:
+    """
+    领取并执行任务，直到收到 SIGINT / SIGTERM
+
+    退出时中断仍在执行的任务，未被请求取消的任务交还给其他 worker
+    """
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:  # Windows
+            pass
+
+    await asyncio.to_thread(ensure_daily_stats_partitions)
+    await init_github_client()
+    running: Set[asyncio.Task] = set()
+    logger.info("sync worker %s started (concurrency=%d)", WORKER_ID, concurrency)
+    try:
+        while not stop.is_set():
+            job_id: Optional[int] = None
+            if len(running) < concurrency:
+                try:
+                    job_id = await claim_next_job()
+                except Exception:
+                    logger.exception("claiming sync job failed")
+            if job_id is not None:
+                logger.info("claimed sync job %s", job_id)
+                task = asyncio.create_task(run_sync_job(job_id, WORKER_ID))
+                running.add(task)
+                task.add_done_callback(running.discard)
+                continue
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=settings.SYNC_WORKER_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        logger.info("sync worker %s stopping", WORKER_ID)
+        for task in running:
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
+        await close_github_client()
+        await async_engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="DevOrbit GitHub sync worker")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=settings.SYNC_WORKER_CONCURRENCY,
+        help="单个进程同时执行的任务数",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    asyncio.run(run_worker(max(1, args.concurrency)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+每日统计聚合基准
+对比逐条 datetime.fromisoformat + dict 分桶的原始实现与 NumPy 整批分桶的实现，
+并校验两者得到的每日统计完全一致
+
+用法（在 backend 目录下）：
+    python -m benchmarks.aggregation [--sizes 100000 1000000] [--repeat 3]
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.daily_stats import DailyStatsAccumulator  # noqa: E402
+from app.services.github_sync import aggregate_daily_stats  # noqa: E402
+
+EVENT_TYPES = ["PushEvent", "PullRequestEvent", "IssuesEvent", "WatchEvent", "ForkEvent"]
+OFFSETS = ["Z", "+08:00", "-07:00", "+00:00"]
+
+
+def make_timestamps(count: int, years: int = 10) -> List[str]:
+    """生成跨越若干年、带不同时区后缀的 ISO 时间戳"""
+    rng = random.Random(42)
+    start = datetime(2015, 1, 1, tzinfo=timezone.utc)
+    span = years * 365 * 86400
+    timestamps = []
+    for _ in range(count):
+        moment = start + timedelta(seconds=rng.randrange(span))
+        timestamps.append(moment.strftime("%Y-%m-%dT%H:%M:%S") + rng.choice(OFFSETS))
+    return timestamps
+
+
+def make_events(timestamps: List[str]) -> List[dict]:
+    rng = random.Random(7)
+    events = []
+    for index, created_at in enumerate(timestamps):
+        event_type = rng.choice(EVENT_TYPES)
+        payload: dict = {"action": rng.choice(["opened", "closed", "reopened", "labeled"])}
+        if event_type == "PushEvent":
+            payload = {"size": rng.randint(0, 5)}
+        events.append({"id": str(index), "type": event_type, "created_at": created_at, "payload": payload})
+    return events
+
+
+def reference_count_days(timestamps: List[str]) -> Dict[date, int]:
+    """原始实现：逐条解析并用 dict 分桶"""
+    counts: Dict[date, int] = {}
+    for value in timestamps:
+        day = datetime.fromisoformat(value.replace("Z", "+00:00")).date()
+        counts[day] = counts.get(day, 0) + 1
+    return counts
+
+
+def reference_aggregate_events(events: List[dict]) -> Dict[date, Dict[str, int]]:
+    """原始实现：逐条解析事件时间并按类型累加"""
+    stats: Dict[date, Dict[str, int]] = {}
+    for event in events:
+        day = datetime.fromisoformat(event["created_at"].replace("Z", "+00:00")).date()
+        if day not in stats:
+            stats[day] = {"commit_count": 0, "pr_count": 0, "issue_count": 0, "star_delta": 0}
+        event_type = event.get("type", "")
+        payload = event.get("payload", {})
+        if event_type == "PushEvent":
+            commits = payload.get("commits", [])
+            size = payload.get("size")
+            if commits:
+                stats[day]["commit_count"] += len(commits)
+            elif isinstance(size, int) and size > 0:
+                stats[day]["commit_count"] += size
+            else:
+                stats[day]["commit_count"] += 1
+        elif event_type == "PullRequestEvent":
+            if payload.get("action", "") in {"opened", "reopened", "closed"}:
+                stats[day]["pr_count"] += 1
+        elif event_type == "IssuesEvent":
+            if payload.get("action", "") in {"opened", "reopened"}:
+                stats[day]["issue_count"] += 1
+        elif event_type in {"WatchEvent", "PublicEvent"}:
+            stats[day]["star_delta"] += 1
+    return stats
+
+
+def vectorized_count_days(timestamps: List[str]) -> Dict[date, int]:
+    stats = DailyStatsAccumulator()
+    stats.add_timestamps("commit_count", timestamps)
+    return {day: counters["commit_count"] for day, counters in stats.items()}
+
+
+def best_of(func: Callable, arg, repeat: int):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(arg)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'case':<10}{'size':>10}{'reference':>12}{'vectorized':>12}{'speedup':>10}")
+    ok = True
+    for size in args.sizes:
+        timestamps = make_timestamps(size)
+        events = make_events(timestamps)
+        for name, reference, vectorized, data in (
+            ("dates", reference_count_days, vectorized_count_days, timestamps),
+            ("events", reference_aggregate_events, aggregate_daily_stats, events),
+        ):
+            ref_time, expected = best_of(reference, data, args.repeat)
+            vec_time, actual = best_of(vectorized, data, args.repeat)
+            if actual != expected:
+                ok = False
+                print(f"✗ {name} size={size}: results differ")
+            print(f"{name:<10}{size:>10}{ref_time:>11.3f}s{vec_time:>11.3f}s{ref_time / vec_time:>9.1f}x")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+统计响应序列化基准
+对比原始路径（ORM 对象经 from_attributes 逐条校验为 GithubDailyStatResponse 后 model_dump_json，
+以及 FastAPI 默认的 jsonable_encoder + json.dumps）与直接由列元组编码的 orjson 路径，
+并校验三者输出的 JSON 内容一致
+
+用法（在 backend 目录下）：
+    python -m benchmarks.serialization [--sizes 365 3650] [--repeat 20]
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+
+from app.core.serialization import dumps, model_fields, rows_to_records  # noqa: E402
+from app.models import GithubDailyStat  # noqa: E402
+from app.schemas.github import (  # noqa: E402
+    GithubDailyStatResponse,
+    GithubDailyStatsQueryResponse,
+)
+
+FIELDS = model_fields(GithubDailyStatResponse)
+
+
+def make_rows(count: int) -> List[Tuple]:
+    """生成按日期连续的每日统计列元组，列顺序与 FIELDS 一致"""
+    rng = random.Random(42)
+    start = date(2015, 1, 1)
+    updated = datetime(2025, 1, 1, 12, 30, 15, 123456)
+    rows = []
+    for index in range(count):
+        values = {
+            "id": index + 1,
+            "user_id": 1,
+            "date": start + timedelta(days=index),
+            "commit_count": rng.randint(0, 20),
+            "pr_count": rng.randint(0, 3),
+            "issue_count": rng.randint(0, 2),
+            "star_delta": rng.randint(0, 5),
+            "created_at": updated,
+            "updated_at": updated,
+        }
+        rows.append(tuple(values[field] for field in FIELDS))
+    return rows
+
+
+def make_objects(rows: List[Tuple]) -> List[GithubDailyStat]:
+    return [GithubDailyStat(**dict(zip(FIELDS, row))) for row in rows]
+
+
+def pydantic_path(stats: List[GithubDailyStat]) -> bytes:
+    """原始路径：逐条 from_attributes 校验后编码"""
+    return GithubDailyStatsQueryResponse(data=stats, total=len(stats)).model_dump_json().encode()
+
+
+def default_encoder_path(stats: List[GithubDailyStat]) -> bytes:
+    """FastAPI 默认路径：校验后经 jsonable_encoder 转换，再用标准库 json 编码"""
+    response = GithubDailyStatsQueryResponse(data=stats, total=len(stats))
+    return json.dumps(jsonable_encoder(response), separators=(",", ":")).encode()
+
+
+def orjson_path(rows: List[Tuple]) -> bytes:
+    return dumps({"data": rows_to_records(rows, FIELDS), "total": len(rows)})
+
+
+def best_of(func: Callable, arg, repeat: int):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(arg)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[365, 3650])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'size':>8}{'pydantic':>12}{'encoder':>12}{'orjson':>12}{'speedup':>10}")
+    ok = True
+    for size in args.sizes:
+        rows = make_rows(size)
+        objects = make_objects(rows)
+        pyd_time, expected = best_of(pydantic_path, objects, args.repeat)
+        enc_time, encoded = best_of(default_encoder_path, objects, args.repeat)
+        fast_time, actual = best_of(orjson_path, rows, args.repeat)
+        if not (json.loads(actual) == json.loads(expected) == json.loads(encoded)):
+            ok = False
+            print(f"✗ size={size}: results differ")
+        print(
+            f"{size:>8}{pyd_time * 1000:>10.2f}ms{enc_time * 1000:>10.2f}ms"
+            f"{fast_time * 1000:>10.2f}ms{pyd_time / fast_time:>9.1f}x"
+        )
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
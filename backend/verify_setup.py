@@ -23,11 +23,15 @@ def check_dependencies():
         "fastapi",
         "uvicorn",
         "sqlalchemy",
+        "greenlet",
+        "aiosqlite",
         "pydantic",
         "pydantic_settings",
         "httpx",
         "jwt",
         "dotenv",
+        "numpy",
+        "orjson",
     ]
     
     missing = []
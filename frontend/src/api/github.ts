@@ -24,17 +24,43 @@ export interface GithubSyncResponse {
   date_range: string
 }
 
+export type GithubSyncJobStatus = 'pending' | 'running' | 'succeeded' | 'failed' | 'cancelled'
+
+export interface GithubSyncJob {
+  id: number
+  status: GithubSyncJobStatus
+  mode: 'standard' | 'deep'
+  from_date: string
+  to_date: string
+  phase: string | null
+  progress: {
+    chunks: Record<string, { done: number; total: number }>
+    counts: Record<string, number>
+  } | null
+  cancel_requested: boolean
+  repos_count: number | null
+  stats_updated: number | null
+  error: string | null
+  created_at: string
+  started_at: string | null
+  finished_at: string | null
+}
+
 export interface SyncGithubParams {
   fromDate?: string
   toDate?: string
   mode?: 'standard' | 'deep'
+  onProgress?: (job: GithubSyncJob) => void
 }
 
+// 轮询同步任务状态的间隔（毫秒）
+const SYNC_JOB_POLL_INTERVAL = 2000
+
 /**
- * 同步 GitHub 数据（支持自定义时间范围）
+ * 创建同步任务，立即返回任务信息
  */
-export async function syncGithubData(params?: SyncGithubParams): Promise<GithubSyncResponse> {
-  const response = await client.post<GithubSyncResponse>('/github/sync', null, {
+export async function createSyncJob(params?: SyncGithubParams): Promise<GithubSyncJob> {
+  const response = await client.post<GithubSyncJob>('/github/sync', null, {
     params: {
       from_date: params?.fromDate,
       to_date: params?.toDate,
@@ -44,6 +70,46 @@ export async function syncGithubData(params?: SyncGithubParams): Promise<GithubS
   return response.data
 }
 
+/**
+ * 查询同步任务状态
+ */
+export async function getSyncJob(jobId: number): Promise<GithubSyncJob> {
+  const response = await client.get<GithubSyncJob>(`/github/sync/jobs/${jobId}`)
+  return response.data
+}
+
+/**
+ * 取消同步任务
+ */
+export async function cancelSyncJob(jobId: number): Promise<GithubSyncJob> {
+  const response = await client.post<GithubSyncJob>(`/github/sync/jobs/${jobId}/cancel`)
+  return response.data
+}
+
+/**
+ * 同步 GitHub 数据（支持自定义时间范围）
+ * 创建后台任务并轮询至结束；任务失败或被取消时抛出错误
+ */
+export async function syncGithubData(params?: SyncGithubParams): Promise<GithubSyncResponse> {
+  let job = await createSyncJob(params)
+  while (job.status === 'pending' || job.status === 'running') {
+    params?.onProgress?.(job)
+    await new Promise((resolve) => setTimeout(resolve, SYNC_JOB_POLL_INTERVAL))
+    job = await getSyncJob(job.id)
+  }
+
+  if (job.status !== 'succeeded') {
+    throw new Error(job.error || (job.status === 'cancelled' ? '同步已取消' : '同步失败'))
+  }
+
+  return {
+    message: 'GitHub 数据同步成功',
+    repos_count: job.repos_count ?? 0,
+    stats_updated: job.stats_updated ?? 0,
+    date_range: `${job.from_date} 至 ${job.to_date}`,
+  }
+}
+
 /**
  * 获取每日统计数据
  */